@@ -0,0 +1,128 @@
+# benchmarks/bench_formatter.py
+"""Compare the per-row and columnar CSVFormatter paths on synthetic rows.
+
+Usage:
+    python -m benchmarks.bench_formatter [--rows N]
+"""
+import argparse
+import random
+import time
+from typing import Dict, Any, List
+import pandas as pd
+from src.constants.config import COLUMNS
+from src.models.stock_data import StockData
+from src.formatters.csv_formatter import CSVFormatter
+
+# Columns of the original formatter; the benchmark compares both paths on these
+LEGACY_KEYS = ['TICKER', 'SECTOR', 'INDUSTRY', 'CURRENT_PRICE', 'TARGET_YIELD', 'PB_RATIO', 'PEG_RATIO',
+               'DIVIDEND_TTM', 'YIELD_5YR_AVG', 'BVPS_TTM', 'PB_5YR_AVG', 'EPS_TTM', 'EPS_GROWTH']
+
+class RowwiseFormatter:
+    """The original per-row CSVFormatter.format_data, kept as the baseline"""
+
+    def __init__(self):
+        self.columns = [COLUMNS[key] for key in LEGACY_KEYS]
+
+    def format_data(self, data_list: List[Dict[str, Any]]) -> pd.DataFrame:
+        formatted_data = []
+        for data in data_list:
+            row = {
+                COLUMNS['TICKER']: str(data.get('ticker', '')),
+                COLUMNS['SECTOR']: str(data.get('sector', '')),
+                COLUMNS['INDUSTRY']: str(data.get('industry', '')),
+                COLUMNS['CURRENT_PRICE']: self._format_number(data.get('current_price', 0)),
+                COLUMNS['TARGET_YIELD']: self._calculate_target_yield(
+                    data.get('dividend_ttm', 0), data.get('yield_5yr_avg', 0)),
+                COLUMNS['PB_RATIO']: self._calculate_pb_valuation(
+                    data.get('bvps_ttm', 0), data.get('pb_5yr_avg', 0)),
+                COLUMNS['PEG_RATIO']: self._calculate_peg_valuation(
+                    data.get('eps_ttm', 0), data.get('eps_growth', 0)),
+                COLUMNS['DIVIDEND_TTM']: self._format_number(data.get('dividend_ttm', 0)),
+                COLUMNS['YIELD_5YR_AVG']: self._format_number(data.get('yield_5yr_avg', 0)),
+                COLUMNS['BVPS_TTM']: self._format_number(data.get('bvps_ttm', 0)),
+                COLUMNS['PB_5YR_AVG']: self._format_number(data.get('pb_5yr_avg', 0)),
+                COLUMNS['EPS_TTM']: self._format_number(data.get('eps_ttm', 0)),
+                COLUMNS['EPS_GROWTH']: self._format_number(data.get('eps_growth', 0))
+            }
+            formatted_data.append(row)
+        return pd.DataFrame(formatted_data, columns=self.columns)
+
+    def _calculate_target_yield(self, dividend_ttm, yield_5yr_avg):
+        try:
+            if yield_5yr_avg and yield_5yr_avg != 0:
+                return self._format_number(dividend_ttm / (yield_5yr_avg * 1.2))
+            return "0.00"
+        except:
+            return "0.00"
+
+    def _calculate_pb_valuation(self, bvps_ttm, pb_5yr_avg):
+        try:
+            return self._format_number(bvps_ttm * pb_5yr_avg)
+        except:
+            return "0.00"
+
+    def _calculate_peg_valuation(self, eps_ttm, eps_growth):
+        try:
+            return self._format_number(eps_ttm * eps_growth * 100)
+        except:
+            return "0.00"
+
+    def _format_number(self, value):
+        try:
+            return f"{float(value):,.2f}"
+        except:
+            return "0.00"
+
+def synthetic_rows(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        row = {
+            'ticker': f'T{i:06d}',
+            'sector': rng.choice(['Technology', 'Healthcare', 'Energy']),
+            'industry': rng.choice(['Software', 'Biotech', 'Oil & Gas']),
+            'current_price': rng.uniform(1, 2000),
+            'dividend_ttm': rng.uniform(0, 10),
+            'yield_5yr_avg': rng.choice([0.0, rng.uniform(0.1, 8)]),
+            'bvps_ttm': rng.uniform(-50, 500),
+            'pb_5yr_avg': rng.uniform(0, 20),
+            'eps_ttm': rng.uniform(-10, 50),
+            'eps_growth': rng.uniform(-1, 1),
+        }
+        # Some records are missing fields, as after a failed page fetch
+        if i % 17 == 0:
+            del row['dividend_ttm'], row['bvps_ttm']
+        rows.append(row)
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='CSVFormatter benchmark')
+    parser.add_argument('--rows', type=int, default=100_000, help='Synthetic rows to format')
+    args = parser.parse_args(argv)
+
+    rows = synthetic_rows(args.rows)
+    # The scraper hands the formatter StockData records
+    records = [StockData.from_dict(row) for row in rows]
+    formatter = CSVFormatter(columns=LEGACY_KEYS)
+
+    start = time.perf_counter()
+    baseline = RowwiseFormatter().format_data(rows)
+    rowwise = time.perf_counter() - start
+
+    start = time.perf_counter()
+    frame = formatter.format_frame(records)
+    numeric = time.perf_counter() - start
+
+    start = time.perf_counter()
+    formatted = formatter.format_output(frame)
+    output = time.perf_counter() - start
+
+    print(f"Rows: {args.rows}")
+    print(f"{'per-row format_data (baseline)':<36}{rowwise:>8.3f}s")
+    print(f"{'columnar format_frame (numeric)':<36}{numeric:>8.3f}s")
+    print(f"{'columnar format_frame + format_output':<36}{numeric + output:>8.3f}s")
+    print(f"Outputs identical: {baseline.equals(formatted)}")
+    print(f"Missing values kept as NaN in the numeric frame: {int(frame.isna().sum().sum())}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# benchmarks/bench_parse.py
+"""Compare per-page parse time and memory of the BeautifulSoup and lxml paths.
+
+Usage:
+    python -m benchmarks.bench_parse [--pages N] [--blocks N] [--html FILE ...]
+"""
+import argparse
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+from bs4 import BeautifulSoup
+from src.constants.selectors import SELECTORS, FINVIZ_SNAPSHOT_TABLE
+from src.parsers import FragmentParser, CELLS
+from benchmarks.synthetic_pages import morningstar_page, finviz_page
+
+def soup_quote(html: bytes) -> Dict[str, str]:
+    """Original path: full html.parser tree, then select_one"""
+    soup = BeautifulSoup(html, 'html.parser')
+    element = soup.select_one(SELECTORS['quote']['current_price'])
+    return {'current_price': element.text} if element else {}
+
+def soup_finviz(html: bytes) -> Dict[str, str]:
+    soup = BeautifulSoup(html, 'html.parser')
+    data = {}
+    table = soup.find('table', {'class': 'snapshot-table2'})
+    if table:
+        for row in table.find_all('tr'):
+            cells = row.find_all('td')
+            for i in range(0, len(cells) - 1, 2):
+                data[cells[i].text.strip()] = cells[i + 1].text.strip()
+    return data
+
+def measure(func: Callable[[bytes], Dict], pages: List[bytes]) -> Dict[str, float]:
+    start = time.perf_counter()
+    for page in pages:
+        func(page)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func(pages[0])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'ms_per_page': elapsed / len(pages) * 1000, 'peak_kib': peak / 1024}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='HTML parse benchmark')
+    parser.add_argument('--pages', type=int, default=50, help='Synthetic pages per page type')
+    parser.add_argument('--blocks', type=int, default=150, help='Filler blocks per synthetic page')
+    parser.add_argument('--html', nargs='*', default=[],
+                        help='Recorded Morningstar quote pages to benchmark instead of synthetic ones')
+    args = parser.parse_args(argv)
+
+    if args.html:
+        quote_pages = [open(path, 'rb').read() for path in args.html]
+    else:
+        quote_pages = [morningstar_page(f'T{i}', 'quote', {'current-price': f'${100 + i}.25'},
+                                        blocks=args.blocks, seed=i).encode() for i in range(args.pages)]
+    finviz_pages = [finviz_page(f'T{i}', 'Technology', 'Semiconductors', blocks=args.blocks,
+                                seed=i).encode() for i in range(args.pages)]
+
+    quote_parser = FragmentParser({'current_price': SELECTORS['quote']['current_price']}, backend='lxml')
+    finviz_parser = FragmentParser({'snapshot': (FINVIZ_SNAPSHOT_TABLE, CELLS)}, backend='lxml')
+
+    cases = [
+        ('quote', 'bs4 html.parser', soup_quote, quote_pages),
+        ('quote', 'lxml fragments', lambda html: quote_parser.parse(html, 'utf-8'), quote_pages),
+        ('finviz', 'bs4 html.parser', soup_finviz, finviz_pages),
+        ('finviz', 'lxml fragments', lambda html: finviz_parser.parse(html, 'utf-8'), finviz_pages),
+    ]
+
+    avg_kib = sum(len(p) for p in quote_pages + finviz_pages) / len(quote_pages + finviz_pages) / 1024
+    print(f"Average page size: {avg_kib:.0f} KiB")
+    print(f"{'page':<8}{'parser':<18}{'ms/page':>10}{'peak KiB':>12}")
+    for page_type, name, func, pages in cases:
+        result = measure(func, pages)
+        print(f"{page_type:<8}{name:<18}{result['ms_per_page']:>10.2f}{result['peak_kib']:>12.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# benchmarks/bench_scraper.py
+"""End-to-end scraper benchmark against local fake Morningstar/Finviz servers.
+
+Runs main.py in a subprocess pointed at two FakeSiteServer instances and
+reports tickers/sec, per-request latency percentiles, parse CPU time and
+peak RSS of the scraper process. Arguments after `--` are passed to main.py.
+
+Usage:
+    python -m benchmarks.bench_scraper --tickers 200 --latency 0.05 -- --workers 32
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from benchmarks.fake_server import FakeSiteServer
+from src.utils.metrics import percentile
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+def write_tickers(path: Path, count: int) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('Ticker\n')
+        for i in range(count):
+            f.write(f'T{i:05d}\n')
+
+def run(args, main_args) -> dict:
+    servers = {
+        site: FakeSiteServer(site, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                             throttle_rate=args.throttle_rate, blocks=args.blocks,
+                             pages_dir=args.pages_dir).start()
+        for site in ('morningstar', 'finviz')
+    }
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            write_tickers(tmp / 'tickers.csv', args.tickers)
+            stats_path = tmp / 'stats.json'
+            env = {
+                **os.environ,
+                'MORNINGSTAR_URL': servers['morningstar'].url,
+                'FINVIZ_URL': servers['finviz'].url,
+                'SCRAPER_DATA_DIR': str(tmp / 'data'),
+                'SCRAPER_LOGS_DIR': str(tmp / 'logs'),
+            }
+            command = [
+                sys.executable, str(PROJECT_ROOT / 'main.py'),
+                '--input', str(tmp / 'tickers.csv'),
+                '--output', str(tmp / 'output' / 'result.csv'),
+                '--morningstar-rate', str(args.rate), '--finviz-rate', str(args.rate),
+                '--stats-json', str(stats_path),
+                *main_args,
+            ]
+            if '--no-cache' not in main_args and not args.cache:
+                command.append('--no-cache')
+
+            start = time.perf_counter()
+            subprocess.run(command, cwd=PROJECT_ROOT, env=env, check=True,
+                           stdout=None if args.verbose else subprocess.DEVNULL,
+                           stderr=None if args.verbose else subprocess.DEVNULL)
+            wall = time.perf_counter() - start
+            usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+            stats = json.loads(stats_path.read_text(encoding='utf-8'))
+    finally:
+        for server in servers.values():
+            server.stop()
+
+    server_latencies = [l for server in servers.values() for l in server.latencies]
+    statuses = {}
+    for server in servers.values():
+        for status, count in server.status_counts.items():
+            statuses[status] = statuses.get(status, 0) + count
+    return {
+        'wall': wall,
+        'stats': stats,
+        'peak_rss_mib': usage.ru_maxrss / 1024,
+        'server_latencies': server_latencies,
+        'statuses': statuses,
+    }
+
+def report(args, result: dict) -> None:
+    stats = result['stats']
+    metrics = stats['metrics']
+    request = metrics['stages'].get('fetch', {})
+    parse = metrics['totals'].get('parse_cpu_seconds', {})
+    print(f"Tickers:               {stats['tickers']}")
+    print(f"Process wall time:     {result['wall']:.2f}s")
+    print(f"Scrape time:           {stats['elapsed_seconds']:.2f}s")
+    print(f"Throughput:            {stats['tickers_per_second']:.2f} tickers/s")
+    print(f"Request latency:       p50 {request.get('p50', 0) * 1000:.1f}ms, "
+          f"p99 {request.get('p99', 0) * 1000:.1f}ms ({request.get('count', 0)} requests)")
+    print(f"Server latency:        p50 {percentile(result['server_latencies'], 50) * 1000:.1f}ms, "
+          f"p99 {percentile(result['server_latencies'], 99) * 1000:.1f}ms")
+    print(f"Parse CPU:             {parse.get('total', 0):.2f}s total, "
+          f"{parse.get('mean', 0) * 1000:.2f}ms per page")
+    print("Time by stage:         " + ", ".join(
+        f"{stage} {values['total']:.2f}s" for stage, values in metrics['stages'].items()))
+    print(f"Peak RSS:              {result['peak_rss_mib']:.1f} MiB")
+    print(f"Server status codes:   {dict(sorted(result['statuses'].items()))}")
+    if args.json:
+        summary = {k: v for k, v in result.items() if k != 'server_latencies'}
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2, default=str)
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    main_args = []
+    if '--' in argv:
+        index = argv.index('--')
+        argv, main_args = argv[:index], argv[index + 1:]
+
+    parser = argparse.ArgumentParser(description='Offline end-to-end scraper benchmark')
+    parser.add_argument('--tickers', type=int, default=100, help='Number of synthetic tickers')
+    parser.add_argument('--latency', type=float, default=0.05, help='Seconds added to each response')
+    parser.add_argument('--jitter', type=float, default=0.02, help='Random +/- seconds around the latency')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of 500 responses')
+    parser.add_argument('--throttle-rate', type=float, help='Requests per second before a fake site answers 429')
+    parser.add_argument('--rate', type=float, default=1000.0, help='Scraper per-host rate limit (req/s)')
+    parser.add_argument('--blocks', type=int, default=150, help='Filler blocks per synthetic page')
+    parser.add_argument('--pages-dir', help='Directory of recorded pages named <TICKER>_<page>.html')
+    parser.add_argument('--cache', action='store_true', help='Keep the response cache enabled')
+    parser.add_argument('--json', help='Also write the results to this JSON file')
+    parser.add_argument('--verbose', action='store_true', help="Show main.py's output")
+    args = parser.parse_args(argv)
+
+    report(args, run(args, main_args))
+
+if __name__ == "__main__":
+    main()
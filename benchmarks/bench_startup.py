@@ -0,0 +1,73 @@
+# benchmarks/bench_startup.py
+"""Measure CLI cold start: wall time of `main.py --help` and import cost per module.
+
+Each run starts a fresh interpreter, so the numbers include interpreter
+start-up and every import main.py triggers before parsing arguments.
+
+Usage:
+    python -m benchmarks.bench_startup [--runs N] [--top N]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+def time_help(runs: int) -> List[float]:
+    """Wall time of `python main.py --help`, once per run"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, str(PROJECT_ROOT / 'main.py'), '--help'], cwd=PROJECT_ROOT,
+                       check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def import_times() -> Tuple[float, Dict[str, float], List[str]]:
+    """Import time of main.py, cumulative time of each module it imports directly
+    and every module loaded, from -X importtime"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import main'], cwd=PROJECT_ROOT,
+                            check=True, capture_output=True, text=True)
+    total, direct, loaded, children = 0.0, {}, [], {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Nesting is shown as two spaces of indentation per level
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        name, seconds = name.strip(), int(cumulative) / 1e6
+        loaded.append(name)
+        # Modules are listed after the imports they trigger
+        if depth == 1:
+            children[name] = children.get(name, 0.0) + seconds
+        elif depth == 0:
+            if name == 'main':
+                total, direct = seconds, children
+            children = {}
+    return total, direct, loaded
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='CLI start-up benchmark')
+    parser.add_argument('--runs', type=int, default=10, help='Interpreter starts to time')
+    parser.add_argument('--top', type=int, default=10, help='Slowest imports of main.py to list')
+    args = parser.parse_args(argv)
+
+    timings = time_help(args.runs)
+    total, direct, loaded = import_times()
+    heavy = [name for name in ('pandas', 'numpy', 'requests', 'bs4', 'lxml', 'pyarrow', 'aiohttp')
+             if any(module == name or module.startswith(name + '.') for module in loaded)]
+
+    print(f"main.py --help:        median {statistics.median(timings) * 1000:.0f}ms, "
+          f"min {min(timings) * 1000:.0f}ms ({args.runs} runs)")
+    print(f"import main:           {total * 1000:.0f}ms")
+    print(f"Heavy modules loaded:  {', '.join(heavy) or 'none'}")
+    print("Slowest imports of main.py:")
+    for name, seconds in sorted(direct.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {name:<40}{seconds * 1000:>8.1f}ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+# benchmarks/fake_server.py
+"""Local stand-ins for morningstar.com and finviz.com.
+
+Each FakeSiteServer serves synthetic (or recorded) pages and can inject
+latency, random server errors and 429 throttling, so scraper throughput can
+be measured without touching the real sites. Pages carry an ETag, and
+conditional requests for an unchanged page are answered with 304.
+
+Run standalone:
+    python -m benchmarks.fake_server --site morningstar --port 8001 --latency 0.05
+"""
+import argparse
+import hashlib
+import random
+import threading
+import time
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+
+class _Server(ThreadingHTTPServer):
+    # Accept the bursts of connections opened by the async transport
+    request_queue_size = 1024
+    daemon_threads = True
+from urllib.parse import urlparse, parse_qs
+from benchmarks.synthetic_pages import morningstar_page, finviz_page, finviz_screener_page
+
+SECTORS = [
+    ('Technology', 'Semiconductors'),
+    ('Healthcare', 'Drug Manufacturers - General'),
+    ('Consumer Defensive', 'Beverages - Non-Alcoholic'),
+    ('Financial', 'Asset Management'),
+    ('Energy', 'Oil & Gas Integrated'),
+]
+
+def morningstar_values(ticker: str, page: str) -> Dict[str, str]:
+    """Deterministic field values for a ticker, keyed by data-test attribute"""
+    rng = random.Random(f'{ticker}-{page}')
+    values = {
+        'quote': {'current-price': f'${rng.uniform(5, 900):,.2f}'},
+        'dividends': {'dividend-ttm': f'{rng.uniform(0, 8):.2f}',
+                      'yield-5yr-avg': f'{rng.uniform(0.5, 6):.2f}%'},
+        'valuation': {'bvps-ttm': f'{rng.uniform(1, 300):.2f}',
+                      'pb-5yr-avg': f'{rng.uniform(0.5, 15):.2f}'},
+        'financials': {'eps-ttm': f'{rng.uniform(-2, 25):.2f}',
+                       'eps-growth': f'{rng.uniform(-20, 40):.2f}%'},
+    }
+    return values.get(page, {})
+
+def finviz_sector(ticker: str):
+    """Deterministic (sector, industry) of a ticker"""
+    return SECTORS[sum(map(ord, ticker.upper())) % len(SECTORS)]
+
+class FakeSiteServer:
+    """Threaded HTTP server imitating one of the scraped sites"""
+
+    def __init__(self, site: str = 'morningstar', host: str = '127.0.0.1', port: int = 0,
+                 latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 throttle_rate: Optional[float] = None, blocks: int = 150,
+                 pages_dir: Optional[str] = None, seed: int = 0):
+        if site not in ('morningstar', 'finviz'):
+            raise ValueError(f"Unknown site '{site}'")
+        self.site = site
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.blocks = blocks
+        self.pages_dir = Path(pages_dir) if pages_dir else None
+        self.rng = random.Random(seed)
+        self.status_counts: Counter = Counter()
+        self.latencies: List[float] = []
+        self._recent = deque()
+        self._lock = threading.Lock()
+        self._page_cache: Dict[str, bytes] = {}
+
+        handler = self._make_handler()
+        self.httpd = _Server((host, port), handler)
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'FakeSiteServer':
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name=f'fake-{self.site}', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> 'FakeSiteServer':
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.status_counts.clear()
+            self.latencies.clear()
+
+    def _throttled(self) -> bool:
+        if not self.throttle_rate:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            while self._recent and now - self._recent[0] > 1.0:
+                self._recent.popleft()
+            if len(self._recent) >= self.throttle_rate:
+                return True
+            self._recent.append(now)
+            return False
+
+    def _page(self, path: str, query: str) -> Optional[bytes]:
+        if self.site == 'finviz':
+            if path.startswith('/screener.ashx'):
+                return self._screener_page(parse_qs(query))
+            if not path.startswith('/quote.ashx'):
+                return None
+            ticker = parse_qs(query).get('t', [''])[0]
+            key = f'{ticker}_finviz'
+        else:
+            parts = path.strip('/').split('/')
+            if len(parts) != 3 or parts[0] != 'stocks':
+                return None
+            ticker, page = parts[1], parts[2]
+            key = f'{ticker}_{page}'
+
+        recorded = self.pages_dir / f'{key}.html' if self.pages_dir else None
+        if recorded and recorded.exists():
+            return recorded.read_bytes()
+
+        with self._lock:
+            cached = self._page_cache.get(key)
+        if cached is not None:
+            return cached
+        if self.site == 'finviz':
+            sector, industry = finviz_sector(ticker)
+            body = finviz_page(ticker, sector, industry, blocks=self.blocks).encode()
+        else:
+            values = morningstar_values(ticker, page)
+            if not values:
+                return None
+            body = morningstar_page(ticker, page, values, blocks=self.blocks).encode()
+        with self._lock:
+            self._page_cache[key] = body
+        return body
+
+    def _screener_page(self, params: Dict[str, List[str]]) -> bytes:
+        # Like Finviz: the listed tickers sorted, 20 rows per page starting at row r
+        tickers = sorted({t.upper() for t in params.get('t', [''])[0].split(',') if t})
+        start = max(int(params.get('r', ['1'])[0]), 1) - 1
+        rows = [(ticker, *finviz_sector(ticker)) for ticker in tickers[start:start + 20]]
+        columns = [int(c) for c in params.get('c', [''])[0].split(',') if c.isdigit()]
+        return finviz_screener_page(rows, columns=columns or None, blocks=self.blocks).encode()
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                start = time.perf_counter()
+                status, body, headers = self._respond()
+                # Counted before the client can see the response
+                with server._lock:
+                    server.status_counts[status] += 1
+                    server.latencies.append(time.perf_counter() - start)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _respond(self):
+                with server._lock:
+                    delay = max(0.0, server.latency + server.rng.uniform(-server.jitter, server.jitter))
+                    fail = server.rng.random() < server.error_rate
+                if delay:
+                    time.sleep(delay)
+                if server._throttled():
+                    return 429, b'Too Many Requests', {'Retry-After': '1'}
+                if fail:
+                    return 500, b'Internal Server Error', {}
+                parsed = urlparse(self.path)
+                body = server._page(parsed.path, parsed.query)
+                if body is None:
+                    return 404, b'Not Found', {}
+                etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+                if self.headers.get('If-None-Match') == etag:
+                    return 304, b'', {'ETag': etag}
+                return 200, body, {'Content-Type': 'text/html; charset=utf-8', 'ETag': etag}
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Fake Morningstar/Finviz server')
+    parser.add_argument('--site', choices=['morningstar', 'finviz'], default='morningstar')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Random +/- seconds around the latency')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with 500')
+    parser.add_argument('--throttle-rate', type=float, help='Requests per second before answering 429')
+    parser.add_argument('--pages-dir', help='Directory of recorded pages named <TICKER>_<page>.html')
+    args = parser.parse_args(argv)
+
+    server = FakeSiteServer(args.site, port=args.port, latency=args.latency, jitter=args.jitter,
+                            error_rate=args.error_rate, throttle_rate=args.throttle_rate,
+                            pages_dir=args.pages_dir)
+    print(f"Serving fake {args.site} at {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+if __name__ == "__main__":
+    main()
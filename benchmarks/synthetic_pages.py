@@ -0,0 +1,89 @@
+# benchmarks/synthetic_pages.py
+"""Synthetic Morningstar and Finviz pages shaped like the real ones"""
+import random
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+FINVIZ_SNAPSHOT_LABELS = [
+    'Index', 'P/E', 'EPS (ttm)', 'Insider Own', 'Shs Outstand', 'Perf Week',
+    'Market Cap', 'Forward P/E', 'EPS next Y', 'Insider Trans', 'Shs Float', 'Perf Month',
+    'Income', 'PEG', 'EPS next Q', 'Inst Own', 'Short Float', 'Perf Quarter',
+    'Sales', 'P/S', 'EPS this Y', 'Inst Trans', 'Short Ratio', 'Perf Half Y',
+    'Book/sh', 'P/B', 'ROA', 'ROE', 'Target Price', 'Dividend %', 'Beta',
+]
+
+# Custom screener view columns by c= id: (header, snapshot label of the same value)
+FINVIZ_SCREENER_COLUMNS = {
+    0: ('No.', None), 1: ('Ticker', None), 2: ('Company', None), 3: ('Sector', None),
+    4: ('Industry', None), 5: ('Country', None), 6: ('Market Cap', 'Market Cap'), 7: ('P/E', 'P/E'),
+    8: ('Fwd P/E', 'Forward P/E'), 9: ('PEG', 'PEG'), 10: ('P/S', 'P/S'), 11: ('P/B', 'P/B'),
+    14: ('Dividend', 'Dividend %'), 16: ('EPS', 'EPS (ttm)'), 32: ('ROA', 'ROA'), 33: ('ROE', 'ROE'),
+    48: ('Beta', 'Beta'), 65: ('Price', None),
+}
+# Columns of the overview view
+FINVIZ_OVERVIEW_COLUMNS = (0, 1, 2, 3, 4, 5, 6, 7, 65)
+
+def finviz_metrics(ticker: str) -> Dict[str, str]:
+    """Deterministic snapshot values of a ticker, keyed by snapshot label"""
+    rng = random.Random(f'{ticker.upper()}-finviz-metrics')
+    return {label: f'{rng.uniform(0, 100):.2f}' + ('%' if label in ('ROA', 'ROE', 'Dividend %') else '')
+            for label in FINVIZ_SNAPSHOT_LABELS}
+
+def _filler(rng: random.Random, blocks: int) -> str:
+    """Markup noise similar to navigation, scripts and news lists"""
+    parts = []
+    for i in range(blocks):
+        parts.append(
+            f'<div class="block-{i % 7}"><ul>'
+            + ''.join(f'<li><a href="/n/{rng.randint(0, 10**6)}">Headline {rng.random():.6f}</a></li>'
+                      for _ in range(8))
+            + f'</ul><script>var x{i} = {rng.randint(0, 10**9)};</script></div>'
+        )
+    return ''.join(parts)
+
+def morningstar_page(ticker: str, page: str, values: Dict[str, Any], blocks: int = 150,
+                     seed: int = 0) -> str:
+    """Morningstar page with one div[data-test=...] per field in `values`"""
+    rng = random.Random(f'{seed}-{ticker}-{page}')
+    fields = ''.join(f'<div class="mds-metric"><div data-test="{name}">{value}</div></div>'
+                     for name, value in values.items())
+    return (f'<!DOCTYPE html><html><head><title>{ticker} {page} | Morningstar</title></head><body>'
+            f'{_filler(rng, blocks // 2)}<main><h1>{ticker}</h1>{fields}</main>'
+            f'{_filler(rng, blocks - blocks // 2)}</body></html>')
+
+def finviz_page(ticker: str, sector: str, industry: str, metrics: Dict[str, str] = None,
+                blocks: int = 150, seed: int = 0) -> str:
+    """Finviz quote.ashx page with a snapshot-table2 table"""
+    rng = random.Random(f'{seed}-{ticker}-finviz')
+    metrics = {**finviz_metrics(ticker), **(metrics or {})}
+    cells = [f'<td class="snapshot-td2-cp">{label}</td><td class="snapshot-td2"><b>{value}</b></td>'
+             for label, value in metrics.items()]
+    rows = ''.join('<tr class="table-dark-row">' + ''.join(cells[i:i + 6]) + '</tr>'
+                   for i in range(0, len(cells), 6))
+    header = (f'<table class="fullview-title"><tr><td><a>{ticker}</a></td></tr>'
+              f'<tr><td><a class="tab-link">{sector}</a> | <a class="tab-link">{industry}</a></td></tr></table>')
+    snapshot = (f'<table class="snapshot-table2"><tr><td>Sector</td><td>{sector}</td>'
+                f'<td>Industry</td><td>{industry}</td></tr>{rows}</table>')
+    return (f'<!DOCTYPE html><html><head><title>{ticker} Stock Price | Finviz</title></head><body>'
+            f'{_filler(rng, blocks // 3)}{header}{snapshot}{_filler(rng, blocks - blocks // 3)}</body></html>')
+
+def finviz_screener_page(rows: List[Tuple[str, str, str]], columns: Optional[Sequence[int]] = None,
+                         blocks: int = 150, seed: int = 0) -> str:
+    """Finviz screener.ashx page listing (ticker, sector, industry) rows in the given custom view columns"""
+    rng = random.Random(f'{seed}-screener-{len(rows)}')
+    columns = [c for c in (columns or FINVIZ_OVERVIEW_COLUMNS) if c in FINVIZ_SCREENER_COLUMNS]
+    header = ''.join(f'<th>{FINVIZ_SCREENER_COLUMNS[c][0]}</th>' for c in columns)
+
+    def cell(i: int, ticker: str, sector: str, industry: str, column: int) -> str:
+        name, label = FINVIZ_SCREENER_COLUMNS[column]
+        value = {'No.': i, 'Ticker': f'<a class="tab-link">{ticker}</a>', 'Company': f'{ticker} Inc',
+                 'Sector': sector, 'Industry': industry, 'Country': 'USA',
+                 'Price': f'{rng.uniform(5, 900):.2f}'}.get(name)
+        return f'<td>{finviz_metrics(ticker)[label] if value is None else value}</td>'
+
+    body = ''.join(
+        '<tr class="styled-row">' + ''.join(cell(i, ticker, sector, industry, c) for c in columns) + '</tr>'
+        for i, (ticker, sector, industry) in enumerate(rows, 1)
+    )
+    table = f'<table class="styled-table-new screener_table"><thead><tr>{header}</tr></thead><tbody>{body}</tbody></table>'
+    return (f'<!DOCTYPE html><html><head><title>Stock Screener | Finviz</title></head><body>'
+            f'{_filler(rng, blocks // 3)}{table}{_filler(rng, blocks - blocks // 3)}</body></html>')
@@ -1,57 +1,443 @@
 import os
+import json
+import time
 import argparse
+import itertools
+from typing import Optional
+from collections import Counter
+from datetime import date, timedelta
+from urllib.parse import urlparse
 from src.scrapers.combined_scraper import CombinedScraper
+from src.scrapers.batch_scraper import BatchScraper, AsyncBatchScraper
+from src.scrapers.distributed import Coordinator, ShardWorker
 from src.formatters.csv_formatter import CSVFormatter  # Note: changed from utils to formatters
+from src.formatters.stream_writer import WRITERS, get_writer
+from src.constants.config import (
+    COLUMNS, MORNINGSTAR_URL, FINVIZ_URL, MAX_WORKERS, ASYNC_MAX_WORKERS, HTTP_BACKEND, CACHE_ENABLED, HTML_PARSER,
+    OUTPUT_FORMAT, STREAM_CHUNK_SIZE, MAX_RETRIES, PARSE_WORKERS, FIELD_MAX_AGES, SERVICE_HOST, SERVICE_PORT,
+    SHARD_SIZE, SHARD_LOCAL_WORKERS, SHARD_QUEUE_PATH, FINVIZ_SCREENER, METADATA_INDEX,
+    HISTORY_ENABLED, HISTORY_DAYS, FINGERPRINTS
+)
+from src.parsers import FragmentParser, ParsePool
+from src.storage.field_store import FieldStore
+from src.storage.history_store import HistoryStore
+from src.storage.metadata_index import MetadataIndex
+from src.storage.fingerprint_store import FingerprintStore
+from src.storage.response_cache import ResponseCache
+from src.storage.run_journal import RunJournal
+from src.storage.shard_queue import ShardQueue
+from src.transports import TRANSPORTS, get_transport
+from src.utils.metrics import Metrics
+from src.utils.ticker_source import TickerSource
+from src.utils.rate_limiter import HostLimits
+from src.utils.retry import RetryPolicy
 
-def main():
+def build_limits(args) -> HostLimits:
+    """Apply command line rate/concurrency overrides to the host limits"""
+    limits = HostLimits()
+    overrides = {
+        urlparse(MORNINGSTAR_URL).netloc: (args.morningstar_rate, args.morningstar_concurrency),
+        urlparse(FINVIZ_URL).netloc: (args.finviz_rate, args.finviz_concurrency),
+    }
+    for host, (rate, concurrency) in overrides.items():
+        settings = {}
+        if rate is not None:
+            settings['rate'] = rate
+        if concurrency is not None:
+            settings['concurrency'] = concurrency
+        if settings:
+            limits.configure(host, **settings)
+    return limits
+
+def build_scraper(args, metrics: Metrics, fields=None, field_store=None) -> CombinedScraper:
+    """Create the scraper and its cache, transport and parse pool from the command line"""
+    cache = ResponseCache() if args.cache else None
+    if cache and args.clear_cache:
+        cache.clear()
+    parse_pool = ParsePool(args.parse_workers, backend=args.parser) if args.parse_workers > 0 else None
+    metadata = MetadataIndex() if args.metadata_index else None
+    fingerprints = FingerprintStore() if args.fingerprints else None
+    return CombinedScraper(limits=build_limits(args), transport=get_transport(args.transport, proxy=args.proxy),
+                           cache=cache, parser_backend=args.parser, metrics=metrics,
+                           retry_policy=RetryPolicy(max_retries=args.max_retries),
+                           parse_pool=parse_pool, fields=fields, field_store=field_store,
+                           use_screener=args.screener, metadata=metadata, fingerprints=fingerprints)
+
+def build_batch(args, scraper: CombinedScraper, workers: int) -> BatchScraper:
+    """Scrape tickers in worker threads, or as coroutines on the event loop with the async transport"""
+    if args.transport == 'async':
+        return AsyncBatchScraper(scraper, max_workers=workers)
+    return BatchScraper(scraper, max_workers=workers)
+
+def worker_args(args) -> list:
+    """Command line options passed on to the worker processes of a distributed run"""
+    forwarded = ['--transport', args.transport, '--parser', args.parser,
+                 '--max-retries', str(args.max_retries), '--parse-workers', str(args.parse_workers)]
+    options = {
+        '--workers': args.workers,
+        '--morningstar-rate': args.morningstar_rate,
+        '--morningstar-concurrency': args.morningstar_concurrency,
+        '--finviz-rate': args.finviz_rate,
+        '--finviz-concurrency': args.finviz_concurrency,
+    }
+    for option, value in options.items():
+        if value is not None:
+            forwarded += [option, str(value)]
+    if not args.cache:
+        forwarded.append('--no-cache')
+    if not args.screener:
+        forwarded.append('--no-screener')
+    if not args.metadata_index:
+        forwarded.append('--no-metadata-index')
+    if not args.fingerprints:
+        forwarded.append('--no-fingerprints')
+    if args.refresh:
+        forwarded.append('--refresh')
+    for field, seconds in args.max_age:
+        forwarded += ['--max-age', f'{field}={seconds}']
+    return forwarded
+
+def run_worker(args, workers: int) -> None:
+    """Scrape shards of a distributed run until it is finished"""
+    queue = ShardQueue(args.queue)
+    field_store = FieldStore(max_ages={**FIELD_MAX_AGES, **dict(args.max_age)}) if args.refresh else None
+    scraper = build_scraper(args, Metrics(), fields=queue.run_fields(args.shard_run), field_store=field_store)
+    try:
+        worker = ShardWorker(queue, build_batch(args, scraper, workers), worker_id=args.worker_id)
+        completed = worker.run(args.shard_run)
+        print(f"Worker {worker.worker_id} finished {completed} shards")
+        print_report(scraper.metrics, scraper)
+    finally:
+        scraper.close()
+        queue.close()
+
+def print_sectors(paths=None) -> None:
+    """Print the sector and industry breakdown of the tickers in `paths`, or of the whole
+    metadata index, without any request"""
+    index = MetadataIndex()
+    try:
+        tickers = TickerSource(paths) if paths else None
+        breakdown = index.breakdown(tickers)
+        total = sum(breakdown.values())
+        if not total:
+            print("No tickers to break down")
+            return
+        sectors = Counter()
+        for (sector, _), count in breakdown.items():
+            sectors[sector] += count
+        print(f"Sector breakdown of {total} tickers ({len(index)} indexed, "
+              f"{len(index.stale_tickers())} due for revalidation):")
+        for sector, count in sectors.most_common():
+            print(f"  {sector:<40} {count:>6} {count / total:>7.1%}")
+            industries = [(industry, n) for (s, industry), n in breakdown.items() if s == sector]
+            for industry, n in sorted(industries, key=lambda item: (-item[1], item[0])):
+                print(f"    {industry:<38} {n:>6}")
+    finally:
+        index.close()
+
+def print_history(tickers, days: int, columns=None) -> None:
+    """Print the recorded snapshots of tickers over the last `days` days, without any request"""
+    history = HistoryStore()
+    formatter = CSVFormatter(columns=columns)
+    frame = history.query(tickers, start=date.today() - timedelta(days=days), fields=formatter.required_fields())
+    if frame.empty:
+        print(f"No snapshots of {', '.join(tickers)} in the last {days} days")
+        return
+    table = formatter.format_data(HistoryStore.to_records(frame))
+    table.insert(1, 'Scraped at', frame['timestamp'].astype(str).tolist())
+    print(table.to_string(index=False))
+
+def serve(args, workers: int) -> None:
+    """Run the scrape service until interrupted"""
+    from src.service import ScrapeService
+    # Per-ticker timings would grow without bound in a long-running process
+    scraper = build_scraper(args, Metrics(track_tickers=False),
+                            field_store=FieldStore(max_ages={**FIELD_MAX_AGES, **dict(args.max_age)}))
+    try:
+        service = ScrapeService(scraper, workers, host=args.host, port=args.port)
+        print(f"Serving scrape jobs on {service.url} with {workers} workers (Ctrl+C to stop)")
+        service.serve_forever()
+    finally:
+        scraper.close()
+
+def parse_max_age(value: str):
+    """Parse a FIELD=SECONDS freshness override"""
+    field, sep, seconds = value.partition('=')
+    try:
+        return field, float(seconds)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected FIELD=SECONDS, got '{value}'") from None
+
+def print_report(metrics: Metrics, scraper: Optional[CombinedScraper] = None) -> None:
+    """Print end-of-run statistics; without a scraper (a distributed run) from the merged worker metrics"""
+    stages = metrics.summary()['stages']
+    if stages:
+        print("Time by stage: " + ", ".join(
+            f"{stage} {stats['total']:.2f}s" for stage, stats in stages.items()))
+    requests = metrics.counter('requests')
+    downloaded = metrics.counter('bytes_downloaded')
+    retries = metrics.counter('retries')
+
+    def reported(component: str, counter: str) -> bool:
+        # A scraper reports the components it has; merged worker metrics the ones that were used
+        if scraper is not None:
+            return getattr(scraper, component) is not None
+        return bool(metrics.counter(counter))
+
+    if reported('field_store', 'refresh_pages_skipped'):
+        print(f"Refresh: {metrics.counter('refresh_skipped_tickers'):.0f} tickers served from the "
+              f"field store, {metrics.counter('refresh_pages_skipped'):.0f} fresh pages not refetched, "
+              f"{metrics.counter('refresh_failed_tickers'):.0f} tickers left stale")
+    if reported('revalidator', 'metadata_index'):
+        print(f"Metadata index: {metrics.counter('metadata_index', outcome='hit'):.0f} tickers answered "
+              f"without Finviz, {metrics.counter('metadata_revalidations'):.0f} stale entries revalidated")
+    if reported('screener', 'finviz_screener'):
+        print(f"Finviz screener: {metrics.counter('finviz_screener', outcome='hit'):.0f} tickers from "
+              f"screener pages, {metrics.counter('finviz_screener', outcome='fallback'):.0f} "
+              f"fell back to quote pages")
+    if reported('fingerprints', 'page_fingerprints'):
+        saved = metrics.histogram('parse_cpu_saved_seconds').sum
+        print(f"Fingerprints: {metrics.counter('page_fingerprints', outcome='reused'):.0f} unchanged pages "
+              f"reused without parsing ({saved:.2f}s parse CPU saved), "
+              f"{metrics.counter('page_fingerprints', outcome='parsed'):.0f} pages parsed")
+    coalesced = metrics.counter('requests_coalesced')
+    print(f"Requests: {requests:.0f} ({retries:.0f} retries, {coalesced:.0f} coalesced), "
+          f"{downloaded / 1024 / 1024:.1f} MB downloaded")
+    if scraper is not None and scraper.cache:
+        stats = scraper.cache.summary()
+        print(f"Cache: {stats['hits']} hits, {stats['revalidated']} revalidated, "
+              f"{stats['misses']} misses ({stats['hit_rate']:.0%} served from cache), "
+              f"{stats['evicted']} evicted, {stats['size_bytes'] / 1024 / 1024:.1f} MB stored")
+
+def write_stats(path: str, metrics: Metrics, tickers: int, elapsed: float,
+                cache: Optional[ResponseCache] = None) -> None:
+    """Dump run statistics as JSON for benchmarks and monitoring"""
+    stats = {
+        'tickers': tickers,
+        'elapsed_seconds': elapsed,
+        'tickers_per_second': tickers / elapsed if elapsed else 0.0,
+        'metrics': metrics.summary(),
+        'cache': cache.summary() if cache else None,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(stats, f, indent=2)
+
+def main(argv=None):
     # Set up argument parser
     parser = argparse.ArgumentParser(description='Stock data scraper')
-    parser.add_argument('--input', required=True, help='Path to input CSV file')
-    parser.add_argument('--output', required=True, help='Path to output CSV file')
-    args = parser.parse_args()
+    parser.add_argument('--input', nargs='+',
+                        help='Path to input CSV file(s); tickers listed in several files are scraped once')
+    parser.add_argument('--output', help='Path to output CSV file')
+    parser.add_argument('--resume', metavar='RUN_ID',
+                        help='Resume an interrupted run, scraping only unfinished or failed tickers')
+    parser.add_argument('--format', choices=sorted(WRITERS), default=OUTPUT_FORMAT,
+                        help=f'Output file format (default: {OUTPUT_FORMAT})')
+    parser.add_argument('--columns', type=lambda value: value.split(','),
+                        help='Comma separated output columns, e.g. CURRENT_PRICE,SECTOR; only pages '
+                             f'providing them are fetched (default: all of {",".join(COLUMNS)})')
+    parser.add_argument('--chunk-size', type=int, default=STREAM_CHUNK_SIZE,
+                        help=f'Rows buffered before each write to the output (default: {STREAM_CHUNK_SIZE})')
+    parser.add_argument('--refresh', action='store_true',
+                        help='Only rescrape fields older than their max age and fill in the rest '
+                             'from the field store; the output file name is not timestamped')
+    parser.add_argument('--max-age', type=parse_max_age, action='append', default=[], metavar='FIELD=SECONDS',
+                        help='Override how long a stored field stays fresh in --refresh and --serve modes')
+    parser.add_argument('--workers', type=int,
+                        help=f'Number of tickers scraped concurrently (default: {MAX_WORKERS} threads, '
+                             f'{ASYNC_MAX_WORKERS} coroutines with the async transport, 1 = sequential)')
+    parser.add_argument('--transport', choices=sorted(TRANSPORTS), default=HTTP_BACKEND,
+                        help=f'HTTP backend: pooled requests session or aiohttp (default: {HTTP_BACKEND})')
+    parser.add_argument('--morningstar-rate', type=float, help='Max Morningstar requests per second')
+    parser.add_argument('--morningstar-concurrency', type=int, help='Max concurrent Morningstar requests')
+    parser.add_argument('--finviz-rate', type=float, help='Max Finviz requests per second')
+    parser.add_argument('--finviz-concurrency', type=int, help='Max concurrent Finviz requests')
+    parser.add_argument('--max-retries', type=int, default=MAX_RETRIES,
+                        help=f'Retries per request on 429/5xx/connection errors (default: {MAX_RETRIES})')
+    parser.add_argument('--parser', choices=FragmentParser.BACKENDS, default=HTML_PARSER,
+                        help=f'HTML parser backend (default: {HTML_PARSER})')
+    parser.add_argument('--parse-workers', type=int, default=PARSE_WORKERS,
+                        help='Processes parsing downloaded pages, so parsing uses more than one core '
+                             f'(default: {PARSE_WORKERS}, 0 = parse in the download threads)')
+    parser.add_argument('--no-cache', dest='cache', action='store_false', default=CACHE_ENABLED,
+                        help='Always fetch pages from the network')
+    parser.add_argument('--clear-cache', action='store_true', help='Empty the response cache before scraping')
+    parser.add_argument('--no-screener', dest='screener', action='store_false', default=FINVIZ_SCREENER,
+                        help='Fetch one Finviz quote page per ticker instead of bulk screener pages')
+    parser.add_argument('--no-metadata-index', dest='metadata_index', action='store_false', default=METADATA_INDEX,
+                        help='Do not answer sector and industry from the metadata index')
+    parser.add_argument('--no-fingerprints', dest='fingerprints', action='store_false', default=FINGERPRINTS,
+                        help='Parse every downloaded page, even if it is unchanged since its last download')
+    parser.add_argument('--sectors', action='store_true',
+                        help='Print the sector/industry breakdown of the --input tickers (or of every indexed '
+                             'ticker) from the metadata index, without scraping')
+    parser.add_argument('--no-history', dest='history_enabled', action='store_false', default=HISTORY_ENABLED,
+                        help='Do not append the scraped snapshots to the history store')
+    parser.add_argument('--history', nargs='+', metavar='TICKER',
+                        help='Print the recorded snapshots of tickers (see --days and --columns), without scraping')
+    parser.add_argument('--days', type=int, default=HISTORY_DAYS,
+                        help=f'Days of snapshots printed by --history (default: {HISTORY_DAYS})')
+    parser.add_argument('--distributed', action='store_true',
+                        help='Shard the tickers across worker processes, each with its own rate budget')
+    parser.add_argument('--local-workers', type=int, default=SHARD_LOCAL_WORKERS,
+                        help=f'Worker processes started on this machine in --distributed mode '
+                             f'(default: {SHARD_LOCAL_WORKERS}, 0 = only workers started elsewhere)')
+    parser.add_argument('--shard-size', type=int, default=SHARD_SIZE,
+                        help=f'Tickers per shard in --distributed mode (default: {SHARD_SIZE})')
+    parser.add_argument('--proxies', type=lambda value: value.split(','), default=[],
+                        help='Comma separated proxy URLs, one egress address per local worker')
+    parser.add_argument('--worker', action='store_true',
+                        help='Scrape shards of a distributed run from the shard queue (see --shard-run)')
+    parser.add_argument('--queue', default=str(SHARD_QUEUE_PATH),
+                        help=f'Shard queue file shared by the coordinator and workers (default: {SHARD_QUEUE_PATH})')
+    parser.add_argument('--shard-run', metavar='RUN_ID', help='Distributed run scraped by a --worker')
+    parser.add_argument('--worker-id', help='Name of a --worker (default: host name and process id)')
+    parser.add_argument('--proxy', help='Proxy URL all requests of this process are sent through')
+    parser.add_argument('--serve', action='store_true',
+                        help='Run as a long-lived service accepting scrape jobs over a local HTTP/JSON API')
+    parser.add_argument('--host', default=SERVICE_HOST, help=f'Service address (default: {SERVICE_HOST})')
+    parser.add_argument('--port', type=int, default=SERVICE_PORT, help=f'Service port (default: {SERVICE_PORT})')
+    parser.add_argument('--stats-json', metavar='PATH', help='Write run statistics to a JSON file')
+    parser.add_argument('--metrics-prom', metavar='PATH',
+                        help='Write run metrics in Prometheus text format (e.g. for the node_exporter textfile collector)')
+    args = parser.parse_args(argv)
+    
+    workers = args.workers
+    if workers is None:
+        # The service scrapes in worker threads with either transport
+        workers = ASYNC_MAX_WORKERS if args.transport == 'async' and not args.serve else MAX_WORKERS
     
-    # Ensure input file exists
-    if not os.path.exists(args.input):
-        print(f"Input file not found: {args.input}")
+    if args.sectors:
+        print_sectors(args.input)
         return
-        
+    if args.history:
+        print_history(args.history, args.days, args.columns)
+        return
+    if args.serve:
+        serve(args, workers)
+        return
+    if args.worker:
+        if not args.shard_run:
+            parser.error('--worker requires --shard-run')
+        run_worker(args, workers)
+        return
+    
+    journal = RunJournal()
+    if args.resume:
+        run = journal.get_run(args.resume)
+        if run is None:
+            print(f"Run not found: {args.resume}")
+            return
+        # Default to the paths the run was started with
+        args.input = args.input or run['input_path'].split(os.pathsep)
+        args.output = args.output or run['output_path']
+    elif not args.input or not args.output:
+        parser.error('--input and --output are required unless --resume is given')
+    
+    # Expand input globs; tickers are read lazily once scraping starts
+    try:
+        tickers = TickerSource(args.input)
+    except FileNotFoundError as e:
+        print(str(e))
+        return
+    
     # Ensure output directory exists
     os.makedirs(os.path.dirname(args.output), exist_ok=True)
     
     # Initialize components
+    scraper = None
+    shard_queue = None
+    history = None
     try:
-        scraper = CombinedScraper()
-        formatter = CSVFormatter()
+        metrics = Metrics()
+        formatter = CSVFormatter(columns=args.columns)
+        if args.distributed:
+            # The workers scrape; this process only shards the input and merges the results
+            shard_queue = ShardQueue(args.queue)
+            batch = Coordinator(shard_queue, worker_args(args), local_workers=args.local_workers,
+                                shard_size=args.shard_size, proxies=args.proxies,
+                                fields=formatter.required_fields())
+        else:
+            field_store = FieldStore(max_ages={**FIELD_MAX_AGES, **dict(args.max_age)}) if args.refresh else None
+            scraper = build_scraper(args, metrics, fields=formatter.required_fields(), field_store=field_store)
+            batch = build_batch(args, scraper, workers)
+        if args.history_enabled:
+            try:
+                history = HistoryStore()
+            except ImportError as e:
+                print(f"Not recording the snapshot history: {str(e)}")
         
-        # Read input tickers
-        print(f"Reading tickers from {args.input}")
-        tickers = formatter.read_input_csv(args.input)
-        if not tickers:
+        # Stream input tickers, keeping the first occurrence of each
+        print(f"Reading tickers from {', '.join(tickers.paths)}")
+        ticker_iter = iter(tickers)
+        first = next(ticker_iter, None)
+        if first is None:
             print("No tickers found in input file")
             return
+        ticker_iter = itertools.chain([first], ticker_iter)
         
-        print(f"Found {len(tickers)} tickers")
-        
-        # Scrape data
-        scraped_data = []
-        for ticker in tickers:
-            print(f"Scraping data for {ticker}...")
-            data = scraper.scrape_stock_data(ticker)
-            scraped_data.append(data)
-            print(f"Completed scraping for {ticker}")
+        if args.resume:
+            run_id = args.resume
+            done = journal.completed_tickers(run_id)
+            remaining = (ticker for ticker in ticker_iter if ticker not in done)
+            print(f"Resuming run {run_id}: skipping {len(done)} tickers already done")
+        else:
+            run_id = journal.start_run(os.pathsep.join(args.input), args.output)
+            done = set()
+            remaining = ticker_iter
+            print(f"Run ID: {run_id} (continue an interrupted run with --resume {run_id})")
         
-        # Format and save data
-        if scraped_data:
-            print("Formatting data...")
-            df = formatter.format_data(scraped_data)
-            print(f"Saving data to {args.output}")
-            formatter.save_to_csv(df, args.output)
-            print("Done!")
+        # Scrape data, appending each completed ticker to the output in chunks
+        started = time.perf_counter()
+        if args.distributed:
+            print(f"Sharding the input tickers in shards of {args.shard_size} across "
+                  f"{batch.local_workers} local worker processes (queue: {args.queue})...")
         else:
-            print("No data was scraped")
+            print(f"Scraping with {batch.max_workers} workers over the {args.transport} transport"
+                  + (f", parsing in {scraper.parse_pool.workers} processes..." if scraper.parse_pool else "..."))
+        with get_writer(args.format, args.output, formatter=formatter, chunk_size=args.chunk_size,
+                        timestamped=not args.refresh, metrics=metrics) as writer:
+            print(f"Writing results to {writer.output_path}")
+            if args.resume:
+                # Replay tickers finished by earlier attempts of this run
+                for data in journal.iter_results(run_id):
+                    writer.write(data)
+            completed = len(done)
+            for data in batch.scrape_iter(remaining):
+                journal.record(run_id, data)
+                writer.write(data)
+                if history is not None:
+                    history.write(data)
+                completed += 1
+                print(f"Completed scraping for {data.ticker} ({completed}/{tickers.progress})")
+        
+        counts = journal.counts(run_id)
+        journal.finish_run(run_id, 'finished' if not counts.get('failed') else 'incomplete')
+        print(f"Read {tickers.count} unique tickers")
+        if counts.get('failed'):
+            print(f"{counts['failed']} tickers failed, retry them with --resume {run_id}")
+        if args.distributed:
+            if batch.run_id:
+                print(f"Shards: {batch.queue.counts(batch.run_id)}")
+            batch.merge_metrics(metrics)
+        print_report(metrics, scraper)
+        if args.stats_json:
+            write_stats(args.stats_json, metrics, tickers=completed, elapsed=time.perf_counter() - started,
+                        cache=scraper.cache if scraper is not None else None)
+        if args.metrics_prom:
+            with open(args.metrics_prom, 'w', encoding='utf-8') as f:
+                f.write(metrics.to_prometheus())
+        print("Done!")
             
     except Exception as e:
         print(f"Error occurred: {str(e)}")
+    finally:
+        if scraper is not None:
+            scraper.close()
+        if shard_queue is not None:
+            shard_queue.close()
+        if history is not None:
+            history.close()
+        journal.close()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,8 +1,10 @@
 from .config import *
-from .selectors import SELECTORS
+from .selectors import SELECTORS, FINVIZ_FIELDS, PAGE_URLS
 
 __all__ = [
     'SELECTORS',
+    'FINVIZ_FIELDS',
+    'PAGE_URLS',
     'MORNINGSTAR_URL',
     'FINVIZ_URL',
     'COLUMNS'
@@ -1,27 +1,168 @@
+import os
 from pathlib import Path
+from urllib.parse import urlparse
 
 # Base paths
 PROJECT_ROOT = Path(__file__).parent.parent.parent
-DATA_DIR = PROJECT_ROOT / 'data'
+DATA_DIR = Path(os.environ.get('SCRAPER_DATA_DIR', PROJECT_ROOT / 'data'))
 INPUT_DIR = DATA_DIR / 'input'
 OUTPUT_DIR = DATA_DIR / 'output'
-LOGS_DIR = PROJECT_ROOT / 'logs'
+LOGS_DIR = Path(os.environ.get('SCRAPER_LOGS_DIR', PROJECT_ROOT / 'logs'))
+CACHE_DIR = DATA_DIR / 'cache'
+RUNS_DIR = DATA_DIR / 'runs'
+STORE_DIR = DATA_DIR / 'store'
 
 # Scraping settings
-MORNINGSTAR_URL = "https://www.morningstar.com"
-FINVIZ_URL = "https://finviz.com"
+# Base URLs can be overridden, e.g. to point at the benchmark's fake servers
+MORNINGSTAR_URL = os.environ.get('MORNINGSTAR_URL', "https://www.morningstar.com")
+FINVIZ_URL = os.environ.get('FINVIZ_URL', "https://finviz.com")
 CSV_ENCODING = "utf-8-sig"
 REQUEST_TIMEOUT = 10
 REQUEST_DELAY = 2
 MAX_RETRIES = 3
 
+# Concurrency settings
+# Number of tickers scraped in parallel by the batch scraper
+MAX_WORKERS = 8
+
+# Per-host request limits: `rate` is requests per second, `burst` the number of
+# requests allowed back to back, `concurrency` the maximum requests in flight
+HOST_LIMITS = {
+    urlparse(MORNINGSTAR_URL).netloc: {'rate': 1.0, 'burst': 2, 'concurrency': 4},
+    urlparse(FINVIZ_URL).netloc: {'rate': 0.5, 'burst': 1, 'concurrency': 2},
+}
+DEFAULT_HOST_LIMIT = {'rate': 1 / REQUEST_DELAY, 'burst': 1, 'concurrency': 1}
+
+# Retry settings
+# Responses retried with exponential backoff and full jitter, up to MAX_RETRIES times
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+RETRY_BACKOFF_BASE = REQUEST_DELAY / 2
+RETRY_BACKOFF_MAX = 60
+# Longest Retry-After honoured, in seconds
+RETRY_AFTER_MAX = 300
+
+# Adaptive rate settings
+# A host's rate is cut by RATE_DECREASE_FACTOR on each 429/5xx and raised by
+# RATE_INCREASE_STEP requests/second on each success, up to its configured rate
+ADAPTIVE_RATE = True
+RATE_DECREASE_FACTOR = 0.5
+# Minimum seconds between two rate cuts
+RATE_DECREASE_COOLDOWN = 1.0
+RATE_INCREASE_STEP = 0.02
+MIN_RATE = 0.05
+
+# Circuit breaker settings
+# After CIRCUIT_FAILURE_THRESHOLD consecutive failures no request is sent to the
+# host for CIRCUIT_RESET_TIMEOUT seconds, then a single probe request is let through.
+# Requests wait for the circuit to close for up to CIRCUIT_WAIT_TIMEOUT seconds
+# before their ticker fails
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_TIMEOUT = 30
+CIRCUIT_WAIT_TIMEOUT = 3 * CIRCUIT_RESET_TIMEOUT
+
+# HTTP transport settings
+# 'sync' uses a pooled requests.Session and one worker thread per ticker, 'async'
+# an aiohttp event loop running each ticker as a coroutine
+HTTP_BACKEND = 'sync'
+POOL_CONNECTIONS_PER_HOST = 10
+POOL_MAX_CONNECTIONS = 100
+# Tickers scraped concurrently as coroutines with the async backend; they hold no thread
+ASYNC_MAX_WORKERS = 200
+
+# Response cache settings
+CACHE_ENABLED = True
+CACHE_PATH = CACHE_DIR / 'responses.sqlite'
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+CACHE_COMPRESSION_LEVEL = 6
+# Cache hits whose access times are buffered before they are written in one transaction
+CACHE_ACCESS_BATCH = 256
+# Seconds a cached page stays fresh, by page type
+CACHE_TTLS = {
+    'quote': 15 * 60,
+    'dividends': 7 * 24 * 3600,
+    'valuation': 7 * 24 * 3600,
+    'financials': 7 * 24 * 3600,
+    'finviz': 24 * 3600,
+}
+CACHE_DEFAULT_TTL = 60 * 60
+
+# Finviz screener settings
+# Finviz fields are read from screener result pages listing up to
+# FINVIZ_SCREENER_PAGE_SIZE tickers each; a ticker missing from the screener
+# falls back to its quote page
+FINVIZ_SCREENER = True
+# Custom view, listing the FINVIZ_SCREENER_COLUMNS of src/constants/selectors.py
+FINVIZ_SCREENER_VIEW = 152
+FINVIZ_SCREENER_PAGE_SIZE = 20
+
+# HTML parsing settings
+# 'lxml' streams pages and keeps only the selected fragments,
+# 'html.parser' builds a full BeautifulSoup tree
+HTML_PARSER = 'lxml'
+PARSE_CHUNK_SIZE = 64 * 1024
+# Processes parsing downloaded pages; 0 parses in the I/O worker threads
+PARSE_WORKERS = 0
+
 # Output settings
 CSV_ENCODING = 'utf-8-sig'
 DATE_FORMAT = '%Y%m%d_%H%M%S'
+# Rows buffered before each append to the output file
+STREAM_CHUNK_SIZE = 50
+OUTPUT_FORMAT = 'csv'
+
+# Run journal used to resume interrupted runs
+JOURNAL_PATH = RUNS_DIR / 'journal.sqlite'
+
+# Field store used by --refresh runs
+FIELD_STORE_PATH = STORE_DIR / 'fields.sqlite'
+# Seconds a stored field stays fresh, by field; prices are refreshed on every
+# daily run, everything else weekly
+FIELD_MAX_AGES = {
+    'current_price': 12 * 3600,
+}
+FIELD_DEFAULT_MAX_AGE = 7 * 24 * 3600
+
+# Snapshot history: every scraped record, appended to Parquet files partitioned by month
+HISTORY_ENABLED = True
+HISTORY_DIR = OUTPUT_DIR / 'history'
+# Snapshots per row group; row groups are sorted by ticker
+HISTORY_ROW_GROUP_SIZE = 5000
+# Files a month may hold before they are compacted into one
+HISTORY_MAX_FILES = 4
+# Days shown by main.py --history
+HISTORY_DAYS = 90
+
+# Page fingerprints: a downloaded page whose relevant markup is unchanged since
+# its last download reuses the fields extracted then instead of being parsed
+FINGERPRINTS = True
+FINGERPRINT_STORE_PATH = STORE_DIR / 'fingerprints.sqlite'
+
+# Ticker metadata index, consulted before any Finviz request
+METADATA_INDEX = True
+METADATA_INDEX_PATH = STORE_DIR / 'metadata.sqlite'
+# Sector and industry rarely change: older entries are still used while they
+# are revalidated in the background, a few tickers per Finviz request
+METADATA_MAX_AGE = 30 * 24 * 3600
+
+# Distributed run settings (main.py --distributed / --worker)
+SHARD_QUEUE_PATH = RUNS_DIR / 'shards.sqlite'
+SHARD_SIZE = 25
+# Worker processes started by the coordinator on this machine
+SHARD_LOCAL_WORKERS = 2
+# A shard whose worker stops extending its lease for this long is reassigned
+SHARD_LEASE_SECONDS = 60
+SHARD_MAX_ATTEMPTS = 3
+SHARD_POLL_INTERVAL = 0.5
+
+# Scrape service settings (main.py --serve)
+SERVICE_HOST = '127.0.0.1'
+SERVICE_PORT = 8765
+# Finished jobs kept for status and result queries
+SERVICE_MAX_JOBS = 100
 
 # Headers for requests
 HEADERS = {
-    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
     'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
     'Accept-Language': 'en-US,en;q=0.5',
     'Connection': 'keep-alive',
@@ -71,5 +212,14 @@ COLUMNS = {
     'BVPS_TTM': '該公司 BVPS(TTM)',
     'PB_5YR_AVG': '該公司近5年 平均P/B',
     'EPS_TTM': '該公司 EPS(TTM)',
-    'EPS_GROWTH': '該公司 EPS成長率％'
+    'EPS_GROWTH': '該公司 EPS成長率％',
+    'FINVIZ_PE': 'Finviz P/E',
+    'FINVIZ_FWD_PE': 'Finviz Forward P/E',
+    'FINVIZ_PEG': 'Finviz PEG',
+    'FINVIZ_PB': 'Finviz P/B',
+    'FINVIZ_DIV': 'Finviz Dividend %',
+    'FINVIZ_ROE': 'Finviz ROE',
+    'FINVIZ_ROA': 'Finviz ROA',
+    'FINVIZ_EPS': 'Finviz EPS',
+    'FINVIZ_BETA': 'Finviz Beta'
 }
\ No newline at end of file
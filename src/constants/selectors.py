@@ -18,6 +18,49 @@ SELECTORS = {
     }
 }
 
+# Finviz snapshot table holding label/value cell pairs
+FINVIZ_SNAPSHOT_TABLE = 'table.snapshot-table2'
+
+# Finviz screener results table, one row per ticker under a header row of column names
+FINVIZ_SCREENER_TABLE = 'table.screener_table'
+
+# Finviz fields, keyed by output field, valued by snapshot table label
+FINVIZ_FIELDS = {
+    'sector': 'Sector',
+    'industry': 'Industry',
+    'finviz_pe': 'P/E',
+    'finviz_forward_pe': 'Forward P/E',
+    'finviz_peg': 'PEG',
+    'finviz_pb': 'P/B',
+    'finviz_dividend': 'Dividend %',
+    'finviz_roe': 'ROE',
+    'finviz_roa': 'ROA',
+    'finviz_eps': 'EPS (ttm)',
+    'finviz_beta': 'Beta'
+}
+
+# Screener column of each Finviz field: (column id for the custom view's c=
+# parameter, column header); every Finviz field needs one, or tickers found
+# by the screener would miss it
+FINVIZ_SCREENER_COLUMNS = {
+    'sector': (3, 'Sector'),
+    'industry': (4, 'Industry'),
+    'finviz_pe': (7, 'P/E'),
+    'finviz_forward_pe': (8, 'Fwd P/E'),
+    'finviz_peg': (9, 'PEG'),
+    'finviz_pb': (11, 'P/B'),
+    'finviz_dividend': (14, 'Dividend'),
+    'finviz_roe': (33, 'ROE'),
+    'finviz_roa': (32, 'ROA'),
+    'finviz_eps': (16, 'EPS'),
+    'finviz_beta': (48, 'Beta')
+}
+# Column id of the ticker, always requested
+FINVIZ_SCREENER_TICKER_COLUMN = 1
+
+# Fields kept as text; every other field is converted to a float
+TEXT_FIELDS = {'sector', 'industry'}
+
 # Page URLs
 PAGE_URLS = {
     'quote': '/quote',
@@ -1,3 +1,11 @@
 from .csv_formatter import CSVFormatter
+from .stream_writer import StreamWriter, CSVStreamWriter, ParquetStreamWriter, WRITERS, get_writer
 
-__all__ = ['CSVFormatter']
\ No newline at end of file
+__all__ = [
+    'CSVFormatter',
+    'StreamWriter',
+    'CSVStreamWriter',
+    'ParquetStreamWriter',
+    'WRITERS',
+    'get_writer'
+]
\ No newline at end of file
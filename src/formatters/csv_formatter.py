@@ -1,33 +1,75 @@
 import os
-import pandas as pd
 from datetime import datetime
-from typing import List, Dict, Any
+from operator import attrgetter
+from typing import TYPE_CHECKING, List, Any, Iterable, Mapping, Optional, Set, Union
+from ..models.stock_data import StockData
 from ..utils.logger import setup_logger
-from ..utils.helpers import format_output_path, get_timestamp_filename
+from ..utils.helpers import format_output_path, get_timestamp_filename, read_tickers
 from ..constants.config import COLUMNS, CSV_ENCODING
 
+# Scraped field behind each output column; the valuation columns are derived
+FIELDS = {
+    'TICKER': 'ticker',
+    'SECTOR': 'sector',
+    'INDUSTRY': 'industry',
+    'CURRENT_PRICE': 'current_price',
+    'DIVIDEND_TTM': 'dividend_ttm',
+    'YIELD_5YR_AVG': 'yield_5yr_avg',
+    'BVPS_TTM': 'bvps_ttm',
+    'PB_5YR_AVG': 'pb_5yr_avg',
+    'EPS_TTM': 'eps_ttm',
+    'EPS_GROWTH': 'eps_growth',
+    'FINVIZ_PE': 'finviz_pe',
+    'FINVIZ_FWD_PE': 'finviz_forward_pe',
+    'FINVIZ_PEG': 'finviz_peg',
+    'FINVIZ_PB': 'finviz_pb',
+    'FINVIZ_DIV': 'finviz_dividend',
+    'FINVIZ_ROE': 'finviz_roe',
+    'FINVIZ_ROA': 'finviz_roa',
+    'FINVIZ_EPS': 'finviz_eps',
+    'FINVIZ_BETA': 'finviz_beta'
+}
+# Scraped fields each valuation column is computed from
+VALUATION_INPUTS = {
+    'TARGET_YIELD': ('dividend_ttm', 'yield_5yr_avg'),
+    'PB_RATIO': ('bvps_ttm', 'pb_5yr_avg'),
+    'PEG_RATIO': ('eps_ttm', 'eps_growth')
+}
+TEXT_COLUMNS = ('TICKER', 'SECTOR', 'INDUSTRY')
+
+# numpy and pandas are imported when first needed to keep CLI start-up fast
+if TYPE_CHECKING:
+    import pandas as pd
+
 class CSVFormatter:
-    def __init__(self):
+    def __init__(self, columns: Optional[Iterable[str]] = None):
         self.logger = setup_logger('csv_formatter')
-        self.columns = list(COLUMNS.values())
+        # Output column keys of COLUMNS, in COLUMNS order; the ticker is always kept
+        if columns is None:
+            self.keys = list(COLUMNS)
+        else:
+            wanted = {key.upper() for key in columns} | {'TICKER'}
+            unknown = wanted - set(COLUMNS)
+            if unknown:
+                raise ValueError(f"Unknown columns {sorted(unknown)}, expected some of {list(COLUMNS)}")
+            self.keys = [key for key in COLUMNS if key in wanted]
+        self.columns = [COLUMNS[key] for key in self.keys]
+
+    def required_fields(self) -> Set[str]:
+        """Scraped fields needed to fill the selected output columns"""
+        fields = set()
+        for key in self.keys:
+            if key in VALUATION_INPUTS:
+                fields.update(VALUATION_INPUTS[key])
+            elif key != 'TICKER':
+                fields.add(FIELDS[key])
+        return fields
 
     def read_input_csv(self, input_path: str) -> List[str]:
         """Read tickers from input CSV file"""
         try:
-            df = pd.read_csv(input_path, encoding=CSV_ENCODING)
-            # Debug print
-            print("Available columns in CSV:", df.columns.tolist())
-            
-            # Get the ticker column name from COLUMNS config
-            ticker_column = COLUMNS.get('TICKER')
-            print("Looking for column:", ticker_column)
-            
-            if ticker_column not in df.columns:
-                self.logger.error(f"Column {ticker_column} not found in CSV")
-                return []
-            
-            # Get unique tickers and remove any empty/null values
-            tickers = df[ticker_column].dropna().unique().tolist()
+            # Get unique tickers from the ticker column named in COLUMNS, skipping empty values
+            tickers = read_tickers(input_path, COLUMNS.get('TICKER'))
             self.logger.info(f"Found {len(tickers)} unique tickers in {input_path}")
             return tickers
             
@@ -35,40 +77,64 @@ class CSVFormatter:
             self.logger.error(f"Error reading input CSV: {str(e)}")
             return []
 
-    def format_data(self, data_list: List[Dict[str, Any]]) -> pd.DataFrame:
-        """Format scraped data into DataFrame"""
-        formatted_data = []
+    def format_frame(self, data_list: List[Union[StockData, Mapping[str, Any]]]) -> 'pd.DataFrame':
+        """Build a typed numeric DataFrame with the three valuations computed column-wise.
+
+        Missing values, valuations of missing inputs and non-finite results are NaN.
+        """
+        import numpy as np
+        import pandas as pd
+        records = [StockData.coerce(data) for data in data_list]
+        count = len(records)
+        frame = pd.DataFrame(index=pd.RangeIndex(count))
+        
+        # Columns are read straight from the record slots
+        for key in TEXT_COLUMNS:
+            frame[COLUMNS[key]] = [value or '' for value in map(attrgetter(FIELDS[key]), records)]
         
-        for data in data_list:
-            row = {
-                COLUMNS['TICKER']: str(data.get('ticker', '')),
-                COLUMNS['SECTOR']: str(data.get('sector', '')),
-                COLUMNS['INDUSTRY']: str(data.get('industry', '')),
-                COLUMNS['CURRENT_PRICE']: self._format_number(data.get('current_price', 0)),
-                COLUMNS['TARGET_YIELD']: self._calculate_target_yield(
-                    data.get('dividend_ttm', 0),
-                    data.get('yield_5yr_avg', 0)
-                ),
-                COLUMNS['PB_RATIO']: self._calculate_pb_valuation(
-                    data.get('bvps_ttm', 0),
-                    data.get('pb_5yr_avg', 0)
-                ),
-                COLUMNS['PEG_RATIO']: self._calculate_peg_valuation(
-                    data.get('eps_ttm', 0),
-                    data.get('eps_growth', 0)
-                ),
-                COLUMNS['DIVIDEND_TTM']: self._format_number(data.get('dividend_ttm', 0)),
-                COLUMNS['YIELD_5YR_AVG']: self._format_percentage(data.get('yield_5yr_avg', 0)),
-                COLUMNS['BVPS_TTM']: self._format_number(data.get('bvps_ttm', 0)),
-                COLUMNS['PB_5YR_AVG']: self._format_number(data.get('pb_5yr_avg', 0)),
-                COLUMNS['EPS_TTM']: self._format_number(data.get('eps_ttm', 0)),
-                COLUMNS['EPS_GROWTH']: self._format_percentage(data.get('eps_growth', 0))
-            }
-            formatted_data.append(row)
+        # Missing values stay NaN and propagate into the valuations computed from them
+        values = {
+            key: np.fromiter(map(attrgetter(field), records), dtype='float64', count=count)
+            for key, field in FIELDS.items() if key not in TEXT_COLUMNS
+        }
         
-        return pd.DataFrame(formatted_data, columns=self.columns)
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            target_yield = np.where(
+                values['YIELD_5YR_AVG'] != 0,
+                values['DIVIDEND_TTM'] / (values['YIELD_5YR_AVG'] * 1.2),
+                0.0
+            )
+            pb_valuation = values['BVPS_TTM'] * values['PB_5YR_AVG']
+            peg_valuation = values['EPS_TTM'] * values['EPS_GROWTH'] * 100
+        
+        computed = {
+            'TARGET_YIELD': target_yield,
+            'PB_RATIO': pb_valuation,
+            'PEG_RATIO': peg_valuation,
+        }
+        for key, column in COLUMNS.items():
+            if key in TEXT_COLUMNS:
+                continue
+            array = computed[key] if key in computed else values[key]
+            frame[column] = np.where(np.isfinite(array), array, np.nan)
+        
+        return frame[self.columns]
+
+    def format_data(self, data_list: List[Union[StockData, Mapping[str, Any]]]) -> 'pd.DataFrame':
+        """Format scraped data into DataFrame"""
+        return self.format_output(self.format_frame(data_list))
+
+    def format_output(self, frame: 'pd.DataFrame') -> 'pd.DataFrame':
+        """Render numeric columns as strings with two decimals and thousands separators, NaN as 0.00"""
+        formatted = frame.copy()
+        for key in self.keys:
+            if key not in TEXT_COLUMNS:
+                # NaN is the only value not equal to itself
+                formatted[COLUMNS[key]] = [f'{value:,.2f}' if value == value else '0.00'
+                                           for value in frame[COLUMNS[key]].tolist()]
+        return formatted
 
-    def save_to_csv(self, df: pd.DataFrame, output_path: str = None) -> None:
+    def save_to_csv(self, df: 'pd.DataFrame', output_path: str = None) -> None:
         """Save DataFrame to CSV with timestamp"""
         try:
             if output_path is None:
@@ -85,40 +151,3 @@ class CSVFormatter:
             
         except Exception as e:
             self.logger.error(f"Error saving to CSV: {str(e)}")
-
-    def _calculate_target_yield(self, dividend_ttm: float, yield_5yr_avg: float) -> str:
-        """Calculate target yield valuation"""
-        try:
-            if yield_5yr_avg and yield_5yr_avg != 0:
-                return self._format_number(dividend_ttm / (yield_5yr_avg * 1.2))
-            return "0.00"
-        except:
-            return "0.00"
-
-    def _calculate_pb_valuation(self, bvps_ttm: float, pb_5yr_avg: float) -> str:
-        """Calculate P/B valuation"""
-        try:
-            return self._format_number(bvps_ttm * pb_5yr_avg)
-        except:
-            return "0.00"
-
-    def _calculate_peg_valuation(self, eps_ttm: float, eps_growth: float) -> str:
-        """Calculate PEG valuation"""
-        try:
-            return self._format_number(eps_ttm * eps_growth * 100)
-        except:
-            return "0.00"
-
-    def _format_number(self, value: float) -> str:
-        """Format numeric values"""
-        try:
-            return f"{float(value):,.2f}"
-        except:
-            return "0.00"
-
-    def _format_percentage(self, value: float) -> str:
-        """Format percentage values"""
-        try:
-            return f"{float(value):,.2f}"
-        except:
-            return "0.00"
\ No newline at end of file
@@ -0,0 +1,158 @@
+# src/formatters/stream_writer.py
+import os
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, List, Optional
+from .csv_formatter import CSVFormatter
+from ..models.stock_data import StockData
+from ..constants.config import CSV_ENCODING, STREAM_CHUNK_SIZE
+from ..utils.helpers import get_timestamp_filename
+from ..utils.logger import setup_logger
+from ..utils.metrics import Metrics
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+class StreamWriter:
+    """Write scraped rows incrementally, one chunk at a time.
+
+    Rows are buffered until `chunk_size` have accumulated, then formatted
+    with CSVFormatter and appended to the output, so memory stays bounded by
+    the chunk size and completed rows survive a crash later in the run.
+    """
+
+    extension = ''
+
+    def __init__(self, output_path: str, formatter: Optional[CSVFormatter] = None,
+                 chunk_size: int = STREAM_CHUNK_SIZE, timestamped: bool = True,
+                 metrics: Optional[Metrics] = None):
+        self.logger = setup_logger('stream_writer')
+        self.metrics = metrics
+        self.formatter = formatter if formatter is not None else CSVFormatter()
+        self.chunk_size = max(int(chunk_size), 1)
+        self.output_path = self._resolve_path(output_path) if timestamped else output_path
+        self.rows_written = 0
+        self._buffer: List[StockData] = []
+
+    def _resolve_path(self, output_path: str) -> str:
+        """Add a timestamp to the file name, like CSVFormatter.save_to_csv"""
+        directory = os.path.dirname(output_path)
+        name, _ = os.path.splitext(os.path.basename(output_path))
+        return os.path.join(directory, get_timestamp_filename(name, self.extension))
+
+    def write(self, data: StockData) -> None:
+        """Queue one scraped record, flushing when the chunk is full"""
+        self._buffer.append(data)
+        if len(self._buffer) >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        chunk, self._buffer = self._buffer, []
+        with self._timer('format'):
+            frame = self._format_chunk(chunk)
+        with self._timer('write'):
+            self._write_frame(frame)
+        self.rows_written += len(chunk)
+
+    def _timer(self, stage: str):
+        if self.metrics is None:
+            return nullcontext()
+        return self.metrics.timer('stage_seconds', stage=stage, host='output')
+
+    def _format_chunk(self, chunk: List[StockData]) -> 'pd.DataFrame':
+        raise NotImplementedError
+
+    def _write_frame(self, frame: 'pd.DataFrame') -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        self.flush()
+        self.logger.info(f"Wrote {self.rows_written} rows to {self.output_path}")
+
+    def __enter__(self) -> 'StreamWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+class CSVStreamWriter(StreamWriter):
+    """Append formatted rows to a CSV file"""
+
+    extension = '.csv'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Keep one handle open so the UTF-8 BOM is written only once
+        self._file = open(self.output_path, 'w', encoding=CSV_ENCODING, newline='')
+        self._header_written = False
+
+    def _format_chunk(self, chunk: List[StockData]) -> 'pd.DataFrame':
+        return self.formatter.format_data(chunk)
+
+    def _write_frame(self, df: 'pd.DataFrame') -> None:
+        df.to_csv(self._file, index=False, header=not self._header_written)
+        self._header_written = True
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        super().close()
+        if not self._header_written:
+            self.formatter.format_data([]).to_csv(self._file, index=False)
+        self._file.close()
+
+class ParquetStreamWriter(StreamWriter):
+    """Append typed numeric rows to a Parquet file, one row group per chunk"""
+
+    extension = '.parquet'
+
+    def __init__(self, *args, **kwargs):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("Parquet output requires pyarrow: pip install pyarrow")
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        super().__init__(*args, **kwargs)
+        self._writer = None
+        self._closed = False
+
+    def _format_chunk(self, chunk: List[StockData]) -> 'pd.DataFrame':
+        # Numbers are stored as float64 rather than formatted strings
+        return self.formatter.format_frame(chunk)
+
+    def _write_frame(self, df: 'pd.DataFrame') -> None:
+        if self._writer is None:
+            table = self._pa.Table.from_pandas(df, preserve_index=False)
+            self._writer = self._pq.ParquetWriter(self.output_path, table.schema)
+        else:
+            table = self._pa.Table.from_pandas(df, schema=self._writer.schema, preserve_index=False)
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        super().close()
+        if self._writer is None:
+            df = self.formatter.format_frame([])
+            self._writer = self._pq.ParquetWriter(
+                self.output_path, self._pa.Table.from_pandas(df, preserve_index=False).schema
+            )
+        self._writer.close()
+
+WRITERS = {
+    'csv': CSVStreamWriter,
+    'parquet': ParquetStreamWriter,
+}
+
+def get_writer(output_format: str, output_path: str, **kwargs) -> StreamWriter:
+    """Create a streaming writer for the given output format"""
+    try:
+        writer_cls = WRITERS[output_format]
+    except KeyError:
+        raise ValueError(f"Unknown output format '{output_format}', expected one of {sorted(WRITERS)}")
+    return writer_cls(output_path, **kwargs)
@@ -0,0 +1,8 @@
+from .stock_data import StockData, FIELDS, MISSING, is_missing
+
+__all__ = [
+    'StockData',
+    'FIELDS',
+    'MISSING',
+    'is_missing'
+]
@@ -0,0 +1,98 @@
+# src/models/stock_data.py
+import math
+from datetime import datetime
+from typing import Dict, Any, Mapping, Optional, Tuple, Union
+from ..constants.selectors import SELECTORS, FINVIZ_FIELDS, TEXT_FIELDS
+
+# Every configured field, Finviz text fields first, then Morningstar fields by page
+FIELDS: Tuple[str, ...] = tuple(dict.fromkeys(
+    [*FINVIZ_FIELDS, *(field for fields in SELECTORS.values() for field in fields)]
+))
+TEXT: Tuple[str, ...] = tuple(field for field in FIELDS if field in TEXT_FIELDS)
+NUMERIC: Tuple[str, ...] = tuple(field for field in FIELDS if field not in TEXT_FIELDS)
+
+# Missing numbers are NaN and missing text is None, never 0.0 or ''
+MISSING = math.nan
+
+def is_missing(value: Any) -> bool:
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+class StockData:
+    """Scraped fields of one ticker.
+
+    Fields are slots generated from SELECTORS and FINVIZ_FIELDS, so a record
+    carries no per-instance dict. Numeric fields are floats, text fields are
+    strings, and fields that were not scraped hold MISSING or None. A record
+    with `error` set is a failed scrape.
+    """
+
+    __slots__ = ('ticker', 'timestamp', 'error') + FIELDS
+
+    def __init__(self, ticker: str, timestamp: Optional[str] = None, error: Optional[str] = None,
+                 **fields: Any):
+        self.ticker = ticker
+        self.timestamp = timestamp or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self.error = error
+        for field in TEXT:
+            setattr(self, field, None)
+        for field in NUMERIC:
+            setattr(self, field, MISSING)
+        self.update(fields)
+
+    def update(self, fields: Mapping[str, Any]) -> 'StockData':
+        """Set scraped fields, ignoring unknown keys and missing values"""
+        for field, value in fields.items():
+            if field not in FIELDS or is_missing(value):
+                continue
+            if field in TEXT_FIELDS:
+                setattr(self, field, str(value))
+            else:
+                try:
+                    setattr(self, field, float(value))
+                except (TypeError, ValueError):
+                    pass
+        return self
+
+    @property
+    def ok(self) -> bool:
+        """Scraped without error and with at least one field"""
+        return self.error is None and any(not is_missing(getattr(self, field)) for field in FIELDS)
+
+    def fields(self) -> Dict[str, Any]:
+        """Scraped fields that are present"""
+        values = {}
+        for field in FIELDS:
+            value = getattr(self, field)
+            if not is_missing(value):
+                values[field] = value
+        return values
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict with the present fields, e.g. for JSON"""
+        data = {'ticker': self.ticker, 'timestamp': self.timestamp}
+        if self.error is not None:
+            data['error'] = self.error
+        data.update(self.fields())
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> 'StockData':
+        return cls(data.get('ticker', ''), data.get('timestamp'), data.get('error')).update(data)
+
+    @classmethod
+    def coerce(cls, data: Union['StockData', Mapping[str, Any]]) -> 'StockData':
+        return data if isinstance(data, cls) else cls.from_dict(data)
+
+    @classmethod
+    def failed(cls, ticker: str, error: str) -> 'StockData':
+        """Record of a ticker whose scrape failed"""
+        return cls(ticker, error=error)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, StockData):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        status = f"error={self.error!r}" if self.error is not None else f"{len(self.fields())} fields"
+        return f"StockData({self.ticker!r}, {status})"
@@ -0,0 +1,18 @@
+from .html_parser import FragmentParser, FragmentCollector, CompiledSelector, SelectorIndex, TEXT, CELLS, ROWS
+from .extractor import ExtractionEngine, FINVIZ_PAGE, to_number
+from .parse_pool import ParsePool, parse_page
+
+__all__ = [
+    'FragmentParser',
+    'FragmentCollector',
+    'CompiledSelector',
+    'SelectorIndex',
+    'ExtractionEngine',
+    'FINVIZ_PAGE',
+    'to_number',
+    'ParsePool',
+    'parse_page',
+    'TEXT',
+    'CELLS',
+    'ROWS'
+]
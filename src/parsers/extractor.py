@@ -0,0 +1,160 @@
+# src/parsers/extractor.py
+import re
+import hashlib
+from typing import Dict, Any, Iterable, List, Optional, Union
+from .html_parser import FragmentParser, CompiledSelector, CELLS, ROWS
+from ..constants.config import HTML_PARSER
+from ..constants.selectors import (
+    SELECTORS, FINVIZ_SNAPSHOT_TABLE, FINVIZ_SCREENER_TABLE, FINVIZ_FIELDS, FINVIZ_SCREENER_COLUMNS,
+    TEXT_FIELDS
+)
+
+# Page whose fields come from the Finviz label/value snapshot table
+FINVIZ_PAGE = 'finviz'
+_SNAPSHOT = '__snapshot__'
+_SCREENER = '__screener__'
+
+# Markup left out of page fingerprints: scripts, styles and comments change
+# between downloads (nonces, tracking, timestamps) without changing any field
+_VOLATILE_RE = re.compile(rb'<(script|style)\b.*?</\1\s*>|<!--.*?-->', re.S | re.I)
+
+def to_number(value: str) -> Optional[float]:
+    """Convert scraped text such as '$1,234.50' or '2.5%' to a float"""
+    cleaned = ''.join(c for c in value if c.isdigit() or c in '.-')
+    try:
+        return float(cleaned)
+    except ValueError:
+        return None
+
+class ExtractionEngine:
+    """Extract every configured field of a page in a single parse.
+
+    Selectors come from SELECTORS (one entry per Morningstar page) and
+    FINVIZ_FIELDS (labels of the Finviz snapshot table). They are compiled
+    once when the engine is created; adding a field only needs a new entry
+    in src/constants/selectors.py.
+    """
+
+    def __init__(self, selectors: Optional[Dict[str, Dict[str, str]]] = None,
+                 finviz_fields: Optional[Dict[str, str]] = None, backend: str = HTML_PARSER):
+        self.selectors = SELECTORS if selectors is None else selectors
+        self.finviz_fields = FINVIZ_FIELDS if finviz_fields is None else finviz_fields
+        self.parsers: Dict[str, FragmentParser] = {
+            page: FragmentParser(fields, backend=backend)
+            for page, fields in self.selectors.items()
+        }
+        self.parsers[FINVIZ_PAGE] = FragmentParser(
+            {_SNAPSHOT: (FINVIZ_SNAPSHOT_TABLE, CELLS)}, backend=backend
+        )
+        # Screener result pages list the same fields for many tickers at once
+        self.screener_parser = FragmentParser({_SCREENER: (FINVIZ_SCREENER_TABLE, ROWS)}, backend=backend)
+        # Snapshot label -> output field
+        self._finviz_labels = {label: field for field, label in self.finviz_fields.items()}
+        # Screener column header -> output field; snapshot labels are accepted as headers too
+        self._screener_labels = {
+            **self._finviz_labels,
+            **{FINVIZ_SCREENER_COLUMNS[field][1]: field for field in self.finviz_fields
+               if field in FINVIZ_SCREENER_COLUMNS},
+        }
+        # Page -> byte strings marking where its selected elements may start, None if a selector has no marker
+        self._markers = {page: self._page_markers(parser.selectors.values()) for page, parser in self.parsers.items()}
+        # Page -> extraction settings mixed into its fingerprints, so editing them invalidates stored fields
+        self._salts = {
+            page: repr((sorted((name, selector.css, selector.mode) for name, selector in parser.selectors.items()),
+                        sorted(self.finviz_fields.items()) if page == FINVIZ_PAGE else None,
+                        sorted(TEXT_FIELDS))).encode()
+            for page, parser in self.parsers.items()
+        }
+
+    @property
+    def pages(self) -> List[str]:
+        return list(self.parsers)
+
+    def fields(self, page: str) -> List[str]:
+        """Output fields produced by a page"""
+        if page == FINVIZ_PAGE:
+            return list(self.finviz_fields)
+        return list(self.selectors.get(page, {}))
+
+    def extract(self, page: str, document: Union[str, bytes],
+                encoding: Optional[str] = None) -> Dict[str, Any]:
+        """Return {field: value} for every configured field found on the page"""
+        return self.convert(page, self.parse(page, document, encoding))
+
+    def parse(self, page: str, document: Union[str, bytes],
+              encoding: Optional[str] = None) -> Dict[str, Any]:
+        """Raw text fragments of a page"""
+        return self.parsers[page].parse(document, encoding)
+
+    def convert(self, page: str, fragments: Dict[str, Any]) -> Dict[str, Any]:
+        """Turn raw fragments into typed field values"""
+        if page == FINVIZ_PAGE:
+            return self._from_snapshot(fragments.get(_SNAPSHOT, []))
+        return self._convert(fragments)
+
+    def fingerprint(self, page: str, document: Union[str, bytes]) -> str:
+        """Hash of the part of a page its fields are extracted from, computed without parsing.
+
+        The hashed region starts at the first element a selector of the page
+        may match; markup before it and scripts, styles and comments are left
+        out. Two downloads with the same fingerprint extract the same fields.
+        """
+        if isinstance(document, str):
+            document = document.encode('utf-8')
+        start = 0
+        markers = self._markers.get(page)
+        if markers:
+            found = [i for i in (document.find(marker) for marker in markers) if i >= 0]
+            if found:
+                start = max(document.rfind(b'<', 0, min(found)), 0)
+        digest = hashlib.blake2b(self._salts[page], digest_size=16)
+        digest.update(_VOLATILE_RE.sub(b'', document[start:]))
+        return digest.hexdigest()
+
+    @staticmethod
+    def _page_markers(selectors: Iterable[CompiledSelector]) -> Optional[List[bytes]]:
+        markers = []
+        for selector in selectors:
+            # An element matching the selector carries this attribute value or class in its start tag
+            values = [value for _, value in selector.attrs if value] + selector.classes
+            if not values:
+                return None
+            markers.append(values[0].encode('utf-8'))
+        return markers
+
+    def extract_screener(self, document: Union[str, bytes],
+                         encoding: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Return {ticker: {field: value}} for every row of a Finviz screener page"""
+        rows = self.screener_parser.parse(document, encoding).get(_SCREENER, [])
+        if not rows or 'Ticker' not in rows[0]:
+            return {}
+        header = rows[0]
+        ticker_column = header.index('Ticker')
+        columns = [(i, self._screener_labels[label]) for i, label in enumerate(header) if label in self._screener_labels]
+        results = {}
+        for row in rows[1:]:
+            if len(row) != len(header):
+                continue
+            results[row[ticker_column]] = self._convert({field: row[i] for i, field in columns})
+        return results
+
+    def _from_snapshot(self, cells: List[str]) -> Dict[str, Any]:
+        # Snapshot cells alternate between labels and values
+        raw = {}
+        for i in range(0, len(cells) - 1, 2):
+            field = self._finviz_labels.get(cells[i])
+            if field is not None and field not in raw:
+                raw[field] = cells[i + 1]
+        return self._convert(raw)
+
+    @staticmethod
+    def _convert(raw: Dict[str, str]) -> Dict[str, Any]:
+        data = {}
+        for field, text in raw.items():
+            if field in TEXT_FIELDS:
+                data[field] = text.strip()
+            else:
+                value = to_number(text)
+                if value is not None:
+                    data[field] = value
+        return data
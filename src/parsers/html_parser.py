@@ -0,0 +1,251 @@
+# src/parsers/html_parser.py
+import re
+from typing import Dict, Any, List, Optional, Tuple, Union
+from ..constants.config import HTML_PARSER, PARSE_CHUNK_SIZE
+
+# Modes for what a selector captures
+TEXT = 'text'     # Concatenated text of the first matching element
+CELLS = 'cells'   # Text of every <td>/<th> inside the first matching element
+ROWS = 'rows'     # Cell texts of every <tr> inside the first matching element, one list per row
+
+_SELECTOR_RE = re.compile(
+    r'^(?P<tag>[a-zA-Z][\w-]*)?(?P<rest>(?:\.[\w-]+|#[\w-]+|\[[^\]]+\])*)$'
+)
+_PART_RE = re.compile(r'\.([\w-]+)|#([\w-]+)|\[\s*([\w:-]+)\s*(=\s*["\']?([^"\'\]]*)["\']?\s*)?\]')
+
+class CompiledSelector:
+    """Simple CSS selector (`tag`, `.class`, `#id`, `[attr]`, `[attr="value"]`)
+    compiled into plain comparisons for streaming matching"""
+
+    def __init__(self, css: str, mode: str = TEXT):
+        match = _SELECTOR_RE.match(css.strip())
+        if not match:
+            raise ValueError(f"Unsupported selector '{css}': only single compound selectors are supported")
+        self.css = css
+        self.mode = mode
+        self.tag = (match.group('tag') or '').lower() or None
+        self.classes: List[str] = []
+        self.attrs: List[Tuple[str, Optional[str]]] = []
+        for cls, id_, attr, equals, value in _PART_RE.findall(match.group('rest')):
+            if cls:
+                self.classes.append(cls)
+            elif id_:
+                self.attrs.append(('id', id_))
+            else:
+                self.attrs.append((attr.lower(), value if equals else None))
+
+    def matches(self, tag: str, attrib: Dict[str, str]) -> bool:
+        if self.tag is not None and tag != self.tag:
+            return False
+        for name, value in self.attrs:
+            if name not in attrib or (value is not None and attrib[name] != value):
+                return False
+        if self.classes:
+            element_classes = attrib.get('class', '').split()
+            if any(cls not in element_classes for cls in self.classes):
+                return False
+        return True
+
+    def __repr__(self) -> str:
+        return f"CompiledSelector({self.css!r}, mode={self.mode!r})"
+
+class SelectorIndex:
+    """Selectors bucketed by a key every match must carry (an exact attribute
+    value, a class or a tag), so each start tag is compared only against the
+    few selectors that could match it, however many fields are configured"""
+
+    def __init__(self, selectors: Dict[str, CompiledSelector]):
+        self.selectors = selectors
+        self._by_attr: Dict[Tuple[str, str], List[Tuple[str, CompiledSelector]]] = {}
+        self._by_class: Dict[str, List[Tuple[str, CompiledSelector]]] = {}
+        self._by_tag: Dict[str, List[Tuple[str, CompiledSelector]]] = {}
+        self._any: List[Tuple[str, CompiledSelector]] = []
+        for name, selector in selectors.items():
+            exact = [(attr, value) for attr, value in selector.attrs if value is not None]
+            if exact:
+                self._by_attr.setdefault(exact[0], []).append((name, selector))
+            elif selector.classes:
+                self._by_class.setdefault(selector.classes[0], []).append((name, selector))
+            elif selector.tag:
+                self._by_tag.setdefault(selector.tag, []).append((name, selector))
+            else:
+                self._any.append((name, selector))
+
+    def __len__(self) -> int:
+        return len(self.selectors)
+
+    def candidates(self, tag: str, attrib: Dict[str, str]):
+        """Yield (name, selector) pairs that may match this element"""
+        yield from self._any
+        yield from self._by_tag.get(tag, ())
+        if self._by_attr:
+            for item in attrib.items():
+                yield from self._by_attr.get(item, ())
+        if self._by_class and 'class' in attrib:
+            for cls in attrib['class'].split():
+                yield from self._by_class.get(cls, ())
+
+class _Capture:
+    """Text being collected for one matched element"""
+
+    def __init__(self, name: str, mode: str):
+        self.name = name
+        self.mode = mode
+        self.depth = 0
+        self.parts: List[str] = []
+        self.cells: List[str] = []
+        self.cell_depth = None
+        self.rows: List[List[str]] = []
+        self.row_depth = None
+
+class FragmentCollector:
+    """lxml parser target that records only the text of selected elements.
+
+    No tree is built: start/end/data events are matched against the compiled
+    selectors and everything outside a matched element is discarded.
+    """
+
+    def __init__(self, index: SelectorIndex):
+        self.index = index
+        self.results: Dict[str, Any] = {}
+        self._active: List[_Capture] = []
+
+    @property
+    def done(self) -> bool:
+        return len(self.results) == len(self.index) and not self._active
+
+    def start(self, tag: str, attrib: Dict[str, str]) -> None:
+        tag = tag.lower() if isinstance(tag, str) else ''
+        for capture in self._active:
+            capture.depth += 1
+            if capture.mode == ROWS and tag == 'tr' and capture.row_depth is None:
+                capture.row_depth = capture.depth
+                capture.cells = []
+            if capture.mode != TEXT and tag in ('td', 'th') and capture.cell_depth is None:
+                capture.cell_depth = capture.depth
+                capture.parts = []
+        for name, selector in self.index.candidates(tag, attrib):
+            if name in self.results or any(c.name == name for c in self._active):
+                continue
+            if selector.matches(tag, attrib):
+                self._active.append(_Capture(name, selector.mode))
+
+    def end(self, tag: str) -> None:
+        finished = []
+        for capture in self._active:
+            if capture.mode != TEXT and capture.cell_depth == capture.depth:
+                capture.cells.append(''.join(capture.parts).strip())
+                capture.cell_depth = None
+                capture.parts = []
+            if capture.mode == ROWS and capture.row_depth == capture.depth:
+                capture.rows.append(capture.cells)
+                capture.row_depth = None
+                capture.cells = []
+            if capture.depth == 0:
+                finished.append(capture)
+            else:
+                capture.depth -= 1
+        for capture in finished:
+            self._active.remove(capture)
+            if capture.mode == ROWS:
+                self.results[capture.name] = capture.rows
+            elif capture.mode == CELLS:
+                self.results[capture.name] = capture.cells
+            else:
+                self.results[capture.name] = ''.join(capture.parts)
+
+    def data(self, text: str) -> None:
+        for capture in self._active:
+            if capture.mode == TEXT or capture.cell_depth is not None:
+                capture.parts.append(text)
+
+    def comment(self, text: str) -> None:
+        pass
+
+    def close(self) -> Dict[str, Any]:
+        # Flush elements left open by truncated or early-stopped documents
+        for capture in self._active:
+            if capture.mode == ROWS:
+                self.results.setdefault(capture.name, capture.rows + ([capture.cells] if capture.cells else []))
+            elif capture.mode == CELLS:
+                self.results.setdefault(capture.name, capture.cells)
+            else:
+                self.results.setdefault(capture.name, ''.join(capture.parts))
+        self._active = []
+        return self.results
+
+class FragmentParser:
+    """Extract selected fragments from an HTML document.
+
+    Selectors are compiled and indexed once. The 'lxml' backend streams the document
+    through a parser target and stops reading as soon as every selector has
+    been matched; the 'html.parser' backend builds a full BeautifulSoup tree
+    and is kept as a fallback when lxml is not installed.
+    """
+
+    BACKENDS = ('lxml', 'html.parser')
+
+    def __init__(self, selectors: Dict[str, Union[str, Tuple[str, str], CompiledSelector]],
+                 backend: str = HTML_PARSER, chunk_size: int = PARSE_CHUNK_SIZE):
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown parser backend '{backend}', expected one of {self.BACKENDS}")
+        self.selectors = {name: self._compile(spec) for name, spec in selectors.items()}
+        self.index = SelectorIndex(self.selectors)
+        self.chunk_size = chunk_size
+        self.backend = backend
+        if backend == 'lxml':
+            try:
+                from lxml import etree
+                self._etree = etree
+            except ImportError:
+                self.backend = 'html.parser'
+
+    @staticmethod
+    def _compile(spec: Union[str, Tuple[str, str], CompiledSelector]) -> CompiledSelector:
+        if isinstance(spec, CompiledSelector):
+            return spec
+        if isinstance(spec, tuple):
+            return CompiledSelector(*spec)
+        return CompiledSelector(spec)
+
+    def parse(self, document: Union[str, bytes], encoding: Optional[str] = None) -> Dict[str, Any]:
+        """Return {name: text} (or {name: [cell texts]}, {name: [[cell texts]]}) for every matched selector"""
+        if self.backend == 'lxml':
+            return self._parse_lxml(document, encoding)
+        return self._parse_soup(document, encoding)
+
+    def _parse_lxml(self, document: Union[str, bytes], encoding: Optional[str]) -> Dict[str, Any]:
+        collector = FragmentCollector(self.index)
+        if isinstance(document, str):
+            parser = self._etree.HTMLParser(target=collector)
+        else:
+            parser = self._etree.HTMLParser(target=collector, encoding=encoding)
+        for start in range(0, len(document), self.chunk_size):
+            parser.feed(document[start:start + self.chunk_size])
+            if collector.done:
+                break
+        try:
+            return parser.close()
+        except self._etree.XMLSyntaxError:
+            return collector.close()
+
+    def _parse_soup(self, document: Union[str, bytes], encoding: Optional[str]) -> Dict[str, Any]:
+        from bs4 import BeautifulSoup
+        # Decode bytes with the response's encoding, like the lxml path
+        if isinstance(document, bytes):
+            soup = BeautifulSoup(document, 'html.parser', from_encoding=encoding)
+        else:
+            soup = BeautifulSoup(document, 'html.parser')
+        results = {}
+        for name, selector in self.selectors.items():
+            element = soup.select_one(selector.css)
+            if element is None:
+                continue
+            if selector.mode == ROWS:
+                results[name] = [[cell.text.strip() for cell in row.find_all(['td', 'th'])]
+                                 for row in element.find_all('tr')]
+            elif selector.mode == CELLS:
+                results[name] = [cell.text.strip() for cell in element.find_all(['td', 'th'])]
+            else:
+                results[name] = element.text
+        return results
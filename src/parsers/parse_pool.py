@@ -0,0 +1,59 @@
+# src/parsers/parse_pool.py
+import multiprocessing
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, Any, Optional, Tuple
+from .extractor import ExtractionEngine
+from ..constants.config import HTML_PARSER
+
+# (fields, parse wall seconds, parse CPU seconds, extract seconds)
+ParseResult = Tuple[Dict[str, Any], float, float, float]
+
+# Engine of the current worker process, built once by _init_worker
+_engine: Optional[ExtractionEngine] = None
+
+def _init_worker(backend: str) -> None:
+    global _engine
+    _engine = ExtractionEngine(backend=backend)
+
+def parse_page(engine: ExtractionEngine, page: str, content: bytes,
+               encoding: Optional[str] = None) -> ParseResult:
+    """Extract a page's fields and time the parse and extract steps"""
+    start, cpu_start = time.perf_counter(), time.thread_time()
+    fragments = engine.parse(page, content, encoding)
+    parsed, cpu = time.perf_counter(), time.thread_time() - cpu_start
+    data = engine.convert(page, fragments)
+    return data, parsed - start, cpu, time.perf_counter() - parsed
+
+def _parse(page: str, content: bytes, encoding: Optional[str]) -> ParseResult:
+    return parse_page(_engine, page, content, encoding)
+
+class ParsePool:
+    """Parse downloaded pages in worker processes, off the GIL of the I/O threads.
+
+    Only the raw page bytes are sent to a worker and only the small dict of
+    extracted fields comes back. Each worker compiles the selectors once.
+    """
+
+    def __init__(self, workers: Optional[int] = None, backend: str = HTML_PARSER):
+        self.workers = workers or os.cpu_count() or 1
+        self.backend = backend
+        # Worker threads may be running when the pool starts, so avoid plain fork
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                             initializer=_init_worker, initargs=(backend,))
+
+    def submit(self, page: str, content: bytes, encoding: Optional[str] = None) -> 'Future[ParseResult]':
+        """Queue a page, the future resolves to (fields, parse, parse CPU, extract seconds)"""
+        return self._executor.submit(_parse, page, content, encoding)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> 'ParsePool':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
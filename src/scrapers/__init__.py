@@ -1,4 +1,8 @@
 # src/scrapers/__init__.py
 from .combined_scraper import CombinedScraper
+from .batch_scraper import BatchScraper, AsyncBatchScraper
+from .request_planner import RequestPlanner
+from .finviz_screener import FinvizScreener
+from .distributed import Coordinator, ShardWorker
 
-__all__ = ['CombinedScraper']
\ No newline at end of file
+__all__ = ['CombinedScraper', 'BatchScraper', 'AsyncBatchScraper', 'RequestPlanner', 'FinvizScreener', 'Coordinator', 'ShardWorker']
@@ -1,23 +1,236 @@
 # src/scrapers/base_scraper.py
-import requests
-from typing import Optional
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+from ..transports import BaseTransport, Response, get_transport
+from ..storage.response_cache import ResponseCache, CacheEntry
+from ..constants.config import HTTP_BACKEND
 from ..utils.logger import setup_logger
+from ..utils.metrics import Metrics
+from ..utils.rate_limiter import HostLimits, HostLimiter
+from ..utils.retry import RetryPolicy, CircuitOpenError, parse_retry_after
 
 class BaseScraper:
-    def __init__(self):
+    def __init__(self, limits: Optional[HostLimits] = None, transport: Optional[BaseTransport] = None,
+                 cache: Optional[ResponseCache] = None, metrics: Optional[Metrics] = None,
+                 retry_policy: Optional[RetryPolicy] = None):
         self.logger = setup_logger('base_scraper')
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.limits = limits if limits is not None else HostLimits()
+        self.transport = transport if transport is not None else get_transport(HTTP_BACKEND)
+        self.cache = cache
+        # URL -> future of the request currently fetching it
+        self._in_flight: Dict[str, Future] = {}
+        self._in_flight_lock = threading.Lock()
 
-    def _make_request(self, url: str) -> Optional[requests.Response]:
+    def _make_request(self, url: str) -> Optional[Response]:
+        """Fetch a URL, sharing the response with concurrent requests for the same URL.
+
+        Raises CircuitOpenError if the host's circuit is open.
+        """
+        future, leader = self._join_in_flight(url)
+        if not leader:
+            return future.result()
+        try:
+            response = self._request(url)
+        except BaseException as e:
+            self._leave_in_flight(url, future, error=e)
+            raise
+        self._leave_in_flight(url, future, response)
+        return response
+
+    async def _make_request_async(self, url: str) -> Optional[Response]:
+        """`_make_request` for coroutines running on the async transport's event loop.
+
+        Requests share the in-flight table with threads, so a URL fetched by
+        both a coroutine and a thread is still downloaded once.
+        """
+        import asyncio
+        future, leader = self._join_in_flight(url)
+        if not leader:
+            return await asyncio.wrap_future(future)
+        try:
+            response = await self._request_async(url)
+        except BaseException as e:
+            self._leave_in_flight(url, future, error=e)
+            raise
+        self._leave_in_flight(url, future, response)
+        return response
+
+    def _join_in_flight(self, url: str) -> Tuple[Future, bool]:
+        """Future of the request fetching `url`, and whether the caller has to send it"""
+        with self._in_flight_lock:
+            future = self._in_flight.get(url)
+            leader = future is None
+            if leader:
+                future = self._in_flight[url] = Future()
+        if not leader:
+            self.metrics.increment('requests_coalesced', host=urlparse(url).netloc)
+        return future, leader
+
+    def _leave_in_flight(self, url: str, future: Future, response: Optional[Response] = None,
+                         error: Optional[BaseException] = None) -> None:
+        """Hand the leader's outcome to the requests waiting on it"""
+        with self._in_flight_lock:
+            del self._in_flight[url]
+        if isinstance(error, CircuitOpenError):
+            future.set_exception(error)
+        else:
+            future.set_result(response)
+
+    def _request(self, url: str) -> Optional[Response]:
+        host = urlparse(url).netloc
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=10)
-            return response if response.status_code == 200 else None
+            entry, cached = self._cached(url, host)
+            if cached is not None:
+                return cached
+            # Revalidate stale entries with a conditional request
+            headers = entry.validators() if entry is not None else None
+            response = self._fetch_with_retries(url, host, headers)
+            return self._handle_response(url, host, entry, response)
+        except CircuitOpenError:
+            raise
         except Exception as e:
+            self.metrics.increment('request_errors', host=host)
             self.logger.error(f"Error making request to {url}: {str(e)}")
             return None
 
+    async def _request_async(self, url: str) -> Optional[Response]:
+        host = urlparse(url).netloc
+        try:
+            entry, cached = self._cached(url, host)
+            if cached is not None:
+                return cached
+            headers = entry.validators() if entry is not None else None
+            response = await self._fetch_with_retries_async(url, host, headers)
+            return self._handle_response(url, host, entry, response)
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            self.metrics.increment('request_errors', host=host)
+            self.logger.error(f"Error making request to {url}: {str(e)}")
+            return None
+
+    def _cached(self, url: str, host: str) -> Tuple[Optional[CacheEntry], Optional[Response]]:
+        """Cache entry of a URL, and the cached response if it can be served without a request"""
+        entry = self.cache.lookup(url) if self.cache else None
+        if entry is not None and entry.is_fresh:
+            self.cache.record('hits', len(entry.content))
+            self.metrics.increment('cache_events', event='hit', host=host)
+            return entry, entry.to_response()
+        return entry, None
+
+    def _handle_response(self, url: str, host: str, entry: Optional[CacheEntry],
+                         response: Optional[Response]) -> Optional[Response]:
+        """Serve a revalidated cache entry or cache a new response; None unless it is a 200"""
+        if response is None:
+            return None
+        if response.status_code == 304 and entry is not None:
+            self.cache.touch(url)
+            self.cache.record('revalidated', len(entry.content))
+            self.metrics.increment('cache_events', event='revalidated', host=host)
+            return entry.to_response()
+        if self.cache:
+            self.cache.record('misses')
+            self.metrics.increment('cache_events', event='miss', host=host)
+            if response.status_code == 200:
+                self.cache.store(response, url)
+        return response if response.status_code == 200 else None
+
+    def _fetch_with_retries(self, url: str, host: str, headers: Optional[dict]) -> Optional[Response]:
+        """Fetch a URL, backing off and retrying on throttling, server and connection errors"""
+        limiter = self.limits.for_url(url)
+        for attempt in range(self.retry_policy.max_retries + 1):
+            # Wait for the host's circuit breaker, rate and concurrency budget
+            with self.metrics.timer('stage_seconds', stage='wait', host=host):
+                try:
+                    limiter.acquire()
+                except CircuitOpenError:
+                    self.metrics.increment('circuit_rejected', host=host)
+                    raise
+            response, error = None, None
+            try:
+                with self.metrics.timer('stage_seconds', stage='fetch', host=host):
+                    response = self.transport.get(url, headers=headers or None)
+            except Exception as e:
+                error = e
+            finally:
+                limiter.release()
+
+            delay = self._retry_delay(url, host, limiter, attempt, response, error)
+            if delay is None:
+                return response
+            with self.metrics.timer('stage_seconds', stage='backoff', host=host):
+                time.sleep(delay)
+        return None
+
+    async def _fetch_with_retries_async(self, url: str, host: str, headers: Optional[dict]) -> Optional[Response]:
+        """`_fetch_with_retries` awaiting the host limits, the transport and the backoff"""
+        import asyncio
+        limiter = self.limits.for_url(url)
+        for attempt in range(self.retry_policy.max_retries + 1):
+            with self.metrics.timer('stage_seconds', stage='wait', host=host):
+                try:
+                    await limiter.acquire_async()
+                except CircuitOpenError:
+                    self.metrics.increment('circuit_rejected', host=host)
+                    raise
+            response, error = None, None
+            try:
+                with self.metrics.timer('stage_seconds', stage='fetch', host=host):
+                    response = await self.transport.fetch(url, headers=headers or None)
+            except Exception as e:
+                error = e
+            finally:
+                limiter.release()
+
+            delay = self._retry_delay(url, host, limiter, attempt, response, error)
+            if delay is None:
+                return response
+            with self.metrics.timer('stage_seconds', stage='backoff', host=host):
+                await asyncio.sleep(delay)
+        return None
+
+    def _retry_delay(self, url: str, host: str, limiter: HostLimiter, attempt: int,
+                     response: Optional[Response], error: Optional[Exception]) -> Optional[float]:
+        """Record the outcome of an attempt, return seconds to wait before retrying or None if it is final.
+
+        Raises the attempt's error when giving up after a connection error.
+        """
+        status = response.status_code if response is not None else None
+        if response is not None:
+            self.metrics.increment('requests', host=host, status=status)
+            self.metrics.increment('bytes_downloaded', len(response.content), host=host)
+        if not self.retry_policy.should_retry(status):
+            limiter.record_success()
+            return None
+
+        retry_after = parse_retry_after(response.headers.get('retry-after')) if response is not None else None
+        if limiter.record_failure(throttled=status == 429, retry_after=retry_after):
+            self.metrics.increment('circuit_opened', host=host)
+            self.logger.warning(f"Circuit opened for {host} after {limiter.breaker.failures} consecutive failures")
+        reason = status if status is not None else f"{type(error).__name__}: {error}"
+        if attempt >= self.retry_policy.max_retries:
+            self.logger.error(f"Giving up on {url} after {attempt + 1} attempts ({reason})")
+            if error is not None:
+                raise error
+            return None
+
+        delay = self.retry_policy.delay(attempt, retry_after)
+        self.metrics.increment('retries', host=host, reason=status if status is not None else 'error')
+        self.logger.warning(f"Retrying {url} in {delay:.1f}s ({reason}), "
+                            f"{host} rate now {limiter.rate:.2f} req/s")
+        return delay
+
+    def close(self) -> None:
+        """Release the transport's pooled connections and the cache"""
+        self.transport.close()
+        if self.cache:
+            self.cache.close()
+
     def _clean_numeric(self, value: str) -> float:
         """Clean numeric string and convert to float"""
         try:
@@ -25,4 +238,4 @@ class BaseScraper:
             cleaned = ''.join(c for c in value if c.isdigit() or c in '.-')
             return float(cleaned)
         except:
-            return 0.0
\ No newline at end of file
+            return 0.0
@@ -0,0 +1,94 @@
+# src/scrapers/batch_scraper.py
+from concurrent.futures import Future, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Iterable, Iterator, List, Optional
+from .combined_scraper import CombinedScraper
+from ..models.stock_data import StockData
+from ..constants.config import MAX_WORKERS, ASYNC_MAX_WORKERS
+from ..utils.logger import setup_logger
+
+class BatchScraper:
+    """Scrape many tickers concurrently with a pool of worker threads.
+
+    Workers share a single CombinedScraper, so the per-host rate and
+    concurrency limits apply across the whole batch rather than per ticker.
+    """
+
+    def __init__(self, scraper: Optional[CombinedScraper] = None, max_workers: int = MAX_WORKERS):
+        self.scraper = scraper if scraper is not None else CombinedScraper()
+        self.max_workers = max(int(max_workers), 1)
+        self.logger = setup_logger('batch_scraper')
+
+    def scrape_iter(self, tickers: Iterable[str]) -> Iterator[StockData]:
+        """Yield scraped data for each ticker as soon as it completes"""
+        # Tickers pass through the scraper's prefetch, which looks up Finviz fields in bulk
+        ticker_iter = iter(self.scraper.prefetch(tickers))
+
+        with ThreadPoolExecutor(max_workers=self.max_workers,
+                                thread_name_prefix='scraper') as executor:
+            # Keep a bounded window of pending tickers so input is consumed lazily
+            yield from self._run(ticker_iter, lambda ticker: executor.submit(self.scraper.scrape_stock_data, ticker),
+                                 window=self.max_workers * 2)
+
+    def scrape_all(self, tickers: Iterable[str]) -> List[StockData]:
+        """Scrape all tickers and return results in input order"""
+        tickers = list(tickers)
+        results = {}
+        for data in self.scrape_iter(tickers):
+            results[data.ticker] = data
+        return [results[ticker] for ticker in tickers if ticker in results]
+
+    def _run(self, ticker_iter: Iterator[str], submit: Callable[[str], Future], window: int) -> Iterator[StockData]:
+        """Keep up to `window` tickers submitted, yielding each result as it completes"""
+        pending = {}
+        try:
+            for ticker in ticker_iter:
+                pending[submit(ticker)] = ticker
+                if len(pending) >= window:
+                    break
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    ticker = pending.pop(future)
+                    yield self._result(future, ticker)
+
+                for ticker in ticker_iter:
+                    pending[submit(ticker)] = ticker
+                    if len(pending) >= window:
+                        break
+        finally:
+            # Tickers nobody will read if the caller stops early
+            for future in pending:
+                future.cancel()
+
+    def _result(self, future, ticker: str) -> StockData:
+        try:
+            return future.result()
+        except Exception as e:
+            self.logger.error(f"Error scraping {ticker}: {str(e)}")
+            return self.scraper._create_error_data(ticker, str(e))
+
+class AsyncBatchScraper(BatchScraper):
+    """Scrape many tickers concurrently as coroutines on the async transport's event loop.
+
+    Each ticker is a task awaiting its requests through the hosts' async
+    rate and concurrency limits, so `max_workers` tickers can have requests
+    in flight from one thread. Tickers are read, and their screener pages
+    prefetched, in the calling thread.
+    """
+
+    def __init__(self, scraper: Optional[CombinedScraper] = None, max_workers: int = ASYNC_MAX_WORKERS):
+        super().__init__(scraper, max_workers)
+        self.loop = getattr(self.scraper.transport, 'loop', None)
+        if self.loop is None:
+            raise ValueError("AsyncBatchScraper requires a scraper using the async transport")
+
+    def scrape_iter(self, tickers: Iterable[str]) -> Iterator[StockData]:
+        """Yield scraped data for each ticker as soon as it completes"""
+        import asyncio
+        ticker_iter = iter(self.scraper.prefetch(tickers))
+
+        def submit(ticker: str) -> Future:
+            return asyncio.run_coroutine_threadsafe(self.scraper.scrape_stock_data_async(ticker), self.loop)
+        # Submitted tickers are all running, so the window is the concurrency
+        yield from self._run(ticker_iter, submit, window=self.max_workers)
@@ -1,153 +1,363 @@
 # src/scrapers/combined_scraper.py
-import time
-from typing import Dict, Any, Optional
-from datetime import datetime
-from bs4 import BeautifulSoup
+from concurrent.futures import Future
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Set, Tuple
+from urllib.parse import urlparse
 from .base_scraper import BaseScraper
-from ..constants.config import MORNINGSTAR_URL, FINVIZ_URL
+from .finviz_screener import FinvizScreener
+from .metadata_revalidator import MetadataRevalidator
+from .request_planner import RequestPlanner
+from ..constants.config import HTML_PARSER, FINVIZ_SCREENER
+from ..models.stock_data import StockData
+from ..parsers.extractor import ExtractionEngine, FINVIZ_PAGE
+from ..parsers.parse_pool import ParsePool, parse_page
 from ..utils.logger import setup_logger
+from ..utils.metrics import Metrics
+from ..utils.rate_limiter import HostLimits
+from ..utils.retry import RetryPolicy, CircuitOpenError
+from ..transports import BaseTransport, Response
+from ..storage.response_cache import ResponseCache
+from ..storage.field_store import FieldStore
+from ..storage.fingerprint_store import FingerprintStore
+from ..storage.metadata_index import MetadataIndex, METADATA_FIELDS
 
 class CombinedScraper(BaseScraper):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, limits: Optional[HostLimits] = None, transport: Optional[BaseTransport] = None,
+                 cache: Optional[ResponseCache] = None, parser_backend: str = HTML_PARSER,
+                 metrics: Optional[Metrics] = None, retry_policy: Optional[RetryPolicy] = None,
+                 parse_pool: Optional[ParsePool] = None, fields: Optional[Iterable[str]] = None,
+                 field_store: Optional[FieldStore] = None, use_screener: bool = FINVIZ_SCREENER,
+                 metadata: Optional[MetadataIndex] = None, fingerprints: Optional[FingerprintStore] = None):
+        super().__init__(limits, transport, cache, metrics, retry_policy)
         self.logger = setup_logger('combined_scraper')
+        # Selectors are compiled once and shared by all worker threads
+        self.engine = ExtractionEngine(backend=parser_backend)
+        # Only pages providing at least one of the requested fields are fetched
+        self.planner = RequestPlanner(self.engine, fields)
+        if self.planner.skipped:
+            self.logger.info(f"Skipping pages without requested fields: {', '.join(self.planner.skipped)}")
+        # With a field store only pages providing stale fields are fetched
+        self.field_store = field_store
+        # Optional worker processes that parse pages instead of the I/O threads
+        self.parse_pool = parse_pool
+        # Pages unchanged since their last download reuse the fields extracted then
+        self.fingerprints = fingerprints
+        # Finviz fields of prefetched tickers come from screener pages instead of quote pages
+        self.screener = None
+        if use_screener and FINVIZ_PAGE in self.planner.pages:
+            self.screener = FinvizScreener(self.engine, self._make_request, self.metrics)
+        # Indexed tickers skip Finviz entirely when only metadata fields are wanted from it; the
+        # index is filled from every Finviz page or screener row scraped
+        self.metadata = metadata
+        self.revalidator = None
+        if metadata is not None and FINVIZ_PAGE in self.planner.pages:
+            self.revalidator = MetadataRevalidator(metadata, self._fetch_finviz, self.metrics)
 
-    def scrape_stock_data(self, ticker: str) -> Dict[str, Any]:
-        """Scrape stock data from both Morningstar and Finviz"""
-        try:
-            # Initialize data with ticker
-            data = {
-                'ticker': ticker,
-                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            }
-            
-            print(f"\nScraping data for {ticker}...")
-            
-            # Morningstar URLs
-            ms_pages = {
-                'quote': f"{MORNINGSTAR_URL}/stocks/{ticker}/quote",
-                'dividends': f"{MORNINGSTAR_URL}/stocks/{ticker}/dividends",
-                'valuation': f"{MORNINGSTAR_URL}/stocks/{ticker}/valuation",
-                'financials': f"{MORNINGSTAR_URL}/stocks/{ticker}/financials"
-            }
-            
-            # Scrape Morningstar data
-            ms_data = self._scrape_morningstar(ms_pages)
-            data.update(ms_data)
-            
-            # Finviz URL
-            fv_url = f"{FINVIZ_URL}/quote.ashx?t={ticker}"
-            
-            # Scrape Finviz data
-            fv_data = self._scrape_finviz(fv_url)
-            data.update(fv_data)
-            
-            return data
-            
-        except Exception as e:
-            self.logger.error(f"Error scraping {ticker}: {str(e)}")
-            return self._create_error_data(ticker, str(e))
+    def prefetch(self, tickers: Iterable[str]) -> Iterator[str]:
+        """Yield `tickers` back, looking up their Finviz fields on screener pages in groups ahead of scraping"""
+        if self.screener is None:
+            return iter(tickers)
+        finviz_fields = self.planner.page_fields[FINVIZ_PAGE]
 
-    def _scrape_morningstar(self, urls: Dict[str, str]) -> Dict[str, Any]:
-        """Scrape data from Morningstar"""
-        data = {}
-        
-        try:
-            # Get current price
-            quote_data = self._scrape_ms_quote(urls['quote'])
-            data.update(quote_data)
+        def needed(ticker: str) -> bool:
+            if self.revalidator is not None and finviz_fields <= set(METADATA_FIELDS) and ticker in self.metadata:
+                return False
+            return self.field_store is None or bool(self.field_store.stale_fields(ticker, finviz_fields))
+        return self.screener.prefetch(tickers, needed)
+
+    def scrape_stock_data(self, ticker: str, fields: Optional[Iterable[str]] = None) -> StockData:
+        """Scrape stock data from both Morningstar and Finviz, optionally only the pages providing `fields`"""
+        with self.metrics.ticker(ticker):
+            try:
+                # Initialize data with ticker
+                data = StockData(ticker)
             
-            # Add delay between requests
-            time.sleep(2)
+                print(f"\nScraping data for {ticker}...")
             
-            # Get dividend data
-            dividend_data = self._scrape_ms_dividends(urls['dividends'])
-            data.update(dividend_data)
+                if self.field_store is not None:
+                    return self._refresh(data, fields)
             
-            time.sleep(2)
+                # Morningstar and Finviz URLs of the pages providing requested fields
+                urls = self.planner.urls(ticker, fields)
             
-            # Get valuation data
-            valuation_data = self._scrape_ms_valuation(urls['valuation'])
-            data.update(valuation_data)
+                # Scrape Morningstar and Finviz data
+                data.update(self._scrape_pages(ticker, urls, fields)[0])
             
-            return data
+                return data
             
-        except Exception as e:
-            self.logger.error(f"Error scraping Morningstar: {str(e)}")
-            return {}
+            except Exception as e:
+                self.logger.error(f"Error scraping {ticker}: {str(e)}")
+                return self._create_error_data(ticker, str(e))
+
+    async def scrape_stock_data_async(self, ticker: str, fields: Optional[Iterable[str]] = None) -> StockData:
+        """`scrape_stock_data` as a coroutine, run on the event loop of the async transport.
+
+        Requests are awaited rather than blocking a thread, so one thread keeps
+        the pages of many tickers in flight. Pages are parsed off the loop.
+        """
+        with self.metrics.ticker(ticker):
+            try:
+                data = StockData(ticker)
+
+                print(f"\nScraping data for {ticker}...")
+
+                if self.field_store is not None:
+                    return await self._refresh_async(data, fields)
+
+                urls = self.planner.urls(ticker, fields)
+                data.update((await self._scrape_pages_async(ticker, urls, fields))[0])
+
+                return data
+
+            except Exception as e:
+                self.logger.error(f"Error scraping {ticker}: {str(e)}")
+                return self._create_error_data(ticker, str(e))
+
+    def _refresh(self, data: StockData, fields: Optional[Iterable[str]] = None) -> StockData:
+        """Scrape only the pages providing stale fields and merge them with the stored fields"""
+        stale = self._stale_fields(data.ticker, fields)
+        if not stale:
+            return data.update(self.field_store.load(data.ticker))
+        urls = self.planner.urls(data.ticker, stale)
+        return self._merge_refresh(data, urls, *self._scrape_pages(data.ticker, urls, stale))
+
+    async def _refresh_async(self, data: StockData, fields: Optional[Iterable[str]] = None) -> StockData:
+        stale = self._stale_fields(data.ticker, fields)
+        if not stale:
+            return data.update(self.field_store.load(data.ticker))
+        urls = self.planner.urls(data.ticker, stale)
+        return self._merge_refresh(data, urls, *await self._scrape_pages_async(data.ticker, urls, stale))
+
+    def _stale_fields(self, ticker: str, fields: Optional[Iterable[str]] = None) -> Set[str]:
+        """Requested fields of a ticker older than their max age in the field store"""
+        requested = self.planner.requested_fields
+        if fields is not None:
+            requested &= set(fields)
+        stale = self.field_store.stale_fields(ticker, requested)
+        if not stale:
+            self.metrics.increment('refresh_skipped_tickers')
+            self.metrics.increment('refresh_pages_skipped', len(self.planner.pages))
+        return stale
+
+    def _merge_refresh(self, data: StockData, urls: Dict[str, str], fresh: Dict[str, Any],
+                       scraped: List[str]) -> StockData:
+        """Store the fields of the refreshed pages and merge them with the stored fields.
 
-    def _scrape_finviz(self, url: str) -> Dict[str, Any]:
-        """Scrape data from Finviz"""
+        If none of the stale pages could be scraped, the stored values are
+        kept but the record is marked failed, so it is neither journaled as
+        done nor written to the history as a new snapshot.
+        """
+        checked = set().union(*(self.planner.page_fields[page] for page in scraped))
+        self.field_store.update(data.ticker, fresh, checked)
+        self.metrics.increment('refresh_pages_skipped', len(self.planner.pages) - len(urls))
+        data.update({**self.field_store.load(data.ticker), **fresh})
+        if urls and not scraped:
+            self.metrics.increment('refresh_failed_tickers')
+            data.error = f"Refresh failed: none of {len(urls)} stale pages could be scraped"
+        return data
+
+    def _scrape_pages(self, ticker: str, urls: Dict[str, str],
+                      fields: Optional[Iterable[str]] = None) -> Tuple[Dict[str, Any], List[str]]:
+        """Download every page, then merge the fields extracted from each.
+
+        Returns the merged fields and the pages that were fetched and parsed.
+        With a parse pool, pages are parsed in worker processes while the
+        remaining pages of the ticker are still downloading. The Finviz page
+        is skipped if only metadata fields of an indexed ticker are wanted
+        from it, or if the ticker was already found on a screener page.
+        Indexed metadata is kept if the Finviz page fails.
+        """
+        data, scraped, urls, indexed = self._skip_pages(ticker, urls, fields)
+        pending = {page: self._start_page(page, url) for page, url in urls.items()}
+        for page, future in pending.items():
+            extracted = self._page_result(page, urls[page], future)
+            if extracted is not None:
+                data.update(extracted)
+                scraped.append(page)
+        if self.revalidator is not None and not indexed and FINVIZ_PAGE in scraped:
+            self.metadata.update(ticker, data)
+        return data, scraped
+
+    async def _scrape_pages_async(self, ticker: str, urls: Dict[str, str],
+                                  fields: Optional[Iterable[str]] = None) -> Tuple[Dict[str, Any], List[str]]:
+        """`_scrape_pages` fetching and parsing a ticker's pages concurrently on the event loop"""
+        import asyncio
+        data, scraped, urls, indexed = self._skip_pages(ticker, urls, fields)
+        results = await asyncio.gather(*(self._load_page_async(page, url) for page, url in urls.items()))
+        for page, extracted in zip(urls, results):
+            if extracted is not None:
+                data.update(extracted)
+                scraped.append(page)
+        if self.revalidator is not None and not indexed and FINVIZ_PAGE in scraped:
+            self.metadata.update(ticker, data)
+        return data, scraped
+
+    def _skip_pages(self, ticker: str, urls: Dict[str, str], fields: Optional[Iterable[str]] = None
+                    ) -> Tuple[Dict[str, Any], List[str], Dict[str, str], bool]:
+        """Answer the Finviz page from the metadata index or a screener row if possible.
+
+        Returns the fields found so far, the pages they answer, the URLs still
+        to fetch and whether the Finviz page was answered from the index.
+        """
+        data, scraped = {}, []
+        indexed = False
+        if self.revalidator is not None and FINVIZ_PAGE in urls:
+            wanted = self.planner.page_fields[FINVIZ_PAGE]
+            if fields is not None:
+                wanted = wanted & set(fields)
+            if self._from_metadata(ticker, data, wanted):
+                indexed = True
+                scraped.append(FINVIZ_PAGE)
+                urls = {page: url for page, url in urls.items() if page != FINVIZ_PAGE}
+        if self.screener is not None and FINVIZ_PAGE in urls:
+            screened = self.screener.take(ticker)
+            self.metrics.increment('finviz_screener', outcome='fallback' if screened is None else 'hit')
+            if screened is not None:
+                data.update(screened)
+                scraped.append(FINVIZ_PAGE)
+                urls = {page: url for page, url in urls.items() if page != FINVIZ_PAGE}
+        return data, scraped, urls, indexed
+
+    def _from_metadata(self, ticker: str, data: Dict[str, Any], wanted: Iterable[str]) -> bool:
+        """Fill in the indexed metadata of a ticker; True if it answers every `wanted` Finviz field.
+
+        A stale entry answering the ticker is scheduled for background
+        revalidation; otherwise the Finviz page is scraped and refreshes it.
+        """
+        indexed = self.metadata.lookup(ticker)
+        if indexed is None:
+            self.metrics.increment('metadata_index', outcome='miss')
+            return False
+        data.update(indexed)
+        if not set(wanted) <= set(METADATA_FIELDS):
+            self.metrics.increment('metadata_index', outcome='partial')
+            return False
+        self.metrics.increment('metadata_index', outcome='hit')
+        if self.metadata.is_stale(ticker):
+            self.revalidator.schedule(ticker)
+        return True
+
+    def _fetch_finviz(self, tickers: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Current Finviz fields of tickers, from one screener page or else their quote pages"""
+        results = {}
+        if self.screener is not None:
+            self.screener.load(tickers)
+            for ticker in tickers:
+                fields = self.screener.take(ticker)
+                if fields is not None:
+                    results[ticker] = fields
+        for ticker in tickers:
+            if ticker not in results:
+                url = self.planner.url(FINVIZ_PAGE, ticker)
+                fields = self._page_result(FINVIZ_PAGE, url, self._start_page(FINVIZ_PAGE, url))
+                if fields is not None:
+                    results[ticker] = fields
+        return results
+
+    def _start_page(self, page: str, url: str) -> Optional[Future]:
+        """Fetch a page and hand it to the parser, unless its fingerprint is unchanged"""
         try:
             response = self._make_request(url)
             if not response:
-                return {}
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            data = {}
-            
-            # Scrape Finviz data
-            table = soup.find('table', {'class': 'snapshot-table2'})
-            if table:
-                rows = table.find_all('tr')
-                for row in rows:
-                    cells = row.find_all('td')
-                    for i in range(0, len(cells), 2):
-                        if i + 1 < len(cells):
-                            label = cells[i].text.strip()
-                            value = cells[i + 1].text.strip()
-                            
-                            if label == 'Sector':
-                                data['sector'] = value
-                            elif label == 'Industry':
-                                data['industry'] = value
-            
-            return data
+                return None
+            return self._parse_response(page, url, response)
             
+        except CircuitOpenError:
+            # Fail the whole ticker so it is retried by --resume
+            raise
         except Exception as e:
-            self.logger.error(f"Error scraping Finviz: {str(e)}")
-            return {}
+            self.logger.error(f"Error scraping {page} page {url}: {str(e)}")
+            return None
 
-    def _scrape_ms_quote(self, url: str) -> Dict[str, Any]:
-        """Scrape quote data from Morningstar"""
+    async def _load_page_async(self, page: str, url: str) -> Optional[Dict[str, Any]]:
+        """Fetch a page on the event loop and parse it in a thread or the parse pool, None if it failed"""
+        import asyncio
         try:
-            response = self._make_request(url)
+            response = await self._make_request_async(url)
             if not response:
-                return {}
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            price_element = soup.select_one('div[data-test="current-price"]')
-            
-            return {
-                'current_price': self._clean_numeric(price_element.text) if price_element else 0.0
-            }
+                return None
+            future = await asyncio.get_running_loop().run_in_executor(
+                None, self._parse_response, page, url, response)
+            await asyncio.wait([asyncio.wrap_future(future)])
+
+        except CircuitOpenError:
+            raise
         except Exception as e:
-            self.logger.error(f"Error scraping Morningstar quote: {str(e)}")
-            return {}
+            self.logger.error(f"Error scraping {page} page {url}: {str(e)}")
+            return None
+        return self._page_result(page, url, future)
+
+    def _parse_response(self, page: str, url: str, response: Response) -> Future:
+        """Hand a downloaded page to the parser, unless its fingerprint is unchanged"""
+        digest = None
+        if self.fingerprints is not None:
+            digest, reused = self._fingerprint(page, url, response.content)
+            if reused is not None:
+                future = Future()
+                future.set_result(reused)
+                return future
+        if self.parse_pool is not None:
+            future = self.parse_pool.submit(page, response.content, response.encoding)
+        else:
+            future = Future()
+            future.set_result(parse_page(self.engine, page, response.content, response.encoding))
+        if digest is not None:
+            future.add_done_callback(lambda done: self._remember(url, digest, done))
+        return future
+
+    def _fingerprint(self, page: str, url: str, content: bytes) -> Tuple[str, Optional[tuple]]:
+        """Fingerprint a downloaded page, returning its digest and, if unchanged, a parse result of the stored fields"""
+        host = urlparse(url).netloc
+        with self.metrics.timer('stage_seconds', stage='fingerprint', host=host):
+            digest = self.engine.fingerprint(page, content)
+            stored = self.fingerprints.lookup(url, digest)
+        if stored is None:
+            self.metrics.increment('page_fingerprints', outcome='parsed', host=host)
+            return digest, None
+        fields, parse_cpu = stored
+        self.metrics.increment('page_fingerprints', outcome='reused', host=host)
+        self.metrics.observe('parse_cpu_saved_seconds', parse_cpu, host=host)
+        # Reused fields were not parsed, so there are no parse timings to record
+        return digest, (fields, None, None, None)
 
-    def _scrape_ms_dividends(self, url: str) -> Dict[str, Any]:
-        """Scrape dividend data from Morningstar"""
-        # Add implementation
-        return {}
+    def _remember(self, url: str, digest: str, future: Future) -> None:
+        """Store the fields parsed from a page under its fingerprint"""
+        if future.cancelled() or future.exception() is not None:
+            return
+        data, _, parse_cpu, _ = future.result()
+        try:
+            self.fingerprints.store(url, digest, data, parse_cpu)
+        except Exception as e:
+            self.logger.error(f"Error storing fingerprint of {url}: {str(e)}")
+
+    def _page_result(self, page: str, url: str, future: Optional[Future]) -> Optional[Dict[str, Any]]:
+        """Wait for a page's extracted fields and record its parse timings, None if it failed"""
+        if future is None:
+            return None
+        try:
+            data, parse_seconds, parse_cpu, extract_seconds = future.result()
+        except Exception as e:
+            self.logger.error(f"Error parsing {page} page {url}: {str(e)}")
+            return None
+        if parse_seconds is not None:
+            host = urlparse(url).netloc
+            self.metrics.observe('stage_seconds', parse_seconds, stage='parse', host=host)
+            self.metrics.observe('parse_cpu_seconds', parse_cpu, host=host)
+            self.metrics.observe('stage_seconds', extract_seconds, stage='extract', host=host)
+        return data
 
-    def _scrape_ms_valuation(self, url: str) -> Dict[str, Any]:
-        """Scrape valuation data from Morningstar"""
-        # Add implementation
-        return {}
+    def close(self) -> None:
+        if self.revalidator is not None:
+            self.revalidator.close()
+        super().close()
+        if self.metadata is not None:
+            self.metadata.close()
+        if self.parse_pool is not None:
+            self.parse_pool.close()
+        if self.fingerprints is not None:
+            self.fingerprints.close()
+        if self.field_store is not None:
+            self.field_store.close()
 
-    def _create_error_data(self, ticker: str, error: str) -> Dict[str, Any]:
+    def _create_error_data(self, ticker: str, error: str) -> StockData:
         """Create data structure for error cases"""
-        return {
-            'ticker': ticker,
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'error': error,
-            'sector': '',
-            'industry': '',
-            'current_price': 0.0,
-            'dividend_ttm': 0.0,
-            'yield_5yr_avg': 0.0,
-            'bvps_ttm': 0.0,
-            'pb_5yr_avg': 0.0,
-            'eps_ttm': 0.0,
-            'eps_growth': 0.0
-        }
\ No newline at end of file
+        return StockData.failed(ticker, error)
\ No newline at end of file
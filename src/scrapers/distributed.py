@@ -0,0 +1,185 @@
+# src/scrapers/distributed.py
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from typing import Dict, Iterable, Iterator, Optional, Sequence, Tuple
+from .batch_scraper import BatchScraper
+from ..constants.config import SHARD_SIZE, SHARD_LOCAL_WORKERS, SHARD_POLL_INTERVAL, PROJECT_ROOT
+from ..models.stock_data import StockData
+from ..storage.shard_queue import ShardQueue, Shard
+from ..utils.logger import setup_logger
+from ..utils.metrics import Metrics
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+class ShardWorker:
+    """Lease shards of a distributed run and scrape them with a BatchScraper.
+
+    The worker's scraper has its own transport, host rate limits and, with a
+    proxy, its own egress address, so every worker adds a full rate budget.
+    The lease is extended from a background thread while a shard is being
+    scraped; the worker exits once the run has no queued or leased shards.
+    The scraper's metrics are stored with every completed shard.
+    """
+
+    def __init__(self, queue: ShardQueue, batch: BatchScraper, worker_id: Optional[str] = None,
+                 poll_interval: float = SHARD_POLL_INTERVAL):
+        self.logger = setup_logger('shard_worker')
+        self.queue = queue
+        self.batch = batch
+        self.worker_id = worker_id or default_worker_id()
+        self.poll_interval = poll_interval
+        # A restarted worker keeps its id, so its stats are stored under a key of its own
+        self.stats_key = f"{self.worker_id}-{uuid.uuid4().hex[:6]}"
+
+    def run(self, run_id: str) -> int:
+        """Scrape shards until the run is finished, returning the number of shards completed"""
+        completed = 0
+        while True:
+            shard = self.queue.lease(self.worker_id, run_id)
+            if shard is None:
+                if self.queue.finished(run_id):
+                    return completed
+                # Other workers hold the remaining shards; take over any whose lease expires
+                time.sleep(self.poll_interval)
+                continue
+            if self._scrape(shard):
+                completed += 1
+
+    def _scrape(self, shard: Shard) -> bool:
+        self.logger.info(f"{self.worker_id} scraping shard {shard.shard_id} ({len(shard.tickers)} tickers)")
+        stop = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(shard, stop), daemon=True)
+        heartbeat.start()
+        try:
+            results = list(self.batch.scrape_iter(shard.tickers))
+        except Exception as e:
+            self.logger.error(f"Shard {shard.shard_id} failed on {self.worker_id}: {str(e)}")
+            self.queue.fail(shard, self.worker_id, str(e))
+            return False
+        finally:
+            stop.set()
+            heartbeat.join()
+        stats = self.batch.scraper.metrics.to_state()
+        if not self.queue.complete(shard, self.worker_id, results, stats=stats, stats_key=self.stats_key):
+            self.logger.warning(f"Lost the lease on shard {shard.shard_id}, results dropped")
+            return False
+        return True
+
+    def _heartbeat(self, shard: Shard, stop: threading.Event) -> None:
+        while not stop.wait(self.queue.lease_seconds / 3):
+            if not self.queue.heartbeat(shard, self.worker_id):
+                return
+
+class Coordinator:
+    """Shard a ticker list across worker processes and merge their results.
+
+    Tickers are split into shards in a ShardQueue. `local_workers` worker
+    processes (`main.py --worker`) are started on this machine, each with
+    the next proxy from `proxies`, if any. Workers on other nodes can join
+    the same run by pointing `--worker` at the queue file. A local worker
+    that exits early has its shards requeued at once and is restarted while
+    work remains. Like BatchScraper, results are yielded as shards finish.
+    """
+
+    def __init__(self, queue: ShardQueue, worker_args: Sequence[str] = (), local_workers: int = SHARD_LOCAL_WORKERS,
+                 shard_size: int = SHARD_SIZE, proxies: Sequence[str] = (), fields: Optional[Iterable[str]] = None,
+                 poll_interval: float = SHARD_POLL_INTERVAL):
+        self.logger = setup_logger('coordinator')
+        self.queue = queue
+        self.worker_args = list(worker_args)
+        self.local_workers = max(int(local_workers), 0)
+        self.shard_size = shard_size
+        self.proxies = list(proxies)
+        self.fields = sorted(fields) if fields is not None else None
+        self.poll_interval = poll_interval
+        self.run_id: Optional[str] = None
+        # Worker id -> (index used to pick its proxy, process)
+        self._workers: Dict[str, Tuple[int, subprocess.Popen]] = {}
+        # Restarts allowed per worker before it is given up on
+        self._restarts: Dict[str, int] = {}
+
+    @property
+    def max_workers(self) -> int:
+        return self.local_workers
+
+    def scrape_iter(self, tickers: Iterable[str]) -> Iterator[StockData]:
+        """Yield scraped data for each ticker as soon as its shard completes"""
+        tickers = list(tickers)
+        if not tickers:
+            return
+        self.run_id = self.queue.create_run(tickers, self.shard_size, self.fields)
+        self.logger.info(f"Distributed run {self.run_id}: {len(tickers)} tickers in "
+                         f"{self.queue.counts(self.run_id).get('queued', 0)} shards")
+        for i in range(self.local_workers):
+            self._start_worker(f"{socket.gethostname()}-w{i}", i)
+        try:
+            while True:
+                yield from self._merge()
+                if self.queue.finished(self.run_id):
+                    # Pick up shards finished since the last collect
+                    yield from self._merge()
+                    return
+                self._supervise()
+                time.sleep(self.poll_interval)
+        finally:
+            self._stop_workers()
+
+    def _merge(self) -> Iterator[StockData]:
+        """Yield the records of newly finished shards, acknowledging each shard once all its records are consumed"""
+        for shard_id, records in self.queue.collect(self.run_id):
+            yield from records
+            # The caller asked for the next record, so it has written the whole shard
+            self.queue.ack(shard_id)
+
+    def merge_metrics(self, metrics: Metrics) -> None:
+        """Add the metrics stored by every worker of the last run to `metrics`"""
+        if self.run_id is None:
+            return
+        for state in self.queue.run_stats(self.run_id):
+            metrics.merge_state(state)
+
+    def _start_worker(self, worker_id: str, index: int) -> None:
+        command = [sys.executable, str(PROJECT_ROOT / 'main.py'), '--worker', '--queue', str(self.queue.path),
+                   '--shard-run', self.run_id, '--worker-id', worker_id, *self.worker_args]
+        if self.proxies:
+            command += ['--proxy', self.proxies[index % len(self.proxies)]]
+        self._workers[worker_id] = (index, subprocess.Popen(command, cwd=PROJECT_ROOT))
+        self.logger.info(f"Started worker {worker_id}")
+
+    def _supervise(self) -> None:
+        """Requeue the shards of dead local workers and restart them while work remains"""
+        for worker_id, (index, process) in list(self._workers.items()):
+            if process.poll() is None:
+                continue
+            released = self.queue.release_worker(self.run_id, worker_id)
+            if process.returncode == 0 and not released:
+                continue
+            self.logger.warning(f"Worker {worker_id} exited with {process.returncode}, "
+                                f"{released} shards requeued")
+            restarts = self._restarts.get(worker_id, 0)
+            if restarts < self.queue.max_attempts:
+                self._restarts[worker_id] = restarts + 1
+                self._start_worker(worker_id, index)
+            else:
+                del self._workers[worker_id]
+        if self.local_workers and not self._workers:
+            # Nobody left to finish the run: fail the remaining shards instead of waiting forever
+            self.logger.error("All local workers failed, giving up on the remaining shards")
+            self.queue.abandon(self.run_id, 'no workers left')
+
+    def _stop_workers(self) -> None:
+        for _, process in self._workers.values():
+            if process.poll() is None:
+                process.terminate()
+        for _, process in self._workers.values():
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        self._workers.clear()
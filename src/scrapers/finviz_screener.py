@@ -0,0 +1,86 @@
+# src/scrapers/finviz_screener.py
+import threading
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Optional, Sequence
+from ..constants.config import FINVIZ_URL, FINVIZ_SCREENER_VIEW, FINVIZ_SCREENER_PAGE_SIZE
+from ..constants.selectors import FINVIZ_SCREENER_COLUMNS, FINVIZ_SCREENER_TICKER_COLUMN
+from ..parsers.extractor import ExtractionEngine
+from ..transports import Response
+from ..utils.logger import setup_logger
+from ..utils.metrics import Metrics
+from ..utils.retry import CircuitOpenError
+
+class FinvizScreener:
+    """Finviz fields of many tickers from a few screener result pages.
+
+    Rather than one quote page per ticker, tickers are looked up in groups of
+    `page_size` with one screener request each (`screener.ashx?t=A,B,...`),
+    in a custom view whose columns are those of the engine's Finviz fields.
+    Rows are kept by ticker until the ticker is scraped. Tickers the screener
+    does not list, or whose page failed, fall back to their quote page.
+    """
+
+    def __init__(self, engine: ExtractionEngine, fetch: Callable[[str], Optional[Response]],
+                 metrics: Optional[Metrics] = None, view: int = FINVIZ_SCREENER_VIEW,
+                 page_size: int = FINVIZ_SCREENER_PAGE_SIZE):
+        self.logger = setup_logger('finviz_screener')
+        self.engine = engine
+        self.fetch = fetch
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.view = view
+        self.page_size = max(int(page_size), 1)
+        self.columns = [FINVIZ_SCREENER_TICKER_COLUMN] + sorted(
+            FINVIZ_SCREENER_COLUMNS[field][0] for field in engine.finviz_fields if field in FINVIZ_SCREENER_COLUMNS
+        )
+        self._rows: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def url(self, tickers: Sequence[str]) -> str:
+        columns = ','.join(map(str, self.columns))
+        return f"{FINVIZ_URL}/screener.ashx?v={self.view}&c={columns}&t={','.join(tickers)}"
+
+    def prefetch(self, tickers: Iterable[str], needed: Optional[Callable[[str], bool]] = None) -> Iterator[str]:
+        """Yield `tickers` back, loading each group's screener page before the group is yielded.
+
+        Tickers for which `needed` returns False are passed through without a lookup.
+        """
+        group: List[str] = []
+        for ticker in tickers:
+            if needed is not None and not needed(ticker):
+                yield ticker
+                continue
+            group.append(ticker)
+            if len(group) >= self.page_size:
+                self.load(group)
+                yield from group
+                group = []
+        if group:
+            self.load(group)
+            yield from group
+
+    def load(self, tickers: Sequence[str]) -> int:
+        """Look up a group of tickers with one screener request, returning the number of rows found"""
+        url = self.url(tickers)
+        try:
+            response = self.fetch(url)
+        except CircuitOpenError:
+            response = None
+        if response is None:
+            self.logger.warning(f"Screener page {url} failed, using quote pages for {len(tickers)} tickers")
+            return 0
+        try:
+            rows = self.engine.extract_screener(response.content, response.encoding)
+        except Exception as e:
+            self.logger.error(f"Error parsing screener page {url}: {str(e)}")
+            return 0
+        # Finviz lists tickers in upper case
+        wanted = {ticker.upper(): ticker for ticker in tickers}
+        found = {wanted[symbol]: fields for symbol, fields in rows.items() if symbol in wanted}
+        with self._lock:
+            self._rows.update(found)
+        self.metrics.increment('finviz_screener_rows', len(found))
+        return len(found)
+
+    def take(self, ticker: str) -> Optional[Dict[str, Any]]:
+        """Remove and return a ticker's screener fields, None if it was not listed"""
+        with self._lock:
+            return self._rows.pop(ticker, None)
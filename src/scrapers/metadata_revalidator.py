@@ -0,0 +1,92 @@
+# src/scrapers/metadata_revalidator.py
+import queue
+import threading
+from typing import Dict, Any, Callable, List, Optional, Set
+from ..constants.config import FINVIZ_SCREENER_PAGE_SIZE
+from ..storage.metadata_index import MetadataIndex
+from ..utils.logger import setup_logger
+from ..utils.metrics import Metrics
+
+class MetadataRevalidator:
+    """Refresh stale metadata index entries from a background thread.
+
+    Stale tickers are served from the index right away and scheduled here.
+    The thread gathers up to `batch_size` of them, so one screener request
+    revalidates a whole group, and writes the fetched fields back to the
+    index. Requests go through the scraper, sharing its rate limits.
+    """
+
+    def __init__(self, index: MetadataIndex, fetch: Callable[[List[str]], Dict[str, Dict[str, Any]]],
+                 metrics: Optional[Metrics] = None, batch_size: int = FINVIZ_SCREENER_PAGE_SIZE,
+                 linger: float = 0.5):
+        self.logger = setup_logger('metadata_revalidator')
+        self.index = index
+        self.fetch = fetch
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.batch_size = max(int(batch_size), 1)
+        # Seconds to wait for more stale tickers before sending a partial group
+        self.linger = linger
+        self._queue: 'queue.Queue' = queue.Queue()
+        self._scheduled: Set[str] = set()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def schedule(self, ticker: str) -> None:
+        with self._lock:
+            if ticker in self._scheduled:
+                return
+            self._scheduled.add(ticker)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._work, name='metadata-revalidator', daemon=True)
+                self._thread.start()
+        self._queue.put(ticker)
+
+    def _work(self) -> None:
+        while True:
+            ticker = self._queue.get()
+            if ticker is None:
+                return
+            group = [ticker]
+            stop = False
+            while len(group) < self.batch_size:
+                try:
+                    ticker = self._queue.get(timeout=self.linger)
+                except queue.Empty:
+                    break
+                if ticker is None:
+                    stop = True
+                    break
+                group.append(ticker)
+            self._revalidate(group)
+            if stop:
+                return
+
+    def _revalidate(self, tickers: List[str]) -> None:
+        try:
+            results = self.fetch(tickers)
+        except Exception as e:
+            self.logger.error(f"Error revalidating metadata of {len(tickers)} tickers: {str(e)}")
+            results = {}
+        for ticker in tickers:
+            fields = results.get(ticker)
+            updated = fields is not None and self.index.update(ticker, fields)
+            self.metrics.increment('metadata_revalidations', outcome='updated' if updated else 'failed')
+            if updated:
+                # Failed tickers stay scheduled so they are not retried on every lookup
+                with self._lock:
+                    self._scheduled.discard(ticker)
+
+    def close(self) -> None:
+        """Stop after the group in progress; tickers still queued are revalidated on a later run"""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is None:
+            return
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        self._queue.put(None)
+        thread.join()
@@ -0,0 +1,48 @@
+# src/scrapers/request_planner.py
+from typing import Dict, Iterable, List, Optional, Set
+from ..constants.config import MORNINGSTAR_URL, FINVIZ_URL
+from ..constants.selectors import PAGE_URLS
+from ..parsers.extractor import ExtractionEngine, FINVIZ_PAGE
+
+class RequestPlanner:
+    """Choose the pages to fetch for a ticker from the fields the output needs.
+
+    A page is fetched only if it declares at least one requested field in
+    SELECTORS/FINVIZ_FIELDS, so pages without configured selectors, or whose
+    fields feed none of the selected columns, cost no request.
+    """
+
+    def __init__(self, engine: ExtractionEngine, fields: Optional[Iterable[str]] = None):
+        # None requests every configured field
+        self.fields = set(fields) if fields is not None else None
+        self.pages: List[str] = []
+        self.skipped: List[str] = []
+        # Requested fields provided by each planned page
+        self.page_fields: Dict[str, Set[str]] = {}
+        for page in engine.pages:
+            provided = set(engine.fields(page))
+            wanted = provided if self.fields is None else provided & self.fields
+            (self.pages if wanted else self.skipped).append(page)
+            if wanted:
+                self.page_fields[page] = wanted
+
+    @property
+    def requested_fields(self) -> Set[str]:
+        """Every field provided by the planned pages"""
+        return set().union(*self.page_fields.values())
+
+    def pages_for(self, fields: Iterable[str]) -> List[str]:
+        """Planned pages providing at least one of `fields`"""
+        fields = set(fields)
+        return [page for page in self.pages if self.page_fields[page] & fields]
+
+    def urls(self, ticker: str, fields: Optional[Iterable[str]] = None) -> Dict[str, str]:
+        """URL of every planned page for a ticker, or only of pages providing `fields`"""
+        pages = self.pages if fields is None else self.pages_for(fields)
+        return {page: self.url(page, ticker) for page in pages}
+
+    @staticmethod
+    def url(page: str, ticker: str) -> str:
+        if page == FINVIZ_PAGE:
+            return f"{FINVIZ_URL}/quote.ashx?t={ticker}"
+        return f"{MORNINGSTAR_URL}/stocks/{ticker}{PAGE_URLS[page]}"
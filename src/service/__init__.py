@@ -0,0 +1,8 @@
+from .jobs import Job, JobQueue
+from .server import ScrapeService
+
+__all__ = [
+    'Job',
+    'JobQueue',
+    'ScrapeService'
+]
@@ -0,0 +1,172 @@
+# src/service/jobs.py
+import itertools
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Optional, Set
+from ..constants.config import SERVICE_MAX_JOBS
+from ..models.stock_data import StockData
+from ..utils.logger import setup_logger
+
+class Job:
+    """A batch of tickers to scrape, with the fields wanted and a priority.
+
+    Results are appended as tickers finish; `iter_results` lets any number
+    of readers stream them while the job is still running.
+    """
+
+    def __init__(self, tickers: Iterable[str], fields: Optional[Iterable[str]] = None, priority: int = 0):
+        self.id = uuid.uuid4().hex[:12]
+        self.tickers = list(dict.fromkeys(tickers))
+        self.fields: Optional[Set[str]] = set(fields) if fields else None
+        self.priority = priority
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.results: List[StockData] = []
+        self._cond = threading.Condition()
+        # Tickers still to be handed out to workers; the job queue may route them through a prefetch
+        self.remaining: Iterator[str] = iter(self.tickers)
+        self._taken: Set[str] = set()
+        self._take_lock = threading.Lock()
+
+    @property
+    def done(self) -> bool:
+        return len(self.results) >= len(self.tickers)
+
+    def take(self) -> Optional[str]:
+        """Next ticker to scrape, None once every ticker was handed out"""
+        with self._take_lock:
+            try:
+                ticker = next(self.remaining, None)
+            except Exception:
+                # Hand out the rest without the prefetch
+                self.remaining = (ticker for ticker in self.tickers if ticker not in self._taken)
+                ticker = next(self.remaining, None)
+            if ticker is not None:
+                self._taken.add(ticker)
+            return ticker
+
+    def add_result(self, data: StockData) -> None:
+        with self._cond:
+            self.results.append(data)
+            if self.done:
+                self.finished_at = time.time()
+            self._cond.notify_all()
+
+    def iter_results(self, timeout: Optional[float] = None) -> Iterator[StockData]:
+        """Yield results in completion order, waiting for the ones still running"""
+        index = 0
+        while True:
+            with self._cond:
+                if index >= len(self.results) and not self.done:
+                    if not self._cond.wait(timeout):
+                        return
+                pending = self.results[index:]
+                finished = self.done
+            yield from pending
+            index += len(pending)
+            if finished and index >= len(self.tickers):
+                return
+
+    def status(self) -> Dict[str, Any]:
+        with self._cond:
+            failed = sum(1 for data in self.results if not data.ok)
+            return {
+                'job_id': self.id,
+                'status': 'done' if self.done else ('running' if self.results else 'queued'),
+                'priority': self.priority,
+                'fields': sorted(self.fields) if self.fields else None,
+                'tickers': len(self.tickers),
+                'completed': len(self.results),
+                'failed': failed,
+                'created_at': self.created_at,
+                'finished_at': self.finished_at,
+            }
+
+class JobQueue:
+    """Scrape queued jobs' tickers with a pool of worker threads.
+
+    Tickers of all jobs share one priority queue, so a higher priority job
+    overtakes the remaining tickers of lower priority ones. Jobs of equal
+    priority are served first come, first served. Only the latest
+    `max_jobs` jobs are kept for status and result queries.
+
+    With `prefetch`, a job's tickers are handed out through
+    `prefetch(tickers, fields)`, so the scraper can look up a group of them
+    in bulk just before they are scraped.
+    """
+
+    def __init__(self, scrape: Callable[[str, Optional[Set[str]]], StockData], workers: int,
+                 max_jobs: int = SERVICE_MAX_JOBS,
+                 prefetch: Optional[Callable[[List[str], Optional[Set[str]]], Iterator[str]]] = None):
+        self.logger = setup_logger('job_queue')
+        self.scrape = scrape
+        self.prefetch = prefetch
+        self.workers = max(int(workers), 1)
+        self.max_jobs = max_jobs
+        self._queue: 'queue.PriorityQueue' = queue.PriorityQueue()
+        self._order = itertools.count()
+        self._jobs: 'OrderedDict[str, Job]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> 'JobQueue':
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f'job-worker-{i}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def submit(self, job: Job) -> Job:
+        with self._lock:
+            self._jobs[job.id] = job
+            while len(self._jobs) > self.max_jobs:
+                oldest = next(iter(self._jobs.values()))
+                if not oldest.done:
+                    break
+                del self._jobs[oldest.id]
+        if self.prefetch is not None:
+            job.remaining = self.prefetch(job.tickers, job.fields)
+        # One entry per ticker; the worker taking an entry scrapes the job's next ticker
+        for _ in job.tickers:
+            self._queue.put((-job.priority, next(self._order), job))
+        self.logger.info(f"Queued job {job.id}: {len(job.tickers)} tickers, priority {job.priority}")
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> List[Job]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def _work(self) -> None:
+        while True:
+            _, _, job = self._queue.get()
+            if job is None:
+                return
+            ticker = job.take()
+            if ticker is None:
+                continue
+            try:
+                data = self.scrape(ticker, job.fields)
+            except Exception as e:
+                self.logger.error(f"Error scraping {ticker} for job {job.id}: {str(e)}")
+                data = StockData.failed(ticker, str(e))
+            job.add_result(data)
+
+    def stop(self) -> None:
+        """Stop the workers once they finish their current ticker"""
+        for _ in self._threads:
+            # Sentinels sort before every job
+            self._queue.put((float('-inf'), next(self._order), None))
+        for thread in self._threads:
+            thread.join()
+        self._threads.clear()
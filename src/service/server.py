@@ -0,0 +1,184 @@
+# src/service/server.py
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Iterator, List, Optional, Set
+from urllib.parse import urlparse, parse_qs
+from .jobs import Job, JobQueue
+from ..constants.config import SERVICE_HOST, SERVICE_PORT
+from ..models.stock_data import StockData, FIELDS
+from ..parsers.extractor import FINVIZ_PAGE
+from ..scrapers.combined_scraper import CombinedScraper
+from ..utils.logger import setup_logger
+
+class ScrapeService:
+    """Long-running scraper behind a small local HTTP/JSON API.
+
+    One CombinedScraper, with its connection pools, response cache and field
+    store, stays warm for the lifetime of the process.
+
+        POST /jobs                 {"tickers": [...], "fields": [...], "priority": 0}
+        GET  /jobs                 status of the retained jobs
+        GET  /jobs/<id>            status of one job
+        GET  /jobs/<id>/results    results as NDJSON, streamed as tickers finish
+        GET  /lookup/<ticker>      scrape one ticker now, ?fields=a,b to limit the pages
+        GET  /health               queue depth and worker count
+        GET  /metrics              run metrics in Prometheus text format
+
+    `fields` are scraped field names such as current_price or sector; with
+    the field store, lookups of fresh fields are answered without a request.
+    """
+
+    def __init__(self, scraper: CombinedScraper, workers: int, host: str = SERVICE_HOST,
+                 port: int = SERVICE_PORT):
+        self.logger = setup_logger('scrape_service')
+        self.scraper = scraper
+        self.queue = JobQueue(self._scrape, workers, prefetch=self._prefetch)
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _scrape(self, ticker: str, fields: Optional[Set[str]]) -> StockData:
+        return self.scraper.scrape_stock_data(ticker, fields)
+
+    def _prefetch(self, tickers: List[str], fields: Optional[Set[str]]) -> Iterator[str]:
+        """Route a job's tickers through the scraper's bulk screener lookup if it wants Finviz fields"""
+        finviz_fields = self.scraper.planner.page_fields.get(FINVIZ_PAGE, set())
+        if fields is not None and not fields & finviz_fields:
+            return iter(tickers)
+        return self.scraper.prefetch(tickers)
+
+    def start(self) -> 'ScrapeService':
+        """Serve in a background thread"""
+        self.queue.start()
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='scrape-service', daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Serve in the calling thread until interrupted"""
+        self.queue.start()
+        self.logger.info(f"Scrape service listening on {self.url}")
+        try:
+            self.httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self.httpd.shutdown()
+            self._thread = None
+        self.httpd.server_close()
+        self.queue.stop()
+
+    def __enter__(self) -> 'ScrapeService':
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    @staticmethod
+    def parse_fields(value: Any) -> Optional[List[str]]:
+        """Validate a list (or comma separated string) of scraped field names"""
+        if value in (None, '', []):
+            return None
+        fields = value.split(',') if isinstance(value, str) else list(value)
+        unknown = [field for field in fields if field not in FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown fields {unknown}, expected some of {list(FIELDS)}")
+        return fields
+
+    def create_job(self, payload: Dict[str, Any]) -> Job:
+        tickers = payload.get('tickers')
+        if not isinstance(tickers, list) or not tickers or not all(isinstance(t, str) and t for t in tickers):
+            raise ValueError("'tickers' must be a non-empty list of ticker strings")
+        priority = payload.get('priority', 0)
+        if not isinstance(priority, int):
+            raise ValueError("'priority' must be an integer")
+        return self.queue.submit(Job(tickers, self.parse_fields(payload.get('fields')), priority))
+
+    def _make_handler(self):
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, status: int, body: Any) -> None:
+                data = json.dumps(body, default=str).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _send_text(self, status: int, text: str) -> None:
+                data = text.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _stream(self, job: Job) -> None:
+                # Without a Content-Length the body ends when the connection closes
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/x-ndjson')
+                self.end_headers()
+                for data in job.iter_results():
+                    self.wfile.write(json.dumps(data.to_dict(), default=str).encode('utf-8') + b'\n')
+                    self.wfile.flush()
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                parts = [part for part in parsed.path.split('/') if part]
+                query = parse_qs(parsed.query)
+                try:
+                    if parts == ['health']:
+                        self._send_json(200, {'status': 'ok', 'workers': service.queue.workers,
+                                              'pending': service.queue.pending})
+                    elif parts == ['metrics']:
+                        self._send_text(200, service.scraper.metrics.to_prometheus())
+                    elif parts == ['jobs']:
+                        self._send_json(200, [job.status() for job in service.queue.jobs()])
+                    elif len(parts) in (2, 3) and parts[0] == 'jobs':
+                        job = service.queue.get(parts[1])
+                        if job is None:
+                            self._send_json(404, {'error': f"Unknown job {parts[1]}"})
+                        elif len(parts) == 2:
+                            self._send_json(200, job.status())
+                        elif parts[2] == 'results':
+                            self._stream(job)
+                        else:
+                            self._send_json(404, {'error': 'Not found'})
+                    elif len(parts) == 2 and parts[0] == 'lookup':
+                        fields = service.parse_fields(query.get('fields', [''])[0])
+                        self._send_json(200, service._scrape(parts[1], fields).to_dict())
+                    else:
+                        self._send_json(404, {'error': 'Not found'})
+                except ValueError as e:
+                    self._send_json(400, {'error': str(e)})
+
+            def do_POST(self):
+                if urlparse(self.path).path.rstrip('/') != '/jobs':
+                    self._send_json(404, {'error': 'Not found'})
+                    return
+                try:
+                    length = int(self.headers.get('Content-Length') or 0)
+                    payload = json.loads(self.rfile.read(length) or b'{}')
+                    if not isinstance(payload, dict):
+                        raise ValueError('Expected a JSON object')
+                    job = service.create_job(payload)
+                except ValueError as e:
+                    self._send_json(400, {'error': str(e)})
+                    return
+                self._send_json(202, job.status())
+
+        return Handler
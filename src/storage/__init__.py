@@ -0,0 +1,22 @@
+from .response_cache import ResponseCache, CacheEntry, page_type_for_url
+from .run_journal import RunJournal, is_success
+from .field_store import FieldStore
+from .fingerprint_store import FingerprintStore
+from .metadata_index import MetadataIndex, METADATA_FIELDS
+from .history_store import HistoryStore
+from .shard_queue import ShardQueue, Shard
+
+__all__ = [
+    'ResponseCache',
+    'CacheEntry',
+    'page_type_for_url',
+    'RunJournal',
+    'is_success',
+    'FieldStore',
+    'FingerprintStore',
+    'MetadataIndex',
+    'METADATA_FIELDS',
+    'HistoryStore',
+    'ShardQueue',
+    'Shard'
+]
@@ -0,0 +1,91 @@
+# src/storage/field_store.py
+import json
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Any, Iterable, Optional, Set, Union
+from ..constants.config import FIELD_STORE_PATH, FIELD_MAX_AGES, FIELD_DEFAULT_MAX_AGE
+from ..utils.logger import setup_logger
+
+class FieldStore:
+    """Latest value of every scraped field, per ticker, stored in SQLite.
+
+    Each field keeps the time it was last checked. A field is stale once it
+    is older than its maximum age in `max_ages`, so a refresh run only has
+    to scrape the pages providing stale fields and can fill in the rest of
+    the record from the store. Fields a page was checked for but did not
+    contain are stored as NULL so they are not refetched on every run.
+    """
+
+    def __init__(self, path: Union[str, Path] = FIELD_STORE_PATH,
+                 max_ages: Optional[Dict[str, float]] = None):
+        self.logger = setup_logger('field_store')
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_ages = dict(FIELD_MAX_AGES if max_ages is None else max_ages)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS fields (
+                ticker TEXT NOT NULL,
+                field TEXT NOT NULL,
+                value TEXT,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (ticker, field)
+            )
+        """)
+        self._conn.commit()
+
+    def max_age(self, field: str) -> float:
+        return self.max_ages.get(field, FIELD_DEFAULT_MAX_AGE)
+
+    def _rows(self, ticker: str) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                field: (value, updated_at)
+                for field, value, updated_at in self._conn.execute(
+                    'SELECT field, value, updated_at FROM fields WHERE ticker = ?', (ticker,)
+                )
+            }
+
+    def load(self, ticker: str) -> Dict[str, Any]:
+        """Stored values of a ticker, fresh or stale"""
+        return {
+            field: json.loads(value)
+            for field, (value, _) in self._rows(ticker).items() if value is not None
+        }
+
+    def stale_fields(self, ticker: str, fields: Iterable[str], now: Optional[float] = None) -> Set[str]:
+        """Fields of a ticker that were never stored or are older than their max age"""
+        now = time.time() if now is None else now
+        rows = self._rows(ticker)
+        return {
+            field for field in fields
+            if field not in rows or now - rows[field][1] >= self.max_age(field)
+        }
+
+    def update(self, ticker: str, data: Dict[str, Any], checked: Iterable[str] = ()) -> None:
+        """Store freshly scraped fields; `checked` fields missing from `data` are stored as NULL"""
+        now = time.time()
+        values = {field: None for field in checked}
+        values.update({field: json.dumps(value) for field, value in data.items()})
+        if not values:
+            return
+        with self._lock:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO fields VALUES (?, ?, ?, ?)',
+                [(ticker, field, value, now) for field, value in values.items()]
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute('DELETE FROM fields')
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,71 @@
+# src/storage/fingerprint_store.py
+import json
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple, Union
+from ..constants.config import FINGERPRINT_STORE_PATH
+from ..utils.logger import setup_logger
+
+class FingerprintStore:
+    """Fingerprint and extracted fields of the last download of every page, stored in SQLite.
+
+    Pages are keyed by URL. When a new download of a page has the same
+    fingerprint as the stored one, its stored fields are used instead of
+    parsing the page again. The parse CPU seconds of the original parse are
+    kept with the fields, so a run can report the CPU time it saved.
+    Entries do not expire: a page whose fingerprint changes is parsed and
+    its entry replaced.
+    """
+
+    def __init__(self, path: Union[str, Path] = FINGERPRINT_STORE_PATH):
+        self.logger = setup_logger('fingerprint_store')
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS fingerprints (
+                url TEXT PRIMARY KEY,
+                digest TEXT NOT NULL,
+                fields TEXT NOT NULL,
+                parse_cpu REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def lookup(self, url: str, digest: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        """Stored (fields, parse CPU seconds) of a page, None unless its fingerprint is `digest`"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT fields, parse_cpu FROM fingerprints WHERE url = ? AND digest = ?', (url, digest)
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def store(self, url: str, digest: str, fields: Dict[str, Any], parse_cpu: float) -> None:
+        """Record the fields parsed from a page with the given fingerprint"""
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO fingerprints VALUES (?, ?, ?, ?, ?)',
+                (url, digest, json.dumps(fields), parse_cpu, time.time())
+            )
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM fingerprints').fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute('DELETE FROM fingerprints')
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,308 @@
+# src/storage/history_store.py
+import os
+import uuid
+import threading
+from contextlib import ExitStack, contextmanager
+from datetime import date, datetime, timedelta
+from operator import attrgetter
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Union
+from ..constants.config import HISTORY_DIR, HISTORY_ROW_GROUP_SIZE, HISTORY_MAX_FILES, DATE_FORMAT
+from ..models.stock_data import StockData, TEXT, NUMERIC
+from ..utils.logger import setup_logger
+
+# pyarrow and pandas are imported when the store is opened or queried
+if TYPE_CHECKING:
+    import pandas as pd
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+_TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+@contextmanager
+def _file_lock(path: Path, shared: bool = False, blocking: bool = True) -> Iterator[bool]:
+    """Hold an OS lock on `path`, yielding False if `blocking` is off and another process holds it.
+
+    Lock files are never deleted. The operating system releases the lock of
+    a process that crashes, so there is no stale lock to take over. Without
+    fcntl (Windows) every lock is exclusive.
+    """
+    fd = os.open(str(path), os.O_RDWR | os.O_CREAT)
+    locked = False
+    try:
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, (fcntl.LOCK_SH if shared else fcntl.LOCK_EX) | (0 if blocking else fcntl.LOCK_NB))
+            else:
+                msvcrt.locking(fd, msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+            locked = True
+        except OSError:
+            if blocking:
+                raise
+        yield locked
+    finally:
+        if locked and fcntl is None:
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        os.close(fd)
+
+class HistoryStore:
+    """Append-only history of scraped snapshots in Parquet, partitioned by month.
+
+    Each writer appends new files under `month=YYYY-MM/` and never rewrites
+    rows. Snapshots are buffered and written in row groups sorted by ticker,
+    so the Parquet statistics let a ticker lookup skip the rest of a file.
+    Once a month holds more than `max_files` files they are compacted into
+    one. A 90 day range scan then opens only a handful of files instead of
+    reparsing every past output file. Compaction takes a per-month lock, so
+    overlapping runs never compact the same month twice. It swaps the merged
+    file in under the month's read lock, which readers share while they list
+    and read its files, so a query never sees both the merged file and its
+    parts, nor loses a part being deleted.
+
+    Columns: ticker, date, timestamp, the text fields and the numeric
+    fields of StockData. Missing values are stored as nulls.
+    """
+
+    def __init__(self, root: Union[str, Path] = HISTORY_DIR, row_group_size: int = HISTORY_ROW_GROUP_SIZE,
+                 max_files: int = HISTORY_MAX_FILES):
+        try:
+            import pyarrow
+            import pyarrow.compute
+            import pyarrow.dataset
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("The snapshot history requires pyarrow: pip install pyarrow")
+        self._pa = pyarrow
+        self._pc = pyarrow.compute
+        self._ds = pyarrow.dataset
+        self._pq = pyarrow.parquet
+        self.logger = setup_logger('history_store')
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.row_group_size = max(int(row_group_size), 1)
+        self.max_files = max(int(max_files), 1)
+        self.schema = pyarrow.schema(
+            [('ticker', pyarrow.string()), ('date', pyarrow.date32()), ('timestamp', pyarrow.timestamp('s'))]
+            + [(field, pyarrow.string()) for field in TEXT]
+            + [(field, pyarrow.float64()) for field in NUMERIC]
+        )
+        self.rows_written = 0
+        self._buffer: List[StockData] = []
+        # Month -> (temporary path, writer) of the files this store is appending to
+        self._writers: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    # Writing
+
+    def write(self, data: StockData) -> None:
+        """Queue a snapshot; failed scrapes are not recorded"""
+        if not data.ok:
+            return
+        with self._lock:
+            self._buffer.append(data)
+            if len(self._buffer) >= self.row_group_size:
+                self._flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._buffer:
+            return
+        chunk, self._buffer = self._buffer, []
+        table = self._to_table(chunk).sort_by([('ticker', 'ascending'), ('timestamp', 'ascending')])
+        months = self._pc.strftime(table['date'], format='%Y-%m').to_pylist()
+        for month in sorted(set(months)):
+            mask = self._pa.array([m == month for m in months])
+            self._writer(month).write_table(table.filter(mask), row_group_size=self.row_group_size)
+        self.rows_written += len(chunk)
+
+    def _to_table(self, records: List[StockData]):
+        import numpy as np
+        timestamps = [self._parse_timestamp(record.timestamp) for record in records]
+        columns = {
+            'ticker': self._pa.array([record.ticker for record in records], self._pa.string()),
+            'date': self._pa.array([timestamp.date() for timestamp in timestamps], self._pa.date32()),
+            'timestamp': self._pa.array(timestamps, self._pa.timestamp('s')),
+        }
+        for field in TEXT:
+            columns[field] = self._pa.array(list(map(attrgetter(field), records)), self._pa.string())
+        for field in NUMERIC:
+            values = np.fromiter(map(attrgetter(field), records), dtype='float64', count=len(records))
+            # NaN marks a missing number and is stored as null
+            columns[field] = self._pa.array(values, self._pa.float64(), from_pandas=True)
+        return self._pa.table(columns, schema=self.schema)
+
+    @staticmethod
+    def _parse_timestamp(value: str) -> datetime:
+        try:
+            return datetime.strptime(value, _TIMESTAMP_FORMAT)
+        except (TypeError, ValueError):
+            return datetime.now().replace(microsecond=0)
+
+    def _writer(self, month: str):
+        if month not in self._writers:
+            directory = self.root / f'month={month}'
+            directory.mkdir(parents=True, exist_ok=True)
+            # Written under a temporary name and renamed on close, so readers never see a partial file
+            path = directory / f'part-{datetime.now().strftime(DATE_FORMAT)}-{uuid.uuid4().hex[:6]}.parquet.tmp'
+            self._writers[month] = (path, self._pq.ParquetWriter(str(path), self.schema))
+        return self._writers[month][1]
+
+    def close(self) -> None:
+        """Flush, publish the new files and compact the months that were written to"""
+        with self._lock:
+            self._flush()
+            writers, self._writers = self._writers, {}
+            for path, writer in writers.values():
+                writer.close()
+                os.replace(path, path.with_suffix(''))
+        for month in writers:
+            self.compact(month)
+        if self.rows_written:
+            self.logger.info(f"Recorded {self.rows_written} snapshots in {self.root}")
+
+    def __enter__(self) -> 'HistoryStore':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    # Reading
+
+    def months(self) -> List[str]:
+        return sorted(path.name.split('=', 1)[1] for path in self.root.glob('month=*') if path.is_dir())
+
+    def _files(self, months: Iterable[str]) -> List[str]:
+        return [str(path) for month in months for path in sorted((self.root / f'month={month}').glob('*.parquet'))]
+
+    def _months_between(self, start: Optional[date], end: Optional[date]) -> List[str]:
+        low = start.strftime('%Y-%m') if start else None
+        high = end.strftime('%Y-%m') if end else None
+        return [month for month in self.months() if (low is None or month >= low) and (high is None or month <= high)]
+
+    def _filter(self, tickers: Optional[Iterable[str]], start: Optional[date], end: Optional[date]):
+        field = self._ds.field
+        conditions = []
+        if tickers is not None:
+            tickers = list(tickers)
+            conditions.append(field('ticker') == tickers[0] if len(tickers) == 1 else field('ticker').isin(tickers))
+        if start is not None:
+            conditions.append(field('date') >= start)
+        if end is not None:
+            conditions.append(field('date') <= end)
+        expression = None
+        for condition in conditions:
+            expression = condition if expression is None else expression & condition
+        return expression
+
+    def _read_lock(self, month: str, shared: bool = True):
+        """Lock held by readers of a month's files, and exclusively while compaction replaces them"""
+        return _file_lock(self.root / f'month={month}' / '.read.lock', shared=shared)
+
+    def _scan(self, months: Iterable[str], filter=None, columns: Optional[List[str]] = None):
+        months = sorted(months)
+        with ExitStack() as locks:
+            for month in months:
+                locks.enter_context(self._read_lock(month))
+            files = self._files(months)
+            if not files:
+                return self.schema.empty_table() if columns is None else self.schema.empty_table().select(columns)
+            dataset = self._ds.dataset(files, schema=self.schema, format='parquet')
+            return dataset.to_table(filter=filter, columns=columns)
+
+    @staticmethod
+    def _columns(fields: Optional[Iterable[str]]) -> Optional[List[str]]:
+        if fields is None:
+            return None
+        return ['ticker', 'date', 'timestamp'] + [field for field in fields if field not in ('ticker', 'date', 'timestamp')]
+
+    def query(self, tickers: Optional[Iterable[str]] = None, start: Optional[date] = None,
+              end: Optional[date] = None, fields: Optional[Iterable[str]] = None) -> 'pd.DataFrame':
+        """Snapshots of `tickers` (all if None) dated from `start` to `end`, inclusive, sorted by ticker and time"""
+        table = self._scan(self._months_between(start, end), self._filter(tickers, start, end), self._columns(fields))
+        return table.sort_by([('ticker', 'ascending'), ('timestamp', 'ascending')]).to_pandas()
+
+    def history(self, ticker: str, days: int = 90, fields: Optional[Iterable[str]] = None) -> 'pd.DataFrame':
+        """Snapshots of one ticker over the last `days` days"""
+        return self.query([ticker], start=date.today() - timedelta(days=days), fields=fields)
+
+    def latest(self, tickers: Optional[Iterable[str]] = None, as_of: Optional[date] = None,
+               start: Optional[date] = None, fields: Optional[Iterable[str]] = None) -> 'pd.DataFrame':
+        """Most recent snapshot of each ticker, dated on or before `as_of` and not before `start`.
+
+        Months are scanned newest first; with `tickers`, the scan stops as
+        soon as every ticker has been found.
+        """
+        remaining = set(tickers) if tickers is not None else None
+        found: set = set()
+        tables = []
+        for month in reversed(self._months_between(start, as_of)):
+            condition = self._filter(remaining, start, as_of)
+            if found and remaining is None:
+                excluded = ~self._ds.field('ticker').isin(list(found))
+                condition = excluded if condition is None else condition & excluded
+            table = self._scan([month], condition, self._columns(fields))
+            if table.num_rows:
+                tables.append(table)
+                month_tickers = set(table['ticker'].to_pylist())
+                if remaining is None:
+                    found |= month_tickers
+                else:
+                    remaining -= month_tickers
+                    if not remaining:
+                        break
+        if not tables:
+            return self._scan([], columns=self._columns(fields)).to_pandas()
+        frame = self._pa.concat_tables(tables).to_pandas()
+        frame = frame.sort_values(['ticker', 'timestamp']).drop_duplicates('ticker', keep='last')
+        return frame.reset_index(drop=True)
+
+    # Maintenance
+
+    def compact(self, month: str) -> bool:
+        """Merge a month's files into one sorted file once it holds more than `max_files`.
+
+        Returns False without compacting if the month is small enough or
+        another run is compacting it.
+        """
+        if len(self._files([month])) <= self.max_files:
+            return False
+        with _file_lock(self.root / f'month={month}' / '.compact.lock', blocking=False) as locked:
+            if not locked:
+                self.logger.info(f"Another run is compacting {month}, skipping")
+                return False
+            # Listed under the lock: files published later by other runs are left for the next compaction.
+            # Only compaction deletes files, so they can be read without the read lock
+            files = self._files([month])
+            if len(files) <= self.max_files:
+                return False
+            table = self._ds.dataset(files, schema=self.schema, format='parquet').to_table()
+            table = table.sort_by([('ticker', 'ascending'), ('timestamp', 'ascending')])
+            name = f'part-{datetime.now().strftime(DATE_FORMAT)}-{uuid.uuid4().hex[:6]}-compacted.parquet'
+            path = self.root / f'month={month}' / name
+            temporary = path.with_name(path.name + '.tmp')
+            self._pq.write_table(table, str(temporary), row_group_size=self.row_group_size)
+            # Readers see either the parts or the merged file, never both
+            with self._read_lock(month, shared=False):
+                os.replace(temporary, path)
+                for file in files:
+                    Path(file).unlink(missing_ok=True)
+            self.logger.info(f"Compacted {len(files)} files of {month} into {path.name}")
+            return True
+
+    @staticmethod
+    def to_records(frame: 'pd.DataFrame') -> List[StockData]:
+        """Turn queried rows back into StockData records, e.g. to format them with CSVFormatter"""
+        records = []
+        for row in frame.to_dict('records'):
+            timestamp = row.pop('timestamp')
+            row.pop('date', None)
+            records.append(StockData(row.pop('ticker'), timestamp.strftime(_TIMESTAMP_FORMAT)).update(row))
+        return records
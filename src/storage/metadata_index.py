@@ -0,0 +1,116 @@
+# src/storage/metadata_index.py
+import time
+import sqlite3
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional, Tuple, Union
+from ..constants.config import METADATA_INDEX_PATH, METADATA_MAX_AGE
+from ..utils.logger import setup_logger
+
+# Ticker metadata kept by the index
+METADATA_FIELDS = ('sector', 'industry')
+
+class MetadataIndex:
+    """Sector and industry of every ticker seen, persisted in SQLite.
+
+    The whole index is loaded into memory when it is opened, so lookups
+    never touch the disk. Entries are used whatever their age; an entry
+    older than `max_age` is only due for revalidation, which the scraper
+    does in the background. Updates are written through to the file, so
+    concurrent processes see each other's entries the next time they open
+    the index.
+    """
+
+    def __init__(self, path: Union[str, Path] = METADATA_INDEX_PATH, max_age: float = METADATA_MAX_AGE):
+        self.logger = setup_logger('metadata_index')
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS metadata (
+                ticker TEXT PRIMARY KEY,
+                sector TEXT,
+                industry TEXT,
+                checked_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_metadata_sector ON metadata(sector, industry)')
+        self._conn.commit()
+        # Ticker -> (sector, industry, checked_at)
+        self._entries: Dict[str, Tuple[Optional[str], Optional[str], float]] = {
+            ticker: (sector, industry, checked_at)
+            for ticker, sector, industry, checked_at in self._conn.execute(
+                'SELECT ticker, sector, industry, checked_at FROM metadata'
+            )
+        }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def __contains__(self, ticker: str) -> bool:
+        with self._lock:
+            return ticker in self._entries
+
+    def lookup(self, ticker: str) -> Optional[Dict[str, str]]:
+        """Stored metadata of a ticker, None if it was never indexed"""
+        with self._lock:
+            entry = self._entries.get(ticker)
+        if entry is None:
+            return None
+        return {field: value for field, value in zip(METADATA_FIELDS, entry) if value is not None}
+
+    def is_stale(self, ticker: str, now: Optional[float] = None) -> bool:
+        """True if a ticker is missing or its entry is older than `max_age`"""
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._entries.get(ticker)
+        return entry is None or now - entry[2] >= self.max_age
+
+    def update(self, ticker: str, data: Dict[str, Any]) -> bool:
+        """Store a ticker's metadata from scraped fields; False if they hold none"""
+        values = tuple(data.get(field) or None for field in METADATA_FIELDS)
+        if not any(values):
+            return False
+        entry = (*values, time.time())
+        with self._lock:
+            self._entries[ticker] = entry
+            self._conn.execute('INSERT OR REPLACE INTO metadata VALUES (?, ?, ?, ?)', (ticker, *entry))
+            self._conn.commit()
+        return True
+
+    def stale_tickers(self, now: Optional[float] = None) -> List[str]:
+        """Indexed tickers whose entries are due for revalidation"""
+        now = time.time() if now is None else now
+        with self._lock:
+            return [ticker for ticker, entry in self._entries.items() if now - entry[2] >= self.max_age]
+
+    def breakdown(self, tickers: Optional[Iterable[str]] = None) -> Dict[Tuple[str, str], int]:
+        """Number of tickers per (sector, industry), over `tickers` or the whole index.
+
+        Tickers missing from the index are counted under ('Unknown', 'Unknown').
+        """
+        with self._lock:
+            entries = dict(self._entries)
+        if tickers is None:
+            tickers = entries
+        counts: Counter = Counter()
+        for ticker in tickers:
+            sector, industry, _ = entries.get(ticker, (None, None, 0.0))
+            counts[(sector or 'Unknown', industry or 'Unknown')] += 1
+        return dict(counts)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._conn.execute('DELETE FROM metadata')
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
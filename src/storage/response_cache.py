@@ -0,0 +1,211 @@
+# src/storage/response_cache.py
+import json
+import time
+import zlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional, Union
+from urllib.parse import urlparse
+from ..transports.base import Response
+from ..constants.config import (
+    CACHE_PATH, CACHE_MAX_BYTES, CACHE_COMPRESSION_LEVEL, CACHE_TTLS, CACHE_DEFAULT_TTL, CACHE_ACCESS_BATCH,
+    FINVIZ_URL
+)
+from ..constants.selectors import PAGE_URLS
+from ..utils.logger import setup_logger
+
+def page_type_for_url(url: str) -> str:
+    """Classify a URL into one of the page types used for cache TTLs"""
+    parsed = urlparse(url)
+    if parsed.netloc == urlparse(FINVIZ_URL).netloc:
+        return 'finviz'
+    path = parsed.path.rstrip('/')
+    for page_type, suffix in PAGE_URLS.items():
+        if path.endswith(suffix):
+            return page_type
+    return 'default'
+
+class CacheEntry:
+    """A cached response together with its freshness information"""
+
+    def __init__(self, url: str, status_code: int, content: bytes, headers: Dict[str, str],
+                 stored_at: float, ttl: float):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+        self.stored_at = stored_at
+        self.ttl = ttl
+
+    @property
+    def is_fresh(self) -> bool:
+        return time.time() - self.stored_at < self.ttl
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers for revalidating this entry"""
+        headers = {}
+        if 'etag' in self.headers:
+            headers['If-None-Match'] = self.headers['etag']
+        if 'last-modified' in self.headers:
+            headers['If-Modified-Since'] = self.headers['last-modified']
+        return headers
+
+    def to_response(self) -> Response:
+        return Response(self.url, self.status_code, self.content, self.headers)
+
+class ResponseCache:
+    """Persistent HTTP response cache stored in SQLite.
+
+    Bodies are zlib-compressed. Entries expire after a TTL that depends on
+    the page type, stale entries carrying an ETag or Last-Modified header are
+    revalidated with a conditional request, and the least recently used
+    entries are evicted once the stored size exceeds `max_bytes`.
+
+    Lookups only read. Access times are buffered in memory and written
+    `access_batch` at a time, before any eviction and on close, so cache
+    hits from parallel workers do not each take SQLite's write lock.
+    """
+
+    def __init__(self, path: Union[str, Path] = CACHE_PATH, max_bytes: int = CACHE_MAX_BYTES,
+                 ttls: Optional[Dict[str, float]] = None, access_batch: int = CACHE_ACCESS_BATCH):
+        self.logger = setup_logger('response_cache')
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttls = dict(CACHE_TTLS if ttls is None else ttls)
+        self.access_batch = max(int(access_batch), 1)
+        # URL -> last access time not yet written to the database
+        self._accessed: Dict[str, float] = {}
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'revalidated': 0,
+            'stored': 0,
+            'evicted': 0,
+            'bytes_saved': 0,
+        }
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                page_type TEXT NOT NULL,
+                status_code INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_responses_access ON responses(last_access)')
+        self._conn.commit()
+        self._total_bytes = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+    def ttl_for(self, url: str) -> float:
+        return self.ttls.get(page_type_for_url(url), CACHE_DEFAULT_TTL)
+
+    def lookup(self, url: str) -> Optional[CacheEntry]:
+        """Return the cached entry for `url`, fresh or stale"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT status_code, headers, body, stored_at FROM responses WHERE url = ?', (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._accessed[url] = time.time()
+            if len(self._accessed) >= self.access_batch:
+                self._flush_access()
+                self._conn.commit()
+        status_code, headers, body, stored_at = row
+        return CacheEntry(url, status_code, zlib.decompress(body), json.loads(headers),
+                          stored_at, self.ttl_for(url))
+
+    def store(self, response: Response, url: Optional[str] = None) -> None:
+        """Store a successful response, evicting old entries if over the size cap"""
+        url = url or response.url
+        body = zlib.compress(response.content, CACHE_COMPRESSION_LEVEL)
+        now = time.time()
+        with self._lock:
+            self._accessed.pop(url, None)
+            old = self._conn.execute('SELECT size FROM responses WHERE url = ?', (url,)).fetchone()
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (url, page_type_for_url(url), response.status_code, json.dumps(response.headers),
+                 body, len(body), now, now)
+            )
+            self._total_bytes += len(body) - (old[0] if old else 0)
+            self.stats['stored'] += 1
+            self._evict()
+            self._conn.commit()
+
+    def touch(self, url: str) -> None:
+        """Mark an entry as freshly validated after a 304 response"""
+        with self._lock:
+            self._accessed.pop(url, None)
+            self._conn.execute('UPDATE responses SET stored_at = ?, last_access = ? WHERE url = ?',
+                               (time.time(), time.time(), url))
+            self._conn.commit()
+
+    def record(self, event: str, nbytes: int = 0) -> None:
+        """Count a cache hit, miss or revalidation"""
+        with self._lock:
+            self.stats[event] += 1
+            self.stats['bytes_saved'] += nbytes
+
+    def _flush_access(self) -> None:
+        # Caller holds the lock and commits
+        if self._accessed:
+            self._conn.executemany('UPDATE responses SET last_access = ? WHERE url = ?',
+                                   [(accessed, url) for url, accessed in self._accessed.items()])
+            self._accessed.clear()
+
+    def _evict(self) -> None:
+        # Caller holds the lock
+        if self._total_bytes > self.max_bytes:
+            # Evict by up to date access times
+            self._flush_access()
+        while self._total_bytes > self.max_bytes:
+            rows = self._conn.execute(
+                'SELECT url, size FROM responses ORDER BY last_access LIMIT 64'
+            ).fetchall()
+            if not rows:
+                self._total_bytes = 0
+                break
+            for url, size in rows:
+                self._conn.execute('DELETE FROM responses WHERE url = ?', (url,))
+                self._total_bytes -= size
+                self.stats['evicted'] += 1
+                if self._total_bytes <= self.max_bytes:
+                    break
+
+    def clear(self) -> None:
+        with self._lock:
+            self._accessed.clear()
+            self._conn.execute('DELETE FROM responses')
+            self._conn.commit()
+            self._total_bytes = 0
+
+    @property
+    def size(self) -> int:
+        """Compressed bytes currently stored"""
+        return self._total_bytes
+
+    def summary(self) -> Dict[str, Any]:
+        lookups = self.stats['hits'] + self.stats['revalidated'] + self.stats['misses']
+        served = self.stats['hits'] + self.stats['revalidated']
+        return {
+            **self.stats,
+            'hit_rate': served / lookups if lookups else 0.0,
+            'size_bytes': self._total_bytes,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_access()
+            self._conn.commit()
+            self._conn.close()
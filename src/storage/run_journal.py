@@ -0,0 +1,136 @@
+# src/storage/run_journal.py
+import json
+import uuid
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional, Set, Union
+from ..constants.config import JOURNAL_PATH, DATE_FORMAT
+from ..models.stock_data import StockData
+from ..utils.logger import setup_logger
+
+def is_success(data: StockData) -> bool:
+    """A record counts as done when it has no error and at least one scraped field"""
+    return data.ok
+
+class RunJournal:
+    """Durable record of scraping runs stored in SQLite.
+
+    Every completed ticker is committed together with its scraped data as
+    soon as it finishes, so an interrupted run can be resumed: finished
+    tickers are replayed from the journal and only the rest are scraped.
+    """
+
+    def __init__(self, path: Union[str, Path] = JOURNAL_PATH):
+        self.logger = setup_logger('run_journal')
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id TEXT PRIMARY KEY,
+                input_path TEXT,
+                output_path TEXT,
+                status TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS results (
+                run_id TEXT NOT NULL,
+                ticker TEXT NOT NULL,
+                status TEXT NOT NULL,
+                data TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 1,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY (run_id, ticker)
+            );
+        """)
+        self._conn.commit()
+
+    @staticmethod
+    def _now() -> str:
+        return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    def start_run(self, input_path: Optional[str] = None, output_path: Optional[str] = None,
+                  run_id: Optional[str] = None) -> str:
+        """Register a new run and return its id"""
+        run_id = run_id or f"{datetime.now().strftime(DATE_FORMAT)}_{uuid.uuid4().hex[:6]}"
+        with self._lock:
+            self._conn.execute(
+                'INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?)',
+                (run_id, str(input_path) if input_path else None,
+                 str(output_path) if output_path else None, 'running', self._now(), self._now())
+            )
+            self._conn.commit()
+        return run_id
+
+    def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn.execute(
+            'SELECT run_id, input_path, output_path, status, created_at, updated_at FROM runs WHERE run_id = ?',
+            (run_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        keys = ('run_id', 'input_path', 'output_path', 'status', 'created_at', 'updated_at')
+        return dict(zip(keys, row))
+
+    def list_runs(self) -> List[Dict[str, Any]]:
+        runs = []
+        for (run_id,) in self._conn.execute('SELECT run_id FROM runs ORDER BY created_at DESC').fetchall():
+            run = self.get_run(run_id)
+            run['counts'] = self.counts(run_id)
+            runs.append(run)
+        return runs
+
+    def record(self, run_id: str, data: StockData) -> None:
+        """Commit the outcome of one ticker"""
+        status = 'ok' if is_success(data) else 'failed'
+        with self._lock:
+            self._conn.execute(
+                """INSERT INTO results (run_id, ticker, status, data, updated_at) VALUES (?, ?, ?, ?, ?)
+                   ON CONFLICT(run_id, ticker) DO UPDATE SET
+                       status = excluded.status, data = excluded.data,
+                       attempts = attempts + 1, updated_at = excluded.updated_at""",
+                (run_id, data.ticker, status, json.dumps(data.to_dict(), default=str), self._now())
+            )
+            self._conn.commit()
+
+    def finish_run(self, run_id: str, status: str = 'finished') -> None:
+        with self._lock:
+            self._conn.execute('UPDATE runs SET status = ?, updated_at = ? WHERE run_id = ?',
+                               (status, self._now(), run_id))
+            self._conn.commit()
+
+    def completed_tickers(self, run_id: str) -> Set[str]:
+        rows = self._conn.execute(
+            "SELECT ticker FROM results WHERE run_id = ? AND status = 'ok'", (run_id,)
+        )
+        return {ticker for (ticker,) in rows}
+
+    def failed_tickers(self, run_id: str) -> List[str]:
+        rows = self._conn.execute(
+            "SELECT ticker FROM results WHERE run_id = ? AND status = 'failed'", (run_id,)
+        )
+        return [ticker for (ticker,) in rows]
+
+    def iter_results(self, run_id: str, status: str = 'ok') -> Iterator[StockData]:
+        """Yield stored records of a run without loading them all at once"""
+        cursor = self._conn.cursor()
+        cursor.execute('SELECT data FROM results WHERE run_id = ? AND status = ? ORDER BY rowid',
+                       (run_id, status))
+        for (data,) in cursor:
+            yield StockData.from_dict(json.loads(data))
+
+    def counts(self, run_id: str) -> Dict[str, int]:
+        rows = self._conn.execute(
+            'SELECT status, COUNT(*) FROM results WHERE run_id = ? GROUP BY status', (run_id,)
+        ).fetchall()
+        return dict(rows)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,244 @@
+# src/storage/shard_queue.py
+import json
+import time
+import uuid
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional, Sequence, Tuple, Union
+from ..constants.config import SHARD_QUEUE_PATH, SHARD_LEASE_SECONDS, SHARD_MAX_ATTEMPTS, DATE_FORMAT
+from ..models.stock_data import StockData
+from ..utils.logger import setup_logger
+
+class Shard:
+    """A slice of a distributed run's tickers leased to one worker"""
+
+    def __init__(self, shard_id: int, run_id: str, tickers: List[str], attempts: int):
+        self.shard_id = shard_id
+        self.run_id = run_id
+        self.tickers = tickers
+        self.attempts = attempts
+
+    def __repr__(self) -> str:
+        return f"Shard({self.shard_id}, {len(self.tickers)} tickers, attempt {self.attempts})"
+
+class ShardQueue:
+    """Work queue of ticker shards shared by a coordinator and its workers.
+
+    The queue lives in a SQLite file, so workers can be separate processes
+    on one machine or nodes sharing the file. A worker leases a shard for
+    `lease_seconds` and keeps extending the lease while it works. Shards
+    whose lease expires, e.g. because the worker died, are handed to the
+    next worker that asks, up to `max_attempts` times before the shard is
+    marked failed. Results are stored per shard until the coordinator
+    has written them and acknowledges the shard. With each completed shard a worker also stores its
+    cumulative metrics, so the coordinator can report on the whole run.
+
+    Shard status: queued -> leased -> done -> merged, or failed -> merged.
+    """
+
+    def __init__(self, path: Union[str, Path] = SHARD_QUEUE_PATH, lease_seconds: float = SHARD_LEASE_SECONDS,
+                 max_attempts: int = SHARD_MAX_ATTEMPTS):
+        self.logger = setup_logger('shard_queue')
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        # Autocommit; write transactions are opened with BEGIN IMMEDIATE
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None,
+                                     timeout=30)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS shard_runs (
+                run_id TEXT PRIMARY KEY,
+                fields TEXT,
+                created_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS shards (
+                shard_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                run_id TEXT NOT NULL,
+                tickers TEXT NOT NULL,
+                status TEXT NOT NULL,
+                worker TEXT,
+                lease_expires REAL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                results TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_shards_run_status ON shards(run_id, status);
+            CREATE TABLE IF NOT EXISTS worker_stats (
+                run_id TEXT NOT NULL,
+                worker TEXT NOT NULL,
+                stats TEXT NOT NULL,
+                PRIMARY KEY (run_id, worker)
+            );
+        """)
+
+    def _execute(self, sql: str, params: Sequence[Any] = ()) -> sqlite3.Cursor:
+        with self._lock:
+            return self._conn.execute(sql, params)
+
+    def create_run(self, tickers: Sequence[str], shard_size: int,
+                   fields: Optional[Sequence[str]] = None, run_id: Optional[str] = None) -> str:
+        """Split tickers into shards of `shard_size` and queue them"""
+        run_id = run_id or f"{datetime.now().strftime(DATE_FORMAT)}_{uuid.uuid4().hex[:6]}"
+        shard_size = max(int(shard_size), 1)
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            self._conn.execute('INSERT INTO shard_runs VALUES (?, ?, ?)',
+                               (run_id, json.dumps(sorted(fields)) if fields is not None else None, time.time()))
+            self._conn.executemany(
+                "INSERT INTO shards (run_id, tickers, status) VALUES (?, ?, 'queued')",
+                [(run_id, json.dumps(list(tickers[i:i + shard_size])))
+                 for i in range(0, len(tickers), shard_size)]
+            )
+            self._conn.execute('COMMIT')
+        return run_id
+
+    def run_fields(self, run_id: str) -> Optional[List[str]]:
+        """Fields requested for a run, None for all fields"""
+        row = self._execute('SELECT fields FROM shard_runs WHERE run_id = ?', (run_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"Unknown shard run {run_id}")
+        return json.loads(row[0]) if row[0] is not None else None
+
+    def lease(self, worker: str, run_id: str) -> Optional[Shard]:
+        """Lease the next queued or expired shard of a run, None if there is none"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                # Expired leases that used up their attempts fail instead of being retried
+                self._conn.execute(
+                    """UPDATE shards SET status = 'failed', worker = NULL,
+                           error = COALESCE(error, 'lease expired')
+                       WHERE run_id = ? AND status = 'leased' AND lease_expires < ? AND attempts >= ?""",
+                    (run_id, now, self.max_attempts)
+                )
+                row = self._conn.execute(
+                    """SELECT shard_id, tickers, attempts FROM shards
+                       WHERE run_id = ? AND (status = 'queued' OR (status = 'leased' AND lease_expires < ?))
+                       ORDER BY shard_id LIMIT 1""",
+                    (run_id, now)
+                ).fetchone()
+                if row is None:
+                    self._conn.execute('COMMIT')
+                    return None
+                shard_id, tickers, attempts = row
+                self._conn.execute(
+                    """UPDATE shards SET status = 'leased', worker = ?, lease_expires = ?, attempts = attempts + 1
+                       WHERE shard_id = ?""",
+                    (worker, now + self.lease_seconds, shard_id)
+                )
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+        if attempts:
+            self.logger.warning(f"Reassigning shard {shard_id} to {worker} (attempt {attempts + 1})")
+        return Shard(shard_id, run_id, json.loads(tickers), attempts + 1)
+
+    def heartbeat(self, shard: Shard, worker: str) -> bool:
+        """Extend a lease; False if the shard was reassigned to another worker"""
+        cursor = self._execute(
+            "UPDATE shards SET lease_expires = ? WHERE shard_id = ? AND worker = ? AND status = 'leased'",
+            (time.time() + self.lease_seconds, shard.shard_id, worker)
+        )
+        return cursor.rowcount == 1
+
+    def complete(self, shard: Shard, worker: str, results: List[StockData],
+                 stats: Optional[Dict[str, Any]] = None, stats_key: Optional[str] = None) -> bool:
+        """Store a shard's results, and the worker's metrics so far under `stats_key` (default: `worker`).
+
+        Returns False if the lease was lost and the results were dropped.
+        """
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                cursor = self._conn.execute(
+                    """UPDATE shards SET status = 'done', lease_expires = NULL, results = ?
+                       WHERE shard_id = ? AND worker = ? AND status = 'leased'""",
+                    (json.dumps([data.to_dict() for data in results], default=str), shard.shard_id, worker)
+                )
+                if stats is not None:
+                    # In the same transaction, so the stats are in place once the run is seen finished
+                    self._conn.execute('INSERT OR REPLACE INTO worker_stats VALUES (?, ?, ?)',
+                                       (shard.run_id, stats_key or worker, json.dumps(stats)))
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+        return cursor.rowcount == 1
+
+    def run_stats(self, run_id: str) -> List[Dict[str, Any]]:
+        """Latest metrics stored by each worker process of a run"""
+        rows = self._execute('SELECT stats FROM worker_stats WHERE run_id = ?', (run_id,)).fetchall()
+        return [json.loads(stats) for stats, in rows]
+
+    def fail(self, shard: Shard, worker: str, error: str) -> None:
+        """Give a shard back after an error, requeueing it while attempts remain"""
+        status = 'queued' if shard.attempts < self.max_attempts else 'failed'
+        self._execute(
+            """UPDATE shards SET status = ?, worker = NULL, lease_expires = NULL, error = ?
+               WHERE shard_id = ? AND worker = ? AND status = 'leased'""",
+            (status, error, shard.shard_id, worker)
+        )
+
+    def release_worker(self, run_id: str, worker: str) -> int:
+        """Requeue the shards leased by a worker known to be dead, without waiting for the lease"""
+        cursor = self._execute(
+            "UPDATE shards SET lease_expires = 0 WHERE run_id = ? AND worker = ? AND status = 'leased'",
+            (run_id, worker)
+        )
+        return cursor.rowcount
+
+    def abandon(self, run_id: str, error: str) -> None:
+        """Fail every shard of a run that is still queued or leased"""
+        self._execute(
+            """UPDATE shards SET status = 'failed', worker = NULL, lease_expires = NULL, error = ?
+               WHERE run_id = ? AND status IN ('queued', 'leased')""",
+            (error, run_id)
+        )
+
+    def collect(self, run_id: str) -> Iterator[Tuple[int, List[StockData]]]:
+        """Yield (shard id, records) of finished shards not acknowledged yet, failed shards as failed records.
+
+        Shards are left untouched until `ack`, so results survive a
+        coordinator that dies before writing them and are collected again.
+        """
+        rows = self._execute(
+            "SELECT shard_id, status, tickers, results, error FROM shards "
+            "WHERE run_id = ? AND status IN ('done', 'failed') ORDER BY shard_id",
+            (run_id,)
+        ).fetchall()
+        for shard_id, status, tickers, results, error in rows:
+            if status == 'done':
+                yield shard_id, [StockData.from_dict(data) for data in json.loads(results)]
+            else:
+                self.logger.error(f"Shard {shard_id} failed: {error}")
+                yield shard_id, [StockData.failed(ticker, f"shard failed: {error}") for ticker in json.loads(tickers)]
+
+    def ack(self, shard_id: int) -> None:
+        """Mark a collected shard merged once its records are written, dropping the stored results"""
+        self._execute(
+            "UPDATE shards SET status = 'merged', results = NULL WHERE shard_id = ? AND status IN ('done', 'failed')",
+            (shard_id,)
+        )
+
+    def counts(self, run_id: str) -> Dict[str, int]:
+        rows = self._execute(
+            'SELECT status, COUNT(*) FROM shards WHERE run_id = ? GROUP BY status', (run_id,)
+        ).fetchall()
+        return dict(rows)
+
+    def finished(self, run_id: str) -> bool:
+        """True once no shard of the run is queued or leased"""
+        counts = self.counts(run_id)
+        return not counts.get('queued') and not counts.get('leased')
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,25 @@
+from .base import BaseTransport, Response
+from .sync_transport import SyncTransport
+from .async_transport import AsyncTransport
+
+TRANSPORTS = {
+    'sync': SyncTransport,
+    'async': AsyncTransport,
+}
+
+def get_transport(name: str = 'sync', **kwargs) -> BaseTransport:
+    """Create a transport backend by name"""
+    try:
+        transport_cls = TRANSPORTS[name]
+    except KeyError:
+        raise ValueError(f"Unknown transport '{name}', expected one of {sorted(TRANSPORTS)}")
+    return transport_cls(**kwargs)
+
+__all__ = [
+    'BaseTransport',
+    'Response',
+    'SyncTransport',
+    'AsyncTransport',
+    'TRANSPORTS',
+    'get_transport'
+]
@@ -0,0 +1,76 @@
+# src/transports/async_transport.py
+import threading
+from typing import Dict, Optional
+from .base import BaseTransport, Response
+from ..constants.config import HEADERS, REQUEST_TIMEOUT, POOL_CONNECTIONS_PER_HOST, POOL_MAX_CONNECTIONS
+
+class AsyncTransport(BaseTransport):
+    """Non-blocking transport backed by aiohttp.
+
+    The event loop runs in a background thread. AsyncBatchScraper runs each
+    ticker as a coroutine on `loop` that awaits `fetch`, so hundreds of
+    requests can be in flight over a bounded set of pooled connections
+    without a thread each. Synchronous callers, such as the screener
+    prefetch and the service's worker threads, use `get`, which blocks the
+    calling thread until the response arrives; it must not be called from
+    the loop itself.
+    """
+
+    def __init__(self, pool_size: int = POOL_CONNECTIONS_PER_HOST,
+                 max_connections: int = POOL_MAX_CONNECTIONS, timeout: float = REQUEST_TIMEOUT,
+                 proxy: Optional[str] = None):
+        try:
+            import aiohttp
+        except ImportError:
+            raise ImportError("The async transport requires aiohttp: pip install aiohttp")
+        # asyncio is imported here too, so the CLI starts without loading it
+        import asyncio
+        self._asyncio = asyncio
+        self._aiohttp = aiohttp
+        self.pool_size = pool_size
+        self.max_connections = max_connections
+        self.timeout = timeout
+        # Proxy giving this transport its own egress address
+        self.proxy = proxy or None
+        self._session = None
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever,
+                                        name='async-transport', daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._open(), self._loop).result()
+
+    @property
+    def loop(self):
+        """Event loop running `fetch`"""
+        return self._loop
+
+    async def _open(self) -> None:
+        connector = self._aiohttp.TCPConnector(
+            limit=self.max_connections,
+            limit_per_host=self.pool_size,
+            ttl_dns_cache=300
+        )
+        self._session = self._aiohttp.ClientSession(
+            connector=connector,
+            headers=HEADERS,
+            timeout=self._aiohttp.ClientTimeout(total=self.timeout)
+        )
+
+    async def fetch(self, url: str, headers: Optional[Dict[str, str]] = None) -> Response:
+        """Fetch `url` on the transport's event loop"""
+        async with self._session.get(url, headers=headers, proxy=self.proxy) as response:
+            content = await response.read()
+            return Response(str(response.url), response.status, content, dict(response.headers))
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> Response:
+        future = self._asyncio.run_coroutine_threadsafe(self.fetch(url, headers), self._loop)
+        return future.result()
+
+    def close(self) -> None:
+        if self._loop.is_closed():
+            return
+        if self._session is not None:
+            self._asyncio.run_coroutine_threadsafe(self._session.close(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
@@ -0,0 +1,54 @@
+# src/transports/base.py
+import re
+from typing import Dict, Optional
+
+_CHARSET_RE = re.compile(r'charset=([\w-]+)', re.I)
+
+class Response:
+    """Backend-independent HTTP response"""
+
+    def __init__(self, url: str, status_code: int, content: bytes,
+                 headers: Optional[Dict[str, str]] = None):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        # Header names are stored lower-cased
+        self.headers = {k.lower(): v for k, v in (headers or {}).items()}
+        self._text = None
+
+    @property
+    def encoding(self) -> str:
+        match = _CHARSET_RE.search(self.headers.get('content-type', ''))
+        return match.group(1) if match else 'utf-8'
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            try:
+                self._text = self.content.decode(self.encoding, errors='replace')
+            except LookupError:
+                self._text = self.content.decode('utf-8', errors='replace')
+        return self._text
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status_code < 300
+
+    def __repr__(self) -> str:
+        return f"<Response [{self.status_code}] {self.url}>"
+
+class BaseTransport:
+    """Interface shared by the HTTP backends used by BaseScraper"""
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> Response:
+        """Fetch `url` and return the full response"""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release pooled connections"""
+
+    def __enter__(self) -> 'BaseTransport':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
@@ -0,0 +1,32 @@
+# src/transports/sync_transport.py
+from typing import Dict, Optional
+from .base import BaseTransport, Response
+from ..constants.config import HEADERS, REQUEST_TIMEOUT, POOL_CONNECTIONS_PER_HOST, POOL_MAX_CONNECTIONS
+
+class SyncTransport(BaseTransport):
+    """Blocking transport backed by a pooled keep-alive requests.Session"""
+
+    def __init__(self, pool_size: int = POOL_CONNECTIONS_PER_HOST,
+                 max_hosts: int = POOL_MAX_CONNECTIONS, timeout: float = REQUEST_TIMEOUT,
+                 proxy: Optional[str] = None):
+        # Imported here so the CLI starts without loading requests
+        import requests
+        from requests.adapters import HTTPAdapter
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update(HEADERS)
+        # Route all requests through a proxy, giving this transport its own egress address
+        if proxy:
+            self.session.proxies = {'http': proxy, 'https': proxy}
+        # pool_connections is the number of hosts kept, pool_maxsize the
+        # connections kept per host; block so the pool is never exceeded
+        adapter = HTTPAdapter(pool_connections=max_hosts, pool_maxsize=pool_size, pool_block=True)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> Response:
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        return Response(response.url, response.status_code, response.content, dict(response.headers))
+
+    def close(self) -> None:
+        self.session.close()
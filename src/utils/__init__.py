@@ -1,11 +1,15 @@
 from .logger import setup_logger
-from .helpers import ensure_dir_exists, load_tickers, clean_numeric, format_output_path, setup_project_structure
+from .ticker_source import TickerSource
+from .helpers import ensure_dir_exists, iter_column, read_tickers, load_tickers, clean_numeric, format_output_path, setup_project_structure
 
 __all__ = [
     'setup_logger',
     'ensure_dir_exists',
+    'iter_column',
+    'read_tickers',
     'load_tickers',
     'clean_numeric',
     'format_output_path',
-    'setup_project_structure'
+    'setup_project_structure',
+    'TickerSource'
 ]
\ No newline at end of file
@@ -1,20 +1,37 @@
+import csv
 import os
-import pandas as pd
 from pathlib import Path
-from typing import List, Any, Union
+from typing import Iterator, List, Any, Union
 from datetime import datetime
-from ..constants.config import INPUT_DIR, OUTPUT_DIR, LOGS_DIR, DATE_FORMAT
+from ..constants.config import INPUT_DIR, OUTPUT_DIR, LOGS_DIR, DATE_FORMAT, CSV_ENCODING
 
 def ensure_dir_exists(path: Union[str, Path]) -> None:
     """Create directory if it doesn't exist"""
     Path(path).mkdir(parents=True, exist_ok=True)
 
+def iter_column(filepath: Union[str, Path], column: str = 'Ticker', encoding: str = CSV_ENCODING) -> Iterator[str]:
+    """Yield the non-empty values of one CSV column in file order, one row at a time"""
+    with open(filepath, newline='', encoding=encoding) as f:
+        reader = csv.reader(f)
+        header = [name.strip() for name in next(reader, [])]
+        if column not in header:
+            raise KeyError(f"Column {column} not found in CSV, available columns: {header}")
+        index = header.index(column)
+        for row in reader:
+            if len(row) > index:
+                value = row[index].strip()
+                if value:
+                    yield value
+
+def read_tickers(filepath: Union[str, Path], column: str = 'Ticker', encoding: str = CSV_ENCODING) -> List[str]:
+    """Read the unique, non-empty values of a CSV column in file order, without pandas"""
+    return list(dict.fromkeys(iter_column(filepath, column, encoding)))
+
 def load_tickers(filepath: Union[str, Path]) -> List[str]:
     """Load tickers from CSV file"""
     try:
         ensure_dir_exists(INPUT_DIR)
-        df = pd.read_csv(filepath)
-        return df['Ticker'].tolist()
+        return read_tickers(filepath)
     except Exception as e:
         raise Exception(f"Error loading tickers: {str(e)}")
 
@@ -30,10 +47,10 @@ def clean_numeric(value: Any) -> float:
     except (ValueError, AttributeError):
         return 0.0
 
-def get_timestamp_filename(base_name: str = 'result') -> str:
+def get_timestamp_filename(base_name: str = 'result', extension: str = '.csv') -> str:
     """Generate filename with timestamp"""
     timestamp = datetime.now().strftime(DATE_FORMAT)
-    return f"{base_name}_{timestamp}.csv"
+    return f"{base_name}_{timestamp}{extension}"
 
 def format_output_path(filename: str = None) -> Path:
     """Format output file path with timestamp"""
@@ -1,39 +1,55 @@
 import logging
+import threading
 from datetime import datetime
 from pathlib import Path
+from typing import List
 from ..constants.config import LOGS_DIR, LOG_FORMAT, LOG_LEVEL
 
+# Handlers shared by every logger of the process, created on first use
+_handlers: List[logging.Handler] = []
+_handlers_lock = threading.Lock()
+
+def _shared_handlers() -> List[logging.Handler]:
+    """Create the process-wide file and console handlers once"""
+    with _handlers_lock:
+        if _handlers:
+            return _handlers
+
+        # Create logs directory if it doesn't exist
+        Path(LOGS_DIR).mkdir(parents=True, exist_ok=True)
+
+        # Create formatters and handlers
+        formatter = logging.Formatter(LOG_FORMAT)
+
+        # File handler; the file is only created once something is logged
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        file_handler = logging.FileHandler(
+            filename=Path(LOGS_DIR) / f'scraper_{timestamp}.log',
+            encoding='utf-8',
+            delay=True
+        )
+        file_handler.setFormatter(formatter)
+
+        # Console handler
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+
+        _handlers.extend([file_handler, console_handler])
+        return _handlers
+
 def setup_logger(name: str = 'morningstar_scraper') -> logging.Logger:
     """Configure and return a logger instance"""
-    
+
     # Create logger
     logger = logging.getLogger(name)
     logger.setLevel(getattr(logging, LOG_LEVEL))
-    
+
     # Prevent duplicate handlers
     if logger.handlers:
         return logger
-    
-    # Create logs directory if it doesn't exist
-    Path(LOGS_DIR).mkdir(parents=True, exist_ok=True)
-    
-    # Create formatters and handlers
-    formatter = logging.Formatter(LOG_FORMAT)
-    
-    # File handler
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    file_handler = logging.FileHandler(
-        filename=Path(LOGS_DIR) / f'scraper_{timestamp}.log',
-        encoding='utf-8'
-    )
-    file_handler.setFormatter(formatter)
-    
-    # Console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(formatter)
-    
+
     # Add handlers to logger
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
-    
-    return logger
\ No newline at end of file
+    for handler in _shared_handlers():
+        logger.addHandler(handler)
+
+    return logger
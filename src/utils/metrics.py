@@ -0,0 +1,230 @@
+import bisect
+import contextvars
+import time
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+# Upper bounds in seconds of the timing histogram buckets
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an unsorted list"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+def escape_label(value: str) -> str:
+    """Escape a label value for the Prometheus text format"""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+class Histogram:
+    """Fixed-bucket histogram; memory does not grow with the number of samples"""
+
+    __slots__ = ('buckets', 'counts', 'count', 'sum', 'max')
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: 'Histogram') -> None:
+        for i, count in enumerate(other.counts):
+            self.counts[i] += count
+        self.count += other.count
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by interpolating inside its bucket"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if seen + count >= rank and count:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                return min(lower + (upper - lower) * (rank - seen) / count, self.max)
+            seen += count
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'total': self.sum,
+            'mean': self.sum / self.count if self.count else 0.0,
+            'p50': self.quantile(0.50),
+            'p99': self.quantile(0.99),
+            'max': self.max,
+        }
+
+class Metrics:
+    """Thread-safe labelled counters and timing histograms for a run.
+
+    Timings are also attributed to the ticker being scraped by the current
+    thread or asyncio task (see `ticker`), so the slowest tickers can be
+    broken down by stage.
+    """
+
+    def __init__(self, track_tickers: bool = True):
+        self.track_tickers = track_tickers
+        self._lock = threading.Lock()
+        self._ticker: contextvars.ContextVar = contextvars.ContextVar('metrics_ticker', default=None)
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._tickers: Dict[str, Dict[str, float]] = {}
+
+    @staticmethod
+    def _key(labels: Dict[str, Any]) -> LabelKey:
+        return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+    def increment(self, name: str, value: float = 1, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, **labels: Any) -> None:
+        key = self._key(labels)
+        ticker = self._ticker.get()
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            histogram.observe(seconds)
+            if ticker is not None:
+                stage = labels.get('stage', name)
+                stages = self._tickers.setdefault(ticker, {})
+                stages[stage] = stages.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def timer(self, name: str, cpu: bool = False, **labels: Any) -> Iterator[None]:
+        """Time a block in wall-clock seconds, or in this thread's CPU seconds"""
+        clock = time.thread_time if cpu else time.perf_counter
+        start = clock()
+        try:
+            yield
+        finally:
+            self.observe(name, clock() - start, **labels)
+
+    @contextmanager
+    def ticker(self, ticker: str) -> Iterator[None]:
+        """Attribute timings recorded by this thread or asyncio task to `ticker`"""
+        if not self.track_tickers:
+            yield
+            return
+        token = self._ticker.set(ticker)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._ticker.reset(token)
+            with self._lock:
+                stages = self._tickers.setdefault(ticker, {})
+                stages['total'] = stages.get('total', 0.0) + time.perf_counter() - start
+
+    def counter(self, name: str, **labels: Any) -> float:
+        """Value of a counter, summed over all series matching `labels`"""
+        wanted = set(self._key(labels))
+        with self._lock:
+            return sum(value for key, value in self._counters.get(name, {}).items()
+                       if wanted.issubset(key))
+
+    def histogram(self, name: str, **labels: Any) -> Histogram:
+        """Histogram merged over all series matching `labels`"""
+        wanted = set(self._key(labels))
+        merged = Histogram()
+        with self._lock:
+            for key, histogram in self._histograms.get(name, {}).items():
+                if wanted.issubset(key):
+                    merged.merge(histogram)
+        return merged
+
+    def to_state(self) -> Dict[str, Any]:
+        """Raw counters and histogram buckets as JSON-serialisable data, e.g. to send to another process"""
+        with self._lock:
+            return {
+                'counters': [[name, dict(key), value]
+                             for name, series in self._counters.items() for key, value in series.items()],
+                'histograms': [[name, dict(key), histogram.counts, histogram.count, histogram.sum, histogram.max]
+                               for name, series in self._histograms.items() for key, histogram in series.items()],
+            }
+
+    def merge_state(self, state: Dict[str, Any]) -> None:
+        """Add the counters and histograms of another process's `to_state`"""
+        for name, labels, value in state.get('counters', []):
+            self.increment(name, value, **labels)
+        with self._lock:
+            for name, labels, counts, count, total, maximum in state.get('histograms', []):
+                other = Histogram()
+                other.counts, other.count, other.sum, other.max = list(counts), count, total, maximum
+                series = self._histograms.setdefault(name, {})
+                series.setdefault(self._key(labels), Histogram()).merge(other)
+
+    def summary(self, slowest: int = 10) -> Dict[str, Any]:
+        """JSON-serialisable snapshot of every metric"""
+        with self._lock:
+            counters = {
+                name: [{'labels': dict(key), 'value': value} for key, value in series.items()]
+                for name, series in self._counters.items()
+            }
+            histograms = {
+                name: [{'labels': dict(key), **histogram.summary()} for key, histogram in series.items()]
+                for name, series in self._histograms.items()
+            }
+            stages = sorted({dict(key).get('stage') for key in self._histograms.get('stage_seconds', {})} - {None})
+            tickers = sorted(self._tickers.items(), key=lambda item: item[1].get('total', 0.0), reverse=True)
+        return {
+            'counters': counters,
+            'histograms': histograms,
+            'totals': {name: self.histogram(name).summary() for name in histograms},
+            'stages': {stage: self.histogram('stage_seconds', stage=stage).summary() for stage in stages},
+            'slowest_tickers': [{'ticker': ticker, **stages} for ticker, stages in tickers[:slowest]],
+        }
+
+    def to_prometheus(self, prefix: str = 'scraper') -> str:
+        """Render metrics in the Prometheus text exposition format"""
+        def labels_text(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+            pairs = list(key) + ([extra] if extra else [])
+            if not pairs:
+                return ''
+            escaped = (f'{name}="{escape_label(value)}"' for name, value in pairs)
+            return '{' + ','.join(escaped) + '}'
+
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                metric = f'{prefix}_{name}_total'
+                lines.append(f'# TYPE {metric} counter')
+                for key, value in series.items():
+                    lines.append(f'{metric}{labels_text(key)} {value}')
+            for name, series in sorted(self._histograms.items()):
+                metric = f'{prefix}_{name}'
+                lines.append(f'# TYPE {metric} histogram')
+                for key, histogram in series.items():
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(f'{metric}_bucket{labels_text(key, ("le", repr(bound)))} {cumulative}')
+                    lines.append(f'{metric}_bucket{labels_text(key, ("le", "+Inf"))} {histogram.count}')
+                    lines.append(f'{metric}_sum{labels_text(key)} {histogram.sum}')
+                    lines.append(f'{metric}_count{labels_text(key)} {histogram.count}')
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,229 @@
+import time
+import threading
+from collections import deque
+from typing import Dict, Any, Callable, Deque, Optional
+from urllib.parse import urlparse
+from .retry import CircuitBreaker
+from ..constants.config import (
+    HOST_LIMITS, DEFAULT_HOST_LIMIT, ADAPTIVE_RATE, RATE_DECREASE_FACTOR, RATE_DECREASE_COOLDOWN, RATE_INCREASE_STEP,
+    MIN_RATE
+)
+
+class RateLimiter:
+    """Thread-safe request scheduler allowing `rate` requests per second"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = float(rate)
+        self.burst = max(int(burst), 1)
+        self._lock = threading.Lock()
+        self._next_time = 0.0
+
+    @property
+    def interval(self) -> float:
+        return 1.0 / self.rate if self.rate > 0 else 0.0
+
+    def _reserve(self) -> float:
+        """Take the next request slot, return seconds until it starts"""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            interval = self.interval
+            start = max(self._next_time, now)
+            wait = start - now - (self.burst - 1) * interval
+            self._next_time = start + interval
+        return max(wait, 0.0)
+
+    def acquire(self) -> float:
+        """Block until a request slot is available, return seconds waited"""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        """Wait for a request slot without blocking the event loop, return seconds waited"""
+        wait = self._reserve()
+        if wait > 0:
+            import asyncio
+            await asyncio.sleep(wait)
+        return wait
+
+    def set_rate(self, rate: float) -> None:
+        with self._lock:
+            self.rate = float(rate)
+
+    def defer(self, seconds: float) -> None:
+        """Hold back every request for `seconds`, e.g. after a Retry-After"""
+        with self._lock:
+            self._next_time = max(self._next_time, time.monotonic() + seconds)
+
+class ConcurrencySlots:
+    """Semaphore shared by threads and asyncio tasks.
+
+    Threads block in `acquire`; coroutines await `acquire_async` without
+    holding a thread. A released slot is handed to the longest waiting caller
+    of either kind, so both count against the same limit.
+    """
+
+    def __init__(self, slots: int):
+        self.slots = max(int(slots), 1)
+        self._free = self.slots
+        self._lock = threading.Lock()
+        # Callbacks handing a released slot to each waiting caller, oldest first
+        self._waiters: Deque[Callable[[], None]] = deque()
+
+    def acquire(self) -> None:
+        with self._lock:
+            if self._free and not self._waiters:
+                self._free -= 1
+                return
+            handed = threading.Event()
+            self._waiters.append(handed.set)
+        handed.wait()
+
+    async def acquire_async(self) -> None:
+        import asyncio
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._free and not self._waiters:
+                self._free -= 1
+                return
+            handed = loop.create_future()
+            self._waiters.append(lambda: loop.call_soon_threadsafe(self._hand_over, handed))
+        await handed
+
+    def _hand_over(self, handed) -> None:
+        # A task cancelled while waiting passes its slot on
+        if handed.cancelled():
+            self.release()
+        else:
+            handed.set_result(None)
+
+    def release(self) -> None:
+        with self._lock:
+            if not self._waiters:
+                if self._free >= self.slots:
+                    raise ValueError('ConcurrencySlots released too many times')
+                self._free += 1
+                return
+            hand_over = self._waiters.popleft()
+        hand_over()
+
+class HostLimiter:
+    """Combined rate, concurrency and circuit-breaker limits for a single host.
+
+    With `adaptive` enabled the request rate follows additive-increase /
+    multiplicative-decrease: it is cut on every throttled or failed response
+    and creeps back up towards `rate` while requests succeed.
+    """
+
+    def __init__(self, rate: float, burst: int = 1, concurrency: int = 1, adaptive: bool = ADAPTIVE_RATE,
+                 breaker: Optional[CircuitBreaker] = None):
+        self.max_rate = float(rate)
+        self.adaptive = adaptive
+        self.rate_limiter = RateLimiter(rate, burst)
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self.concurrency = max(int(concurrency), 1)
+        self._slots = ConcurrencySlots(self.concurrency)
+        self._adapt_lock = threading.Lock()
+        self._last_decrease = float('-inf')
+
+    @property
+    def rate(self) -> float:
+        return self.rate_limiter.rate
+
+    def acquire(self) -> None:
+        """Wait for the circuit to allow a request, then for a concurrency slot and the next rate slot.
+
+        Raises CircuitOpenError if the host's circuit stays open longer than its wait timeout.
+        """
+        self.breaker.acquire()
+        self._slots.acquire()
+        try:
+            self.rate_limiter.acquire()
+        except BaseException:
+            self._slots.release()
+            raise
+
+    async def acquire_async(self) -> None:
+        """`acquire` for coroutines: waits for the circuit and slots without blocking the event loop"""
+        await self.breaker.acquire_async()
+        await self._slots.acquire_async()
+        try:
+            await self.rate_limiter.acquire_async()
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def record_success(self) -> None:
+        self.breaker.record_success()
+        if self.adaptive and self.max_rate > 0 and self.rate < self.max_rate:
+            self.rate_limiter.set_rate(min(self.max_rate, self.rate + RATE_INCREASE_STEP))
+
+    def record_failure(self, throttled: bool = False, retry_after: Optional[float] = None) -> bool:
+        """Slow down after a throttled or failed request, return True if the circuit opened.
+
+        Throttling (429) means the host is up but wants fewer requests, so it
+        only lowers the rate; errors and 5xx responses also count towards
+        opening the circuit.
+        """
+        if self.adaptive and self.max_rate > 0:
+            now = time.monotonic()
+            with self._adapt_lock:
+                # Requests already in flight fail together; count them as one signal
+                if now - self._last_decrease >= RATE_DECREASE_COOLDOWN:
+                    self._last_decrease = now
+                    self.rate_limiter.set_rate(
+                        max(min(MIN_RATE, self.max_rate), self.rate * RATE_DECREASE_FACTOR)
+                    )
+        if retry_after:
+            self.rate_limiter.defer(retry_after)
+        if throttled:
+            # The host answered, so it is up
+            self.breaker.record_success()
+            return False
+        return self.breaker.record_failure()
+
+    def release(self) -> None:
+        self._slots.release()
+
+    def __enter__(self) -> 'HostLimiter':
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.release()
+
+class HostLimits:
+    """Registry of per-host limiters, created lazily from configuration"""
+
+    def __init__(self, limits: Optional[Dict[str, Dict[str, Any]]] = None,
+                 default: Optional[Dict[str, Any]] = None):
+        self.limits = dict(HOST_LIMITS if limits is None else limits)
+        self.default = dict(DEFAULT_HOST_LIMIT if default is None else default)
+        self._limiters: Dict[str, HostLimiter] = {}
+        self._lock = threading.Lock()
+
+    def for_url(self, url: str) -> HostLimiter:
+        """Return the limiter responsible for the host of `url`"""
+        return self.for_host(urlparse(url).netloc)
+
+    def for_host(self, host: str) -> HostLimiter:
+        with self._lock:
+            limiter = self._limiters.get(host)
+            if limiter is None:
+                settings = self.limits.get(host, self.default)
+                limiter = HostLimiter(
+                    rate=settings.get('rate', self.default.get('rate', 1.0)),
+                    burst=settings.get('burst', 1),
+                    concurrency=settings.get('concurrency', 1)
+                )
+                self._limiters[host] = limiter
+            return limiter
+
+    def configure(self, host: str, **settings: Any) -> None:
+        """Override limits for a host before any request is made to it"""
+        with self._lock:
+            self.limits[host] = {**self.limits.get(host, self.default), **settings}
+            self._limiters.pop(host, None)
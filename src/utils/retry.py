@@ -0,0 +1,153 @@
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+from ..constants.config import (
+    MAX_RETRIES, RETRY_STATUS_CODES, RETRY_BACKOFF_BASE, RETRY_BACKOFF_MAX, RETRY_AFTER_MAX,
+    CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT, CIRCUIT_WAIT_TIMEOUT
+)
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        seconds = (when - datetime.now(timezone.utc)).total_seconds()
+    return min(max(seconds, 0.0), RETRY_AFTER_MAX)
+
+class RetryPolicy:
+    """Exponential backoff with full jitter that honours Retry-After"""
+
+    def __init__(self, max_retries: int = MAX_RETRIES, base: float = RETRY_BACKOFF_BASE,
+                 cap: float = RETRY_BACKOFF_MAX, retry_statuses=RETRY_STATUS_CODES):
+        self.max_retries = max_retries
+        self.base = base
+        self.cap = cap
+        self.retry_statuses = frozenset(retry_statuses)
+
+    def should_retry(self, status_code: Optional[int]) -> bool:
+        """Connection errors (no status) and throttling/server errors are retried"""
+        return status_code is None or status_code in self.retry_statuses
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Seconds to sleep before retry number `attempt` (starting at 0)"""
+        backoff = random.uniform(0, min(self.cap, self.base * 2 ** attempt))
+        if retry_after is not None:
+            return max(retry_after, backoff)
+        return backoff
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request to a host whose circuit stayed open too long"""
+
+class CircuitBreaker:
+    """Per-host circuit breaker.
+
+    Closed: requests flow. After `failure_threshold` consecutive failures it
+    opens for `reset_timeout` seconds, so no request is sent to a host that
+    is down. It then half-opens and lets a single probe through: success
+    closes it, failure opens it again. Meanwhile `acquire` holds callers
+    back until the circuit closes or they become the probe, for at most
+    `wait_timeout` seconds, so a short outage delays the run instead of
+    failing every ticker; only then is CircuitOpenError raised.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    # Seconds between checks of a coroutine waiting for the probe to report back
+    ASYNC_POLL_INTERVAL = 0.25
+
+    def __init__(self, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+                 reset_timeout: float = CIRCUIT_RESET_TIMEOUT, wait_timeout: float = CIRCUIT_WAIT_TIMEOUT):
+        self.failure_threshold = max(int(failure_threshold), 1)
+        self.reset_timeout = reset_timeout
+        self.wait_timeout = wait_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_count = 0
+        self._opened_at = 0.0
+        self._probe_started = 0.0
+        self._lock = threading.Lock()
+        # Notified whenever a request reports back, so waiters see the probe's outcome at once
+        self._changed = threading.Condition(self._lock)
+
+    def _try_acquire(self, now: float) -> Optional[float]:
+        """Let a request through and return None, or return seconds until the state may change"""
+        if self.state == self.CLOSED:
+            return None
+        if self.state == self.OPEN:
+            remaining = self._opened_at + self.reset_timeout - now
+            if remaining <= 0:
+                # This caller becomes the probe
+                self.state = self.HALF_OPEN
+                self._probe_started = now
+                return None
+            return remaining
+        # Take over the probe if it never reported back
+        remaining = self._probe_started + self.reset_timeout - now
+        if remaining <= 0:
+            self._probe_started = now
+            return None
+        return remaining
+
+    def _rejection(self) -> CircuitOpenError:
+        return CircuitOpenError(f"Circuit {self.state.replace('_', '-')}, gave up after waiting "
+                                f"{self.wait_timeout:.0f}s for the host to recover")
+
+    def acquire(self) -> None:
+        """Let a request through once the circuit allows it, raising CircuitOpenError after `wait_timeout`"""
+        deadline = time.monotonic() + self.wait_timeout
+        with self._changed:
+            while True:
+                now = time.monotonic()
+                wait = self._try_acquire(now)
+                if wait is None:
+                    return
+                if now >= deadline:
+                    raise self._rejection()
+                self._changed.wait(min(wait, deadline - now))
+
+    async def acquire_async(self) -> None:
+        """`acquire` for coroutines, waiting without blocking the event loop"""
+        import asyncio
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                wait = self._try_acquire(now)
+                if wait is None:
+                    return
+                if now >= deadline:
+                    raise self._rejection()
+            await asyncio.sleep(min(wait, deadline - now, self.ASYNC_POLL_INTERVAL))
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.state = self.CLOSED
+            self._changed.notify_all()
+
+    def record_failure(self) -> bool:
+        """Count a failure, return True if this opened the circuit"""
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or (
+                    self.state == self.CLOSED and self.failures >= self.failure_threshold):
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                self.opened_count += 1
+                self._changed.notify_all()
+                return True
+            return False
@@ -0,0 +1,65 @@
+# src/utils/ticker_source.py
+import glob
+from pathlib import Path
+from typing import Iterable, Iterator, List, Set, Union
+from .helpers import iter_column
+from .logger import setup_logger
+from ..constants.config import COLUMNS, CSV_ENCODING
+
+class TickerSource:
+    """Unique tickers of one or more input CSV files, read lazily.
+
+    Inputs may be paths or glob patterns such as `data/input/*.csv`. Files
+    are read one row at a time and only the ticker column is kept, so
+    scraping can start with the first rows of a large universe file.
+    Tickers seen in earlier rows or files are skipped. Only the unique
+    tickers are kept in memory, however wide or long the inputs are.
+    """
+
+    def __init__(self, inputs: Iterable[Union[str, Path]], column: str = COLUMNS['TICKER'],
+                 encoding: str = CSV_ENCODING):
+        self.logger = setup_logger('ticker_source')
+        self.inputs = [str(path) for path in inputs]
+        self.column = column
+        self.encoding = encoding
+        self.paths = self.resolve(self.inputs)
+        # Unique tickers yielded so far, and whether every input has been read
+        self.count = 0
+        self.exhausted = False
+
+    @staticmethod
+    def resolve(inputs: Iterable[str]) -> List[str]:
+        """Expand glob patterns, keeping the first occurrence of each file"""
+        paths = []
+        for pattern in inputs:
+            if glob.has_magic(pattern):
+                matches = sorted(glob.glob(pattern))
+                if not matches:
+                    raise FileNotFoundError(f"No input files match {pattern}")
+            else:
+                if not Path(pattern).is_file():
+                    raise FileNotFoundError(f"Input file not found: {pattern}")
+                matches = [pattern]
+            paths.extend(matches)
+        return list(dict.fromkeys(paths))
+
+    def __iter__(self) -> Iterator[str]:
+        seen: Set[str] = set()
+        self.count = 0
+        self.exhausted = False
+        for path in self.paths:
+            self.logger.info(f"Reading tickers from {path}")
+            before = self.count
+            for ticker in iter_column(path, self.column, self.encoding):
+                if ticker in seen:
+                    continue
+                seen.add(ticker)
+                self.count += 1
+                yield ticker
+            self.logger.info(f"Found {self.count - before} new tickers in {path}")
+        self.exhausted = True
+
+    @property
+    def progress(self) -> str:
+        """Tickers read so far, with a '+' while inputs remain"""
+        return f"{self.count}" if self.exhausted else f"{self.count}+"
@@ -0,0 +1,87 @@
+import os
+import tempfile
+
+# Stores opened with their default paths and log files go to a scratch directory,
+# not the project's data/ and logs/; set before any test module imports
+# src.constants.config, and inherited by the processes tests start
+_scratch = tempfile.mkdtemp(prefix='scraper-tests-')
+os.environ.setdefault('SCRAPER_DATA_DIR', os.path.join(_scratch, 'data'))
+os.environ.setdefault('SCRAPER_LOGS_DIR', os.path.join(_scratch, 'logs'))
+
+from urllib.parse import urlsplit
+import pytest
+from benchmarks.fake_server import FakeSiteServer
+from src.constants.config import MORNINGSTAR_URL, FINVIZ_URL
+from src.scrapers.base_scraper import BaseScraper
+from src.scrapers.combined_scraper import CombinedScraper
+from src.transports import SyncTransport
+from src.utils.metrics import Metrics
+from src.utils.rate_limiter import HostLimits
+from src.utils.retry import RetryPolicy
+
+@pytest.fixture
+def fake_server():
+    """Start FakeSiteServer instances for a test: fake_server('finviz', error_rate=1.0)"""
+    servers = []
+
+    def start(site: str = 'morningstar', **options) -> FakeSiteServer:
+        options.setdefault('blocks', 20)
+        server = FakeSiteServer(site, **options).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+@pytest.fixture
+def make_scraper():
+    """Create BaseScrapers without rate limits and with millisecond backoffs"""
+    scrapers = []
+
+    def make(max_retries: int = 2, **options) -> BaseScraper:
+        options.setdefault('limits', HostLimits(limits={}, default={'rate': 0, 'burst': 1, 'concurrency': 8}))
+        options.setdefault('metrics', Metrics())
+        scraper = BaseScraper(retry_policy=RetryPolicy(max_retries=max_retries, base=0.01, cap=0.02), **options)
+        scrapers.append(scraper)
+        return scraper
+
+    yield make
+    for scraper in scrapers:
+        scraper.close()
+
+class SiteTransport(SyncTransport):
+    """Send requests for the configured Morningstar and Finviz hosts to fake servers, recording their URLs"""
+
+    def __init__(self, servers):
+        super().__init__()
+        self.hosts = {urlsplit(MORNINGSTAR_URL).netloc: servers['morningstar'].url,
+                      urlsplit(FINVIZ_URL).netloc: servers['finviz'].url}
+        self.requested = []
+
+    def get(self, url, headers=None):
+        self.requested.append(url)
+        parts = urlsplit(url)
+        return super().get(url.replace(f"{parts.scheme}://{parts.netloc}", self.hosts[parts.netloc], 1), headers)
+
+@pytest.fixture
+def sites(fake_server):
+    return {site: fake_server(site) for site in ('morningstar', 'finviz')}
+
+@pytest.fixture
+def make_combined(sites):
+    """Create CombinedScrapers fetching from the fake sites without rate limits or retries"""
+    scrapers = []
+
+    def make(**options) -> CombinedScraper:
+        options.setdefault('use_screener', False)
+        scraper = CombinedScraper(
+            limits=HostLimits(limits={}, default={'rate': 0, 'burst': 1, 'concurrency': 8}),
+            transport=SiteTransport(sites), metrics=Metrics(),
+            retry_policy=RetryPolicy(max_retries=0, base=0.01, cap=0.02), **options)
+        scrapers.append(scraper)
+        return scraper
+
+    yield make
+    for scraper in scrapers:
+        scraper.close()
@@ -0,0 +1,85 @@
+import math
+import random
+import pytest
+from src.constants.config import COLUMNS
+from src.formatters.csv_formatter import CSVFormatter
+from src.models.stock_data import StockData
+
+pytest.importorskip('pandas')
+
+# Columns of the original per-row formatter
+LEGACY_KEYS = ['TICKER', 'SECTOR', 'INDUSTRY', 'CURRENT_PRICE', 'TARGET_YIELD', 'PB_RATIO', 'PEG_RATIO',
+               'DIVIDEND_TTM', 'YIELD_5YR_AVG', 'BVPS_TTM', 'PB_5YR_AVG', 'EPS_TTM', 'EPS_GROWTH']
+
+def legacy_row(data):
+    """One output row as the original per-row formatter built it, missing values read as 0"""
+    def number(value):
+        try:
+            return f"{float(value):,.2f}"
+        except (TypeError, ValueError):
+            return "0.00"
+
+    def target_yield(dividend_ttm, yield_5yr_avg):
+        if yield_5yr_avg and yield_5yr_avg != 0:
+            return number(dividend_ttm / (yield_5yr_avg * 1.2))
+        return "0.00"
+
+    get = data.get
+    return [
+        str(get('ticker', '')), str(get('sector', '')), str(get('industry', '')),
+        number(get('current_price', 0)),
+        target_yield(get('dividend_ttm', 0), get('yield_5yr_avg', 0)),
+        number(get('bvps_ttm', 0) * get('pb_5yr_avg', 0)),
+        number(get('eps_ttm', 0) * get('eps_growth', 0) * 100),
+        number(get('dividend_ttm', 0)), number(get('yield_5yr_avg', 0)), number(get('bvps_ttm', 0)),
+        number(get('pb_5yr_avg', 0)), number(get('eps_ttm', 0)), number(get('eps_growth', 0)),
+    ]
+
+def random_records(count, seed=0):
+    rng = random.Random(seed)
+    numeric = ['current_price', 'dividend_ttm', 'yield_5yr_avg', 'bvps_ttm', 'pb_5yr_avg', 'eps_ttm', 'eps_growth']
+    records = []
+    for i in range(count):
+        data = {'ticker': f'T{i:03d}', 'sector': rng.choice(['Technology', 'Energy']), 'industry': 'Other'}
+        for field in numeric:
+            data[field] = rng.choice([0.0, round(rng.uniform(-50, 5000), 2)])
+        # Leave some fields out, as pages that failed to scrape do
+        for field in rng.sample(numeric, rng.randint(0, 3)):
+            del data[field]
+        records.append(data)
+    return records
+
+def test_format_data_matches_per_row_output():
+    records = random_records(200)
+    formatter = CSVFormatter(columns=LEGACY_KEYS)
+    frame = formatter.format_data(records)
+    assert list(frame.columns) == [COLUMNS[key] for key in LEGACY_KEYS]
+    assert frame.values.tolist() == [legacy_row(data) for data in records]
+
+def test_format_frame_keeps_missing_values_as_nan():
+    formatter = CSVFormatter()
+    frame = formatter.format_frame([
+        StockData('AAPL', dividend_ttm=1.0, yield_5yr_avg=0.5, bvps_ttm=4.0),
+        StockData('MSFT', dividend_ttm=1.0, yield_5yr_avg=0.0),
+    ])
+    aapl, msft = frame.to_dict('records')
+    assert aapl[COLUMNS['TARGET_YIELD']] == pytest.approx(1.0 / 0.6)
+    assert math.isnan(aapl[COLUMNS['CURRENT_PRICE']])
+    # A valuation with a missing input is missing too
+    assert math.isnan(aapl[COLUMNS['PB_RATIO']])
+    assert msft[COLUMNS['TARGET_YIELD']] == 0.0
+    assert aapl[COLUMNS['SECTOR']] == ''
+
+def test_format_output_renders_missing_values_as_zero():
+    formatter = CSVFormatter(columns=['CURRENT_PRICE', 'PB_RATIO'])
+    frame = formatter.format_data([StockData('AAPL', current_price=1234.5)])
+    assert frame.values.tolist() == [['AAPL', '1,234.50', '0.00']]
+
+def test_required_fields():
+    assert CSVFormatter(columns=['CURRENT_PRICE', 'PEG_RATIO']).required_fields() == {
+        'current_price', 'eps_ttm', 'eps_growth'}
+    assert CSVFormatter(columns=['ticker']).required_fields() == set()
+
+def test_unknown_columns():
+    with pytest.raises(ValueError):
+        CSVFormatter(columns=['NOT_A_COLUMN'])
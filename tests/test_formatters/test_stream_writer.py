@@ -0,0 +1,55 @@
+import csv
+import os
+import pytest
+from src.constants.config import COLUMNS, CSV_ENCODING
+from src.formatters.csv_formatter import CSVFormatter
+from src.formatters.stream_writer import CSVStreamWriter, get_writer
+from src.models.stock_data import StockData
+
+pytest.importorskip('pandas')
+
+def read_rows(path):
+    with open(path, encoding=CSV_ENCODING, newline='') as f:
+        return list(csv.reader(f))
+
+def test_rows_are_appended_a_chunk_at_a_time(tmp_path):
+    path = str(tmp_path / 'result.csv')
+    formatter = CSVFormatter(columns=['SECTOR', 'CURRENT_PRICE'])
+    with CSVStreamWriter(path, formatter=formatter, chunk_size=2, timestamped=False) as writer:
+        writer.write(StockData('AAPL', current_price=190.5, sector='Technology'))
+        assert read_rows(path) == []
+        writer.write(StockData.failed('MSFT', 'timed out'))
+        # The full chunk is on disk, behind a single header
+        header = [COLUMNS['TICKER'], COLUMNS['SECTOR'], COLUMNS['CURRENT_PRICE']]
+        assert read_rows(path) == [header, ['AAPL', 'Technology', '190.50'], ['MSFT', '', '0.00']]
+        writer.write(StockData('NVDA', current_price=1234.5))
+    assert read_rows(path)[1:] == [['AAPL', 'Technology', '190.50'], ['MSFT', '', '0.00'], ['NVDA', '', '1,234.50']]
+    assert writer.rows_written == 3
+
+def test_empty_output_has_a_header(tmp_path):
+    path = str(tmp_path / 'result.csv')
+    with get_writer('csv', path, formatter=CSVFormatter(columns=['SECTOR']), timestamped=False):
+        pass
+    assert read_rows(path) == [[COLUMNS['TICKER'], COLUMNS['SECTOR']]]
+
+def test_timestamped_output_name(tmp_path):
+    with get_writer('csv', str(tmp_path / 'result.csv')) as writer:
+        pass
+    name = os.path.basename(writer.output_path)
+    assert name.startswith('result_') and name.endswith('.csv') and os.path.exists(writer.output_path)
+
+def test_parquet_keeps_numbers(tmp_path):
+    pd = pytest.importorskip('pandas')
+    pytest.importorskip('pyarrow')
+    path = str(tmp_path / 'result.parquet')
+    with get_writer('parquet', path, formatter=CSVFormatter(columns=['CURRENT_PRICE']), chunk_size=1,
+                    timestamped=False) as writer:
+        writer.write(StockData('AAPL', current_price=1234.5))
+        writer.write(StockData('MSFT'))
+    frame = pd.read_parquet(path)
+    assert frame[COLUMNS['TICKER']].tolist() == ['AAPL', 'MSFT']
+    assert frame[COLUMNS['CURRENT_PRICE']].iloc[0] == 1234.5 and pd.isna(frame[COLUMNS['CURRENT_PRICE']].iloc[1])
+
+def test_unknown_formats():
+    with pytest.raises(ValueError):
+        get_writer('xlsx', 'result.xlsx')
@@ -0,0 +1,32 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+from benchmarks.fake_server import finviz_sector
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+TICKERS = ['AAPL', 'MSFT', 'NVDA', 'T005']
+
+def run_main(env, *args):
+    result = subprocess.run([sys.executable, str(PROJECT_ROOT / 'main.py'), *args], cwd=PROJECT_ROOT, env=env,
+                            check=True, capture_output=True, text=True, timeout=120)
+    return result.stdout
+
+def test_default_run_fills_the_metadata_index(tmp_path, fake_server):
+    servers = {site: fake_server(site) for site in ('morningstar', 'finviz')}
+    tickers = tmp_path / 'tickers.csv'
+    tickers.write_text('Ticker\n' + '\n'.join(TICKERS) + '\n', encoding='utf-8')
+    env = {**os.environ, 'MORNINGSTAR_URL': servers['morningstar'].url, 'FINVIZ_URL': servers['finviz'].url,
+           'SCRAPER_DATA_DIR': str(tmp_path / 'data')}
+    run_main(env, '--input', str(tickers), '--output', str(tmp_path / 'result.csv'), '--no-cache',
+             '--morningstar-rate', '0', '--finviz-rate', '0')
+
+    requests = sum(server.status_counts.get(200, 0) for server in servers.values())
+    output = run_main(env, '--sectors', '--input', str(tickers))
+    # The breakdown is answered from the index alone
+    assert sum(server.status_counts.get(200, 0) for server in servers.values()) == requests
+    assert f"Sector breakdown of {len(TICKERS)} tickers ({len(TICKERS)} indexed" in output
+    assert 'Unknown' not in output
+    for ticker in TICKERS:
+        sector, industry = finviz_sector(ticker)
+        assert sector in output and industry in output
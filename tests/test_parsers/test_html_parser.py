@@ -0,0 +1,60 @@
+import pytest
+from benchmarks.fake_server import morningstar_values, finviz_sector
+from benchmarks.synthetic_pages import morningstar_page, finviz_page, finviz_screener_page
+from src.constants.selectors import SELECTORS
+from src.parsers.extractor import ExtractionEngine
+from src.parsers.html_parser import FragmentParser, CELLS, ROWS
+
+pytest.importorskip('lxml')
+pytest.importorskip('bs4')
+
+TICKERS = ['AAPL', 'MSFT', 'T005', 'BRK.B']
+
+def both_backends(selectors):
+    return FragmentParser(selectors, backend='lxml'), FragmentParser(selectors, backend='html.parser')
+
+@pytest.mark.parametrize('page', sorted(SELECTORS))
+def test_morningstar_pages_match_beautifulsoup(page):
+    fast, soup = both_backends(SELECTORS[page])
+    for ticker in TICKERS:
+        html = morningstar_page(ticker, page, morningstar_values(ticker, page), blocks=30).encode()
+        result = fast.parse(html, 'utf-8')
+        assert result and result == soup.parse(html, 'utf-8')
+
+def test_table_modes_match_beautifulsoup():
+    fast, soup = both_backends({'snapshot': ('table.snapshot-table2', CELLS),
+                                'screener': ('table.screener_table', ROWS)})
+    for ticker in TICKERS:
+        html = finviz_page(ticker, *finviz_sector(ticker), blocks=30)
+        assert fast.parse(html) == soup.parse(html)
+    html = finviz_screener_page([(ticker, *finviz_sector(ticker)) for ticker in TICKERS],
+                                columns=[1, 3, 4, 7, 14], blocks=30)
+    result = fast.parse(html)
+    assert result == soup.parse(html)
+    assert result['screener'][0] == ['Ticker', 'Sector', 'Industry', 'P/E', 'Dividend']
+    assert [row[0] for row in result['screener'][1:]] == TICKERS
+
+def test_missing_selectors_are_left_out():
+    fast, soup = both_backends({'price': 'div[data-test="current-price"]', 'absent': 'div.nowhere'})
+    html = morningstar_page('AAPL', 'quote', morningstar_values('AAPL', 'quote'), blocks=5)
+    assert fast.parse(html) == soup.parse(html) == {'price': morningstar_values('AAPL', 'quote')['current-price']}
+
+@pytest.mark.parametrize('encoding', ['utf-8', 'cp1252', 'shift_jis'])
+def test_bytes_are_decoded_with_the_response_encoding(encoding):
+    sector = {'utf-8': 'Télécoms €', 'cp1252': 'Télécoms €', 'shift_jis': '情報・通信業'}[encoding]
+    html = finviz_page('7203', sector, 'Autos', blocks=5).encode(encoding)
+    fast, soup = both_backends({'snapshot': ('table.snapshot-table2', CELLS)})
+    result = fast.parse(html, encoding)
+    assert result == soup.parse(html, encoding)
+    assert result['snapshot'][1] == sector
+
+def test_extraction_engine_backends_agree():
+    fast, soup = ExtractionEngine(backend='lxml'), ExtractionEngine(backend='html.parser')
+    for ticker in TICKERS:
+        for page in SELECTORS:
+            html = morningstar_page(ticker, page, morningstar_values(ticker, page), blocks=30).encode()
+            assert fast.extract(page, html, 'utf-8') == soup.extract(page, html, 'utf-8')
+        html = finviz_page(ticker, *finviz_sector(ticker), blocks=30).encode()
+        fields = fast.extract('finviz', html, 'utf-8')
+        assert fields == soup.extract('finviz', html, 'utf-8')
+        assert set(fields) == set(fast.fields('finviz'))
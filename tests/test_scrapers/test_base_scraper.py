@@ -0,0 +1,134 @@
+import asyncio
+import threading
+import time
+import pytest
+from src.transports import AsyncTransport
+from src.utils.rate_limiter import HostLimits
+from src.utils.retry import CircuitBreaker, CircuitOpenError
+
+def quote_url(server, ticker='AAPL'):
+    return f"{server.url}/stocks/{ticker}/quote"
+
+def test_fetches_page(fake_server, make_scraper):
+    server = fake_server()
+    scraper = make_scraper()
+    response = scraper._make_request(quote_url(server))
+    assert response.status_code == 200
+    assert b'data-test="current-price"' in response.content
+    assert scraper.metrics.counter('requests') == 1
+
+def test_missing_page_is_not_retried(fake_server, make_scraper):
+    server = fake_server()
+    scraper = make_scraper()
+    assert scraper._make_request(f"{server.url}/stocks/AAPL/unknown") is None
+    assert server.status_counts == {404: 1}
+
+def test_retries_server_errors_then_gives_up(fake_server, make_scraper):
+    server = fake_server(error_rate=1.0)
+    scraper = make_scraper(max_retries=2)
+    assert scraper._make_request(quote_url(server)) is None
+    assert server.status_counts == {500: 3}
+    assert scraper.metrics.counter('retries', reason=500) == 2
+
+def test_waits_for_retry_after(fake_server, make_scraper):
+    # One request per second, then 429 with Retry-After: 1
+    server = fake_server(throttle_rate=1)
+    scraper = make_scraper()
+    assert scraper._make_request(quote_url(server, 'AAPL')) is not None
+    start = time.monotonic()
+    response = scraper._make_request(quote_url(server, 'MSFT'))
+    assert response is not None and response.status_code == 200
+    assert time.monotonic() - start >= 0.9
+    assert server.status_counts[429] == 1
+    assert scraper.metrics.counter('retries', reason=429) == 1
+
+def test_open_circuit_rejects_after_waiting(fake_server, make_scraper):
+    server = fake_server(error_rate=1.0)
+    scraper = make_scraper(max_retries=5)
+    url = quote_url(server)
+    scraper.limits.for_url(url).breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60, wait_timeout=0.1)
+    with pytest.raises(CircuitOpenError):
+        scraper._make_request(url)
+    # Later requests to the host wait for the circuit, then are rejected without being sent
+    start = time.monotonic()
+    with pytest.raises(CircuitOpenError):
+        scraper._make_request(quote_url(server, 'MSFT'))
+    assert 0.1 <= time.monotonic() - start < 0.6
+    assert server.status_counts == {500: 2}
+    assert scraper.metrics.counter('circuit_opened') == 1
+    assert scraper.metrics.counter('circuit_rejected') == 2
+
+def test_concurrent_requests_share_one_download(fake_server, make_scraper):
+    server = fake_server(latency=0.2)
+    scraper = make_scraper()
+    responses = []
+    threads = [threading.Thread(target=lambda: responses.append(scraper._make_request(quote_url(server))))
+               for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert server.status_counts == {200: 1}
+    assert len(responses) == 5 and len({response.content for response in responses}) == 1
+    assert scraper.metrics.counter('requests_coalesced') == 4
+
+def run_on_loop(scraper, coroutine):
+    return asyncio.run_coroutine_threadsafe(coroutine, scraper.transport.loop).result(timeout=30)
+
+def test_async_requests_are_in_flight_together(fake_server, make_scraper):
+    pytest.importorskip('aiohttp')
+    server = fake_server(latency=0.3)
+    limits = HostLimits(limits={}, default={'rate': 0, 'burst': 1, 'concurrency': 50})
+    scraper = make_scraper(transport=AsyncTransport(pool_size=50), limits=limits)
+    urls = [quote_url(server, f'T{i:03d}') for i in range(30)]
+
+    def client_threads():
+        # The fake server handles each connection in a thread of its own
+        return sum(1 for thread in threading.enumerate() if 'process_request' not in thread.name)
+
+    async def fetch_all():
+        fetches = asyncio.gather(*(scraper._make_request_async(url) for url in urls))
+        await asyncio.sleep(0.15)
+        return client_threads(), await fetches
+
+    threads = client_threads()
+    start = time.monotonic()
+    threads_in_flight, responses = run_on_loop(scraper, fetch_all())
+    # 30 requests of 0.3s each, all waiting at once without a thread each
+    assert time.monotonic() - start < 1.5
+    assert threads_in_flight == threads
+    assert all(response.status_code == 200 for response in responses)
+    assert server.status_counts == {200: 30}
+
+def test_async_requests_retry_and_share_downloads(fake_server, make_scraper):
+    pytest.importorskip('aiohttp')
+    server = fake_server(error_rate=1.0)
+    scraper = make_scraper(transport=AsyncTransport(), max_retries=2)
+    url = quote_url(server)
+
+    async def fetch_twice():
+        return await asyncio.gather(scraper._make_request_async(url), scraper._make_request_async(url))
+
+    assert run_on_loop(scraper, fetch_twice()) == [None, None]
+    assert server.status_counts == {500: 3}
+    assert scraper.metrics.counter('retries', reason=500) == 2
+    assert scraper.metrics.counter('requests_coalesced') == 1
+
+def test_requests_wait_out_a_short_outage(fake_server, make_scraper):
+    server = fake_server(error_rate=1.0)
+    scraper = make_scraper(max_retries=0)
+    url = quote_url(server)
+    scraper.limits.for_url(url).breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.3, wait_timeout=5)
+    assert scraper._make_request(url) is None
+    # The host recovers while the circuit is open
+    server.error_rate = 0.0
+    responses = []
+    threads = [threading.Thread(target=lambda ticker=ticker: responses.append(
+        scraper._make_request(quote_url(server, ticker)))) for ticker in ('MSFT', 'NVDA', 'AMZN')]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(responses) == 3 and all(response is not None for response in responses)
+    assert server.status_counts == {500: 1, 200: 3}
+    assert scraper.metrics.counter('circuit_rejected') == 0
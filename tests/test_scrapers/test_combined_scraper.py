@@ -0,0 +1,57 @@
+from src.constants.config import MORNINGSTAR_URL
+from src.models.stock_data import FIELDS
+from src.storage.field_store import FieldStore
+from src.storage.metadata_index import MetadataIndex
+
+def test_refresh_fetches_only_pages_with_stale_fields(tmp_path, make_combined):
+    path = tmp_path / 'fields.sqlite'
+    first = make_combined(field_store=FieldStore(path)).scrape_stock_data('AAPL')
+    assert first.ok
+
+    # Only the price has expired
+    scraper = make_combined(field_store=FieldStore(path, max_ages={'current_price': 0}))
+    data = scraper.scrape_stock_data('AAPL')
+    assert scraper.transport.requested == [f"{MORNINGSTAR_URL}/stocks/AAPL/quote"]
+    assert data.ok and data.fields() == first.fields()
+    assert scraper.metrics.counter('refresh_pages_skipped') == len(scraper.planner.pages) - 1
+
+    # Nothing is stale: the record comes from the store alone
+    scraper = make_combined(field_store=FieldStore(path))
+    data = scraper.scrape_stock_data('AAPL')
+    assert scraper.transport.requested == []
+    assert data.fields() == first.fields()
+    assert scraper.metrics.counter('refresh_skipped_tickers') == 1
+
+def test_refresh_stores_requested_fields_only(tmp_path, make_combined):
+    store = FieldStore(tmp_path / 'fields.sqlite')
+    make_combined(field_store=store, fields=['current_price', 'sector']).scrape_stock_data('AAPL')
+    assert set(store.load('AAPL')) == {'current_price', 'sector', 'industry', *(
+        field for field in FIELDS if field.startswith('finviz_'))}
+    # Fields of pages that were not fetched are still stale
+    assert store.stale_fields('AAPL', ['current_price', 'eps_ttm']) == {'eps_ttm'}
+
+def test_refresh_keeps_stored_values_but_fails_when_no_page_refreshes(tmp_path, sites, make_combined):
+    path = tmp_path / 'fields.sqlite'
+    first = make_combined(field_store=FieldStore(path)).scrape_stock_data('AAPL')
+    assert first.ok
+
+    # Every stored field is stale, and every page now fails
+    for server in sites.values():
+        server.error_rate = 1.0
+    scraper = make_combined(field_store=FieldStore(path, max_ages={field: 0 for field in FIELDS}))
+    data = scraper.scrape_stock_data('AAPL')
+    assert not data.ok and 'Refresh failed' in data.error
+    # The last known values are still in the record, flagged by the error
+    assert data.fields() == first.fields()
+    assert scraper.metrics.counter('refresh_failed_tickers') == 1
+
+def test_indexed_metadata_skips_the_finviz_page(tmp_path, make_combined):
+    index = MetadataIndex(tmp_path / 'metadata.sqlite')
+    first = make_combined(metadata=index).scrape_stock_data('AAPL')
+    assert index.lookup('AAPL') == {'sector': first.sector, 'industry': first.industry}
+
+    scraper = make_combined(metadata=index, fields=['current_price', 'sector', 'industry'])
+    data = scraper.scrape_stock_data('AAPL')
+    assert scraper.transport.requested == [f"{MORNINGSTAR_URL}/stocks/AAPL/quote"]
+    assert (data.sector, data.industry, data.current_price) == (first.sector, first.industry, first.current_price)
+    assert scraper.metrics.counter('metadata_index', outcome='hit') == 1
@@ -0,0 +1,34 @@
+from src.models.stock_data import StockData
+from src.scrapers.distributed import Coordinator
+from src.storage.shard_queue import ShardQueue
+
+def complete_all(queue, run_id):
+    while True:
+        shard = queue.lease('w1', run_id)
+        if shard is None:
+            return
+        queue.complete(shard, 'w1', [StockData(ticker, current_price=1.0) for ticker in shard.tickers])
+
+def test_shards_are_acknowledged_once_written(tmp_path):
+    queue = ShardQueue(tmp_path / 'shards.sqlite')
+    coordinator = Coordinator(queue, local_workers=0, shard_size=2, poll_interval=0.01)
+    results = coordinator.scrape_iter(['A', 'B', 'C'])
+    # The run is created when the first result is asked for; finish it from a "worker"
+    queue.create_run = _completing(queue, queue.create_run)
+    written = [next(results).ticker]
+    # The first shard is half written: a coordinator dying now keeps both of its records
+    assert queue.counts(coordinator.run_id) == {'done': 2}
+    written.append(next(results).ticker)
+    written.append(next(results).ticker)
+    assert queue.counts(coordinator.run_id) == {'merged': 1, 'done': 1}
+    assert list(results) == []
+    assert written == ['A', 'B', 'C']
+    assert queue.counts(coordinator.run_id) == {'merged': 2}
+    queue.close()
+
+def _completing(queue, create_run):
+    def create(*args, **kwargs):
+        run_id = create_run(*args, **kwargs)
+        complete_all(queue, run_id)
+        return run_id
+    return create
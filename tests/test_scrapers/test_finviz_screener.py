@@ -0,0 +1,49 @@
+from benchmarks.fake_server import finviz_sector
+from src.constants.config import FINVIZ_URL
+
+TICKERS = [f'T{i:03d}' for i in range(25)]
+
+def screener_requests(scraper):
+    return [url for url in scraper.transport.requested if url.startswith(f"{FINVIZ_URL}/screener.ashx")]
+
+def test_prefetch_looks_up_tickers_a_page_at_a_time(make_combined):
+    scraper = make_combined(use_screener=True)
+    screener = scraper.screener
+    assert list(screener.prefetch(TICKERS)) == TICKERS
+    requests = screener_requests(scraper)
+    assert len(requests) == 2 and requests[0].endswith('&t=' + ','.join(TICKERS[:20]))
+    assert screener.metrics.counter('finviz_screener_rows') == len(TICKERS)
+    fields = screener.take('T007')
+    assert (fields['sector'], fields['industry']) == finviz_sector('T007')
+    # Rows are handed out once
+    assert screener.take('T007') is None
+
+def test_prefetched_tickers_skip_their_quote_page(make_combined):
+    scraper = make_combined(use_screener=True)
+    tickers = list(scraper.prefetch(['AAPL', 'MSFT']))
+    data = scraper.scrape_stock_data('AAPL')
+    assert (data.sector, data.industry) == finviz_sector('AAPL')
+    assert f"{FINVIZ_URL}/quote.ashx?t=AAPL" not in scraper.transport.requested
+    # A ticker missing from the screener falls back to its quote page
+    scraper.screener.take('MSFT')
+    data = scraper.scrape_stock_data('MSFT')
+    assert data.sector and f"{FINVIZ_URL}/quote.ashx?t=MSFT" in scraper.transport.requested
+    assert tickers == ['AAPL', 'MSFT']
+    assert scraper.metrics.counter('finviz_screener', outcome='hit') == 1
+    assert scraper.metrics.counter('finviz_screener', outcome='fallback') == 1
+
+def test_tickers_not_needed_are_passed_through(make_combined):
+    scraper = make_combined(use_screener=True)
+    tickers = list(scraper.screener.prefetch(TICKERS[:5], needed=lambda ticker: ticker != 'T002'))
+    assert sorted(tickers) == TICKERS[:5]
+    assert screener_requests(scraper)[0].endswith('&t=T000,T001,T003,T004')
+    assert scraper.screener.take('T002') is None
+
+def test_failed_screener_pages_find_nothing(sites, make_combined):
+    sites['finviz'].error_rate = 1.0
+    scraper = make_combined(use_screener=True)
+    assert scraper.screener.load(['AAPL', 'msft']) == 0
+    sites['finviz'].error_rate = 0.0
+    # Finviz lists tickers in upper case; rows are kept under the ticker asked for
+    assert scraper.screener.load(['AAPL', 'msft']) == 2
+    assert scraper.screener.take('msft')['sector'] == finviz_sector('MSFT')[0]
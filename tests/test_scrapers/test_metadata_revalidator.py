@@ -0,0 +1,46 @@
+import threading
+from src.scrapers.metadata_revalidator import MetadataRevalidator
+from src.storage.metadata_index import MetadataIndex
+from src.utils.metrics import Metrics
+
+def test_stale_tickers_are_revalidated_in_groups(tmp_path):
+    index = MetadataIndex(tmp_path / 'metadata.sqlite')
+    groups = []
+    fetched = threading.Event()
+
+    def fetch(tickers):
+        groups.append(list(tickers))
+        if sum(map(len, groups)) == 5:
+            fetched.set()
+        # MSFT is not listed
+        return {ticker: {'sector': 'Technology'} for ticker in tickers if ticker != 'MSFT'}
+
+    revalidator = MetadataRevalidator(index, fetch, Metrics(), batch_size=3, linger=0.05)
+    for ticker in ['AAPL', 'MSFT', 'NVDA', 'AAPL', 'AMD', 'INTC']:
+        revalidator.schedule(ticker)
+    assert fetched.wait(5)
+    revalidator.close()
+    assert groups == [['AAPL', 'MSFT', 'NVDA'], ['AMD', 'INTC']]
+    assert {ticker: index.lookup(ticker) for ticker in ['AAPL', 'MSFT', 'INTC']} == {
+        'AAPL': {'sector': 'Technology'}, 'MSFT': None, 'INTC': {'sector': 'Technology'}}
+    assert revalidator.metrics.counter('metadata_revalidations', outcome='updated') == 4
+    assert revalidator.metrics.counter('metadata_revalidations', outcome='failed') == 1
+
+    # A failed ticker stays scheduled, so it is not retried on every lookup
+    assert revalidator._scheduled == {'MSFT'}
+
+def test_fetch_errors_leave_the_index_alone(tmp_path):
+    index = MetadataIndex(tmp_path / 'metadata.sqlite')
+    index.update('AAPL', {'sector': 'Technology'})
+    done = threading.Event()
+
+    def fetch(tickers):
+        done.set()
+        raise ConnectionError('screener down')
+
+    revalidator = MetadataRevalidator(index, fetch, linger=0.01)
+    revalidator.schedule('AAPL')
+    assert done.wait(5)
+    revalidator.close()
+    assert index.lookup('AAPL') == {'sector': 'Technology'}
+    assert revalidator.metrics.counter('metadata_revalidations', outcome='failed') == 1
@@ -0,0 +1,47 @@
+from benchmarks.fake_server import morningstar_values
+from src.constants.config import MORNINGSTAR_URL
+from src.constants.selectors import SELECTORS
+from src.parsers.extractor import to_number
+from src.storage.fingerprint_store import FingerprintStore
+
+MORNINGSTAR_FIELDS = [field for fields in SELECTORS.values() for field in fields]
+
+def expected(ticker):
+    """Field values of a ticker's fake Morningstar pages, as the scraper converts them"""
+    return {field.replace('-', '_'): to_number(value)
+            for page in SELECTORS for field, value in morningstar_values(ticker, page).items()}
+
+def test_morningstar_pages_are_scraped(make_combined):
+    scraper = make_combined(fields=MORNINGSTAR_FIELDS)
+    data = scraper.scrape_stock_data('MSFT')
+    assert sorted(scraper.transport.requested) == sorted(
+        f"{MORNINGSTAR_URL}/stocks/MSFT/{page}" for page in SELECTORS)
+    assert data.ok and data.fields() == expected('MSFT')
+
+def test_only_pages_of_requested_fields_are_fetched(make_combined):
+    scraper = make_combined(fields=['dividend_ttm', 'yield_5yr_avg'])
+    data = scraper.scrape_stock_data('MSFT')
+    assert scraper.transport.requested == [f"{MORNINGSTAR_URL}/stocks/MSFT/dividends"]
+    assert data.fields() == {field: value for field, value in expected('MSFT').items()
+                             if field in ('dividend_ttm', 'yield_5yr_avg')}
+
+def test_failed_pages_leave_their_fields_out(sites, make_combined):
+    sites['morningstar'].error_rate = 1.0
+    data = make_combined(fields=MORNINGSTAR_FIELDS).scrape_stock_data('MSFT')
+    # No page answered, so nothing was scraped, which is a failed record
+    assert data.fields() == {} and not data.ok
+
+    # Finviz still answers, so the record keeps its Finviz fields only
+    data = make_combined().scrape_stock_data('MSFT')
+    assert data.ok and data.sector and not set(expected('MSFT')) & set(data.fields())
+
+def test_unchanged_pages_reuse_their_fields(tmp_path, make_combined):
+    fingerprints = FingerprintStore(tmp_path / 'fingerprints.sqlite')
+    first = make_combined(fields=MORNINGSTAR_FIELDS, fingerprints=fingerprints).scrape_stock_data('MSFT')
+    assert len(fingerprints) == len(SELECTORS)
+
+    scraper = make_combined(fields=MORNINGSTAR_FIELDS, fingerprints=fingerprints)
+    data = scraper.scrape_stock_data('MSFT')
+    assert data.fields() == first.fields() == expected('MSFT')
+    assert scraper.metrics.counter('page_fingerprints', outcome='reused') == len(SELECTORS)
+    assert scraper.metrics.counter('page_fingerprints', outcome='parsed') == 0
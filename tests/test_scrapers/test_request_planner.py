@@ -0,0 +1,32 @@
+from src.constants.config import MORNINGSTAR_URL, FINVIZ_URL
+from src.parsers.extractor import ExtractionEngine
+from src.scrapers.request_planner import RequestPlanner
+
+ENGINE = ExtractionEngine()
+
+def test_every_page_is_planned_by_default():
+    planner = RequestPlanner(ENGINE)
+    assert planner.pages == ENGINE.pages and planner.skipped == []
+    assert planner.requested_fields == {field for page in ENGINE.pages for field in ENGINE.fields(page)}
+    assert planner.urls('AAPL') == {
+        'quote': f"{MORNINGSTAR_URL}/stocks/AAPL/quote",
+        'dividends': f"{MORNINGSTAR_URL}/stocks/AAPL/dividends",
+        'valuation': f"{MORNINGSTAR_URL}/stocks/AAPL/valuation",
+        'financials': f"{MORNINGSTAR_URL}/stocks/AAPL/financials",
+        'finviz': f"{FINVIZ_URL}/quote.ashx?t=AAPL",
+    }
+
+def test_pages_without_requested_fields_are_skipped():
+    planner = RequestPlanner(ENGINE, ['current_price', 'sector'])
+    assert planner.pages == ['quote', 'finviz']
+    assert planner.skipped == ['dividends', 'valuation', 'financials']
+    assert planner.page_fields == {'quote': {'current_price'}, 'finviz': {'sector'}}
+    assert planner.requested_fields == {'current_price', 'sector'}
+
+def test_urls_of_pages_providing_some_fields():
+    planner = RequestPlanner(ENGINE)
+    assert planner.pages_for(['eps_ttm', 'eps_growth']) == ['financials']
+    assert list(planner.urls('MSFT', ['sector', 'bvps_ttm'])) == ['valuation', 'finviz']
+    assert planner.urls('MSFT', []) == {}
+    # A requested field no page provides plans nothing
+    assert RequestPlanner(ENGINE, ['not_a_field']).pages == []
@@ -0,0 +1,69 @@
+import threading
+from src.models.stock_data import StockData
+from src.service.jobs import Job, JobQueue
+
+def test_higher_priority_jobs_overtake_queued_tickers():
+    started, release = threading.Event(), threading.Event()
+    order = []
+
+    def scrape(ticker, fields):
+        if ticker == 'BLOCK':
+            started.set()
+            release.wait(5)
+        order.append(ticker)
+        return StockData(ticker, current_price=1.0)
+
+    queue = JobQueue(scrape, workers=1).start()
+    blocker = queue.submit(Job(['BLOCK']))
+    assert started.wait(5)
+    low = queue.submit(Job(['L1', 'L2']))
+    high = queue.submit(Job(['H1', 'H2'], priority=5))
+    release.set()
+    assert [data.ticker for data in low.iter_results(timeout=5)] == ['L1', 'L2']
+    queue.stop()
+    assert order == ['BLOCK', 'H1', 'H2', 'L1', 'L2']
+    assert blocker.done and high.status()['status'] == 'done'
+
+def test_results_stream_while_the_job_runs():
+    release = threading.Event()
+
+    def scrape(ticker, fields):
+        if ticker == 'SLOW':
+            release.wait(5)
+        if ticker == 'BAD':
+            raise ValueError('no such ticker')
+        return StockData(ticker, current_price=1.0)
+
+    queue = JobQueue(scrape, workers=2).start()
+    job = queue.submit(Job(['FAST', 'BAD', 'SLOW', 'FAST'], fields=['current_price']))
+    assert job.tickers == ['FAST', 'BAD', 'SLOW'] and job.fields == {'current_price'}
+    results = job.iter_results(timeout=5)
+    first = {next(results).ticker, next(results).ticker}
+    assert first == {'FAST', 'BAD'} and job.status()['status'] == 'running'
+    release.set()
+    assert next(results).ticker == 'SLOW' and list(results) == []
+    status = job.status()
+    assert (status['status'], status['completed'], status['failed']) == ('done', 3, 1)
+    assert [data.error for data in job.results if data.ticker == 'BAD'] == ['no such ticker']
+    queue.stop()
+
+def test_only_the_latest_finished_jobs_are_kept():
+    queue = JobQueue(lambda ticker, fields: StockData(ticker, current_price=1.0), workers=1, max_jobs=2).start()
+    jobs = []
+    for ticker in ['A', 'B', 'C']:
+        jobs.append(queue.submit(Job([ticker])))
+        list(jobs[-1].iter_results(timeout=5))
+    queue.stop()
+    assert queue.get(jobs[0].id) is None
+    assert [job.id for job in queue.jobs()] == [jobs[1].id, jobs[2].id]
+
+def test_failed_prefetch_hands_out_the_rest_directly():
+    def prefetch(tickers, fields):
+        yield tickers[0]
+        raise ConnectionError('screener down')
+
+    queue = JobQueue(lambda ticker, fields: StockData(ticker, current_price=1.0), workers=1,
+                     prefetch=prefetch).start()
+    job = queue.submit(Job(['A', 'B', 'C']))
+    assert sorted(data.ticker for data in job.iter_results(timeout=5)) == ['A', 'B', 'C']
+    queue.stop()
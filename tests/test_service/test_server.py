@@ -0,0 +1,54 @@
+import json
+import urllib.error
+import urllib.request
+import pytest
+from benchmarks.fake_server import finviz_sector
+from src.service.server import ScrapeService
+
+@pytest.fixture
+def service(make_combined):
+    with ScrapeService(make_combined(), workers=2, port=0) as service:
+        yield service
+
+def request(service, path, payload=None):
+    """(status, body) of a request to the service; JSON bodies are decoded"""
+    data = json.dumps(payload).encode() if payload is not None else None
+    try:
+        with urllib.request.urlopen(urllib.request.Request(service.url + path, data=data), timeout=10) as response:
+            status, body, kind = response.status, response.read(), response.headers['Content-Type']
+    except urllib.error.HTTPError as e:
+        status, body, kind = e.code, e.read(), e.headers['Content-Type']
+    return status, json.loads(body) if kind == 'application/json' else body.decode()
+
+def test_jobs_are_queued_and_streamed(service):
+    status, job = request(service, '/jobs', {'tickers': ['AAPL', 'MSFT'], 'fields': ['sector'], 'priority': 1})
+    assert status == 202 and job['tickers'] == 2 and job['fields'] == ['sector']
+    status, body = request(service, f"/jobs/{job['job_id']}/results")
+    results = {record['ticker']: record for record in map(json.loads, body.splitlines())}
+    assert {ticker: record['sector'] for ticker, record in results.items()} == {
+        ticker: finviz_sector(ticker)[0] for ticker in ['AAPL', 'MSFT']}
+    # Only the page providing the requested field was scraped
+    assert 'current_price' not in results['AAPL']
+    status, info = request(service, f"/jobs/{job['job_id']}")
+    assert status == 200 and (info['status'], info['completed'], info['failed']) == ('done', 2, 0)
+    assert [listed['job_id'] for listed in request(service, '/jobs')[1]] == [job['job_id']]
+
+def test_lookup_health_and_metrics(service):
+    status, record = request(service, '/lookup/NVDA?fields=current_price')
+    assert status == 200 and record['current_price'] > 0 and 'sector' not in record
+    assert request(service, '/health') == (200, {'status': 'ok', 'workers': 2, 'pending': 0})
+    status, metrics = request(service, '/metrics')
+    assert status == 200 and 'requests' in metrics
+
+def test_bad_requests_are_rejected(service):
+    for path, payload, error in [
+        ('/jobs', {'tickers': []}, 'non-empty list'),
+        ('/jobs', {'tickers': ['AAPL'], 'priority': 'high'}, 'integer'),
+        ('/jobs', {'tickers': ['AAPL'], 'fields': ['colour']}, 'Unknown fields'),
+        ('/lookup/AAPL?fields=colour', None, 'Unknown fields'),
+    ]:
+        status, body = request(service, path, payload)
+        assert status == 400 and error in body['error']
+    for path in ['/jobs/missing', '/jobs/missing/results', '/nowhere']:
+        assert request(service, path)[0] == 404
+    assert service.queue.jobs() == []
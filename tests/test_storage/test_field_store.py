@@ -0,0 +1,36 @@
+from src.storage.field_store import FieldStore
+
+def test_fields_expire_after_their_max_age(tmp_path):
+    store = FieldStore(tmp_path / 'fields.sqlite', max_ages={'current_price': 60})
+    assert store.stale_fields('AAPL', ['current_price', 'sector']) == {'current_price', 'sector'}
+    store.update('AAPL', {'current_price': 190.5, 'sector': 'Technology'})
+    assert store.load('AAPL') == {'current_price': 190.5, 'sector': 'Technology'}
+    assert store.stale_fields('AAPL', ['current_price', 'sector']) == set()
+    # Fields without an entry in max_ages use the default age of a week
+    later = store._rows('AAPL')['current_price'][1] + 61
+    assert store.stale_fields('AAPL', ['current_price', 'sector'], now=later) == {'current_price'}
+    assert store.stale_fields('AAPL', ['sector'], now=later + 7 * 24 * 3600) == {'sector'}
+    store.close()
+
+def test_checked_fields_missing_from_a_page_are_not_stale(tmp_path):
+    store = FieldStore(tmp_path / 'fields.sqlite')
+    store.update('AAPL', {'eps_ttm': 6.1}, checked=['eps_ttm', 'eps_growth'])
+    # eps_growth was not on the page: stored as NULL, so it is left out but not refetched
+    assert store.load('AAPL') == {'eps_ttm': 6.1}
+    assert store.stale_fields('AAPL', ['eps_ttm', 'eps_growth']) == set()
+    store.close()
+
+def test_values_survive_reopening_and_updates_merge(tmp_path):
+    path = tmp_path / 'fields.sqlite'
+    store = FieldStore(path)
+    store.update('AAPL', {'current_price': 190.5, 'industry': 'Consumer Electronics'})
+    store.update('MSFT', {'current_price': 410.0})
+    store.close()
+
+    store = FieldStore(path)
+    store.update('AAPL', {'current_price': 191.0})
+    assert store.load('AAPL') == {'current_price': 191.0, 'industry': 'Consumer Electronics'}
+    assert store.load('MSFT') == {'current_price': 410.0}
+    store.clear()
+    assert store.load('AAPL') == {}
+    store.close()
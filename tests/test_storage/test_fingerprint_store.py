@@ -0,0 +1,37 @@
+from benchmarks.fake_server import morningstar_values
+from benchmarks.synthetic_pages import morningstar_page
+from src.parsers.extractor import ExtractionEngine
+from src.storage.fingerprint_store import FingerprintStore
+
+URL = 'https://www.morningstar.com/stocks/AAPL/quote'
+
+def test_fields_are_returned_for_the_stored_fingerprint_only(tmp_path):
+    path = tmp_path / 'fingerprints.sqlite'
+    store = FingerprintStore(path)
+    assert store.lookup(URL, 'abc') is None
+    store.store(URL, 'abc', {'current_price': 190.5}, 0.25)
+    assert store.lookup(URL, 'abc') == ({'current_price': 190.5}, 0.25)
+    assert store.lookup(URL, 'def') is None
+    store.close()
+
+    # A changed page replaces the entry
+    store = FingerprintStore(path)
+    store.store(URL, 'def', {'current_price': 191.0}, 0.5)
+    assert store.lookup(URL, 'abc') is None
+    assert store.lookup(URL, 'def') == ({'current_price': 191.0}, 0.5)
+    assert len(store) == 1
+    store.clear()
+    assert len(store) == 0
+    store.close()
+
+def test_fingerprints_follow_the_extracted_fragments():
+    engine = ExtractionEngine()
+    values = morningstar_values('AAPL', 'quote')
+    page = morningstar_page('AAPL', 'quote', values, blocks=10).encode()
+    changed = morningstar_page('AAPL', 'quote', {'current-price': '$1.00'}, blocks=10).encode()
+    assert engine.fingerprint('quote', page) != engine.fingerprint('quote', changed)
+    # Markup before the first selected element does not change the fingerprint
+    banner = page.replace(b'<body>', b'<body><div class="ad">Ad 42</div>', 1)
+    assert banner != page and engine.fingerprint('quote', banner) == engine.fingerprint('quote', page)
+    # Each page type hashes with its own salt
+    assert engine.fingerprint('quote', page) != engine.fingerprint('dividends', page)
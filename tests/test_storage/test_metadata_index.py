@@ -0,0 +1,38 @@
+from src.storage.metadata_index import MetadataIndex
+
+def test_entries_are_stored_and_reloaded(tmp_path):
+    path = tmp_path / 'metadata.sqlite'
+    index = MetadataIndex(path)
+    assert index.update('AAPL', {'sector': 'Technology', 'industry': 'Consumer Electronics', 'current_price': 1.0})
+    assert index.update('XOM', {'sector': 'Energy'})
+    # Nothing to index
+    assert not index.update('MSFT', {'current_price': 410.0, 'sector': ''})
+    index.close()
+
+    index = MetadataIndex(path)
+    assert len(index) == 2 and 'AAPL' in index and 'MSFT' not in index
+    assert index.lookup('AAPL') == {'sector': 'Technology', 'industry': 'Consumer Electronics'}
+    assert index.lookup('XOM') == {'sector': 'Energy'}
+    assert index.lookup('MSFT') is None
+    index.clear()
+    assert len(index) == 0 and MetadataIndex(path).lookup('AAPL') is None
+    index.close()
+
+def test_old_entries_are_stale_but_still_answer(tmp_path):
+    index = MetadataIndex(tmp_path / 'metadata.sqlite', max_age=60)
+    index.update('AAPL', {'sector': 'Technology'})
+    checked_at = index._entries['AAPL'][2]
+    assert not index.is_stale('AAPL', now=checked_at + 59)
+    assert index.is_stale('AAPL', now=checked_at + 60) and index.is_stale('MSFT')
+    assert index.stale_tickers(now=checked_at + 60) == ['AAPL']
+    assert index.lookup('AAPL') == {'sector': 'Technology'}
+    index.close()
+
+def test_breakdown_counts_tickers_per_industry(tmp_path):
+    index = MetadataIndex(tmp_path / 'metadata.sqlite')
+    index.update('AAPL', {'sector': 'Technology', 'industry': 'Consumer Electronics'})
+    index.update('DELL', {'sector': 'Technology', 'industry': 'Consumer Electronics'})
+    index.update('XOM', {'sector': 'Energy', 'industry': 'Oil & Gas Integrated'})
+    assert index.breakdown() == {('Technology', 'Consumer Electronics'): 2, ('Energy', 'Oil & Gas Integrated'): 1}
+    assert index.breakdown(['AAPL', 'NEW']) == {('Technology', 'Consumer Electronics'): 1, ('Unknown', 'Unknown'): 1}
+    index.close()
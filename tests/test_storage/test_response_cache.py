@@ -0,0 +1,93 @@
+import os
+import sqlite3
+import time
+from src.storage.response_cache import ResponseCache, page_type_for_url
+from src.transports import Response
+
+def make_response(url, content=b'<html></html>', headers=None):
+    return Response(url, 200, content, headers or {'Content-Type': 'text/html'})
+
+def test_ttl_by_page_type(tmp_path):
+    cache = ResponseCache(tmp_path / 'cache.sqlite', ttls={'quote': 60, 'financials': 0})
+    quote, financials = 'http://host/stocks/AAPL/quote', 'http://host/stocks/AAPL/financials'
+    assert page_type_for_url(quote) == 'quote'
+    cache.store(make_response(quote))
+    cache.store(make_response(financials))
+    assert cache.lookup(quote).is_fresh
+    # Stale entries are still returned, to be revalidated
+    entry = cache.lookup(financials)
+    assert entry is not None and not entry.is_fresh
+    assert cache.lookup('http://host/stocks/MSFT/quote') is None
+    cache.close()
+
+def test_entries_survive_reopening(tmp_path):
+    url = 'http://host/stocks/AAPL/quote'
+    cache = ResponseCache(tmp_path / 'cache.sqlite')
+    cache.store(make_response(url, b'body', {'ETag': '"v1"'}))
+    cache.close()
+    cache = ResponseCache(tmp_path / 'cache.sqlite')
+    entry = cache.lookup(url)
+    assert entry.content == b'body'
+    assert entry.validators() == {'If-None-Match': '"v1"'}
+    cache.close()
+
+def test_fresh_entries_are_served_without_a_request(tmp_path, fake_server, make_scraper):
+    server = fake_server()
+    scraper = make_scraper(cache=ResponseCache(tmp_path / 'cache.sqlite', ttls={'quote': 3600}))
+    url = f"{server.url}/stocks/AAPL/quote"
+    first = scraper._make_request(url)
+    second = scraper._make_request(url)
+    assert second.content == first.content
+    assert server.status_counts == {200: 1}
+    assert scraper.cache.stats['hits'] == 1
+
+def test_stale_entries_are_revalidated(tmp_path, fake_server, make_scraper):
+    server = fake_server()
+    scraper = make_scraper(cache=ResponseCache(tmp_path / 'cache.sqlite', ttls={'quote': 0}))
+    url = f"{server.url}/stocks/AAPL/quote"
+    first = scraper._make_request(url)
+    second = scraper._make_request(url)
+    # The server answered the conditional request with 304 and no body
+    assert server.status_counts == {200: 1, 304: 1}
+    assert second.status_code == 200 and second.content == first.content
+    assert scraper.cache.stats['revalidated'] == 1
+    assert scraper.metrics.counter('cache_events', event='revalidated') == 1
+
+def test_evicts_least_recently_used(tmp_path):
+    # Random bodies do not compress, so each entry takes about 1000 bytes
+    cache = ResponseCache(tmp_path / 'cache.sqlite', max_bytes=3500)
+    urls = [f'http://host/stocks/T{i}/quote' for i in range(4)]
+    for url in urls[:3]:
+        cache.store(make_response(url, os.urandom(1000)))
+        time.sleep(0.01)
+    # Reading the oldest entry makes the second one the least recently used
+    assert cache.lookup(urls[0]) is not None
+    time.sleep(0.01)
+    cache.store(make_response(urls[3], os.urandom(1000)))
+    assert cache.size <= 3500
+    assert cache.stats['evicted'] == 1
+    assert cache.lookup(urls[1]) is None
+    assert all(cache.lookup(url) is not None for url in (urls[0], urls[2], urls[3]))
+    cache.close()
+
+def test_access_times_are_written_in_batches(tmp_path):
+    path = tmp_path / 'cache.sqlite'
+    cache = ResponseCache(path, access_batch=3)
+    urls = [f'http://host/stocks/T{i}/quote' for i in range(3)]
+    for url in urls:
+        cache.store(make_response(url))
+
+    def stored_access():
+        with sqlite3.connect(str(path)) as conn:
+            return dict(conn.execute('SELECT url, last_access FROM responses'))
+
+    stored = stored_access()
+    time.sleep(0.01)
+    cache.lookup(urls[0])
+    cache.lookup(urls[1])
+    assert stored_access() == stored
+    # The third accessed entry fills the batch
+    cache.lookup(urls[2])
+    written = stored_access()
+    assert all(written[url] > stored[url] for url in urls)
+    cache.close()
@@ -0,0 +1,40 @@
+from src.models.stock_data import StockData
+from src.storage.run_journal import RunJournal
+
+def test_resume_skips_completed_tickers(tmp_path):
+    path = tmp_path / 'journal.sqlite'
+    journal = RunJournal(path)
+    run_id = journal.start_run('tickers.csv', 'results.csv')
+    apple = StockData('AAPL', sector='Technology', current_price=190.5)
+    journal.record(run_id, apple)
+    journal.record(run_id, StockData.failed('MSFT', 'timed out'))
+    # A record without any scraped field is not done either
+    journal.record(run_id, StockData('NVDA'))
+    journal.close()
+
+    # The interrupted run is picked up by a new process
+    journal = RunJournal(path)
+    assert journal.get_run(run_id)['status'] == 'running'
+    assert journal.completed_tickers(run_id) == {'AAPL'}
+    assert sorted(journal.failed_tickers(run_id)) == ['MSFT', 'NVDA']
+    assert list(journal.iter_results(run_id)) == [apple]
+
+    remaining = [ticker for ticker in ['AAPL', 'MSFT', 'NVDA'] if ticker not in journal.completed_tickers(run_id)]
+    assert remaining == ['MSFT', 'NVDA']
+    for ticker in remaining:
+        journal.record(run_id, StockData(ticker, current_price=1.0))
+    journal.finish_run(run_id)
+    assert journal.counts(run_id) == {'ok': 3}
+    assert journal.get_run(run_id)['status'] == 'finished'
+    attempts = dict(journal._conn.execute('SELECT ticker, attempts FROM results WHERE run_id = ?', (run_id,)))
+    assert attempts == {'AAPL': 1, 'MSFT': 2, 'NVDA': 2}
+    journal.close()
+
+def test_runs_are_kept_apart(tmp_path):
+    journal = RunJournal(tmp_path / 'journal.sqlite')
+    first, second = journal.start_run(), journal.start_run()
+    assert first != second
+    journal.record(first, StockData('AAPL', current_price=1.0))
+    assert journal.completed_tickers(second) == set()
+    assert {run['run_id']: run['counts'] for run in journal.list_runs()} == {first: {'ok': 1}, second: {}}
+    journal.close()
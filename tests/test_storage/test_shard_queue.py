@@ -0,0 +1,87 @@
+import time
+from src.models.stock_data import StockData
+from src.storage.shard_queue import ShardQueue
+from src.utils.metrics import Metrics
+
+def test_shards_are_leased_once(tmp_path):
+    queue = ShardQueue(tmp_path / 'shards.sqlite')
+    run_id = queue.create_run(['A', 'B', 'C', 'D', 'E'], shard_size=2, fields=['sector'])
+    assert queue.run_fields(run_id) == ['sector']
+    shards = [queue.lease('w1', run_id), queue.lease('w2', run_id), queue.lease('w1', run_id)]
+    assert [shard.tickers for shard in shards] == [['A', 'B'], ['C', 'D'], ['E']]
+    assert queue.lease('w3', run_id) is None
+    assert queue.counts(run_id) == {'leased': 3}
+    queue.close()
+
+def test_complete_and_collect(tmp_path):
+    queue = ShardQueue(tmp_path / 'shards.sqlite')
+    run_id = queue.create_run(['A', 'B'], shard_size=2)
+    shard = queue.lease('w1', run_id)
+    results = [StockData('A', current_price=1.0), StockData.failed('B', 'not found')]
+    assert queue.complete(shard, 'w1', results)
+    assert queue.finished(run_id)
+    assert list(queue.collect(run_id)) == [(shard.shard_id, results)]
+    # Until it is acknowledged, e.g. because the coordinator died while writing, the shard is kept
+    assert list(queue.collect(run_id)) == [(shard.shard_id, results)]
+    assert queue.counts(run_id) == {'done': 1}
+    queue.ack(shard.shard_id)
+    assert list(queue.collect(run_id)) == []
+    assert queue.counts(run_id) == {'merged': 1}
+    queue.close()
+
+def records(queue, run_id):
+    return [data for _, shard in queue.collect(run_id) for data in shard]
+
+def test_expired_lease_is_reassigned(tmp_path):
+    queue = ShardQueue(tmp_path / 'shards.sqlite', lease_seconds=0.1)
+    run_id = queue.create_run(['A', 'B'], shard_size=2)
+    first = queue.lease('w1', run_id)
+    assert queue.lease('w2', run_id) is None
+    time.sleep(0.15)
+    second = queue.lease('w2', run_id)
+    assert second.shard_id == first.shard_id and second.attempts == 2
+    # The first worker lost its lease: its heartbeat and results are refused
+    assert not queue.heartbeat(first, 'w1')
+    assert not queue.complete(first, 'w1', [StockData('A', current_price=1.0)])
+    assert queue.heartbeat(second, 'w2')
+    assert queue.complete(second, 'w2', [StockData('A', current_price=2.0)])
+    assert [data.current_price for data in records(queue, run_id)] == [2.0]
+    queue.close()
+
+def test_heartbeat_keeps_the_lease(tmp_path):
+    queue = ShardQueue(tmp_path / 'shards.sqlite', lease_seconds=0.2)
+    run_id = queue.create_run(['A'], shard_size=1)
+    shard = queue.lease('w1', run_id)
+    for _ in range(3):
+        time.sleep(0.1)
+        assert queue.heartbeat(shard, 'w1')
+    assert queue.lease('w2', run_id) is None
+    queue.close()
+
+def test_shard_fails_after_max_attempts(tmp_path):
+    queue = ShardQueue(tmp_path / 'shards.sqlite', lease_seconds=0.05, max_attempts=2)
+    run_id = queue.create_run(['A', 'B'], shard_size=2)
+    assert queue.lease('w1', run_id).attempts == 1
+    time.sleep(0.06)
+    assert queue.lease('w2', run_id).attempts == 2
+    time.sleep(0.06)
+    assert queue.lease('w3', run_id) is None
+    assert queue.finished(run_id)
+    failed = records(queue, run_id)
+    assert [data.ticker for data in failed] == ['A', 'B']
+    assert all(data.error == 'shard failed: lease expired' for data in failed)
+    queue.close()
+
+def test_worker_stats_are_merged(tmp_path):
+    queue = ShardQueue(tmp_path / 'shards.sqlite')
+    run_id = queue.create_run(['A', 'B'], shard_size=1)
+    for worker in ('w1', 'w2'):
+        metrics = Metrics()
+        metrics.increment('requests', 3, host='example.com')
+        shard = queue.lease(worker, run_id)
+        assert queue.complete(shard, worker, [], stats=metrics.to_state())
+    merged = Metrics()
+    for state in queue.run_stats(run_id):
+        merged.merge_state(state)
+    assert merged.counter('requests', host='example.com') == 6
+    queue.close()
@@ -0,0 +1,33 @@
+import pytest
+from src.utils.helpers import iter_column, read_tickers, clean_numeric, get_timestamp_filename
+
+def test_iter_column_skips_empty_values(tmp_path):
+    path = tmp_path / 'tickers.csv'
+    path.write_text('Name, Ticker \nApple, AAPL \nNone,\nShort\nMicrosoft,MSFT\n', encoding='utf-8')
+    assert list(iter_column(path, 'Ticker', 'utf-8')) == ['AAPL', 'MSFT']
+
+def test_iter_column_missing_column(tmp_path):
+    path = tmp_path / 'tickers.csv'
+    path.write_text('Symbol\nAAPL\n', encoding='utf-8')
+    with pytest.raises(KeyError):
+        list(iter_column(path, 'Ticker'))
+
+def test_read_tickers_keeps_first_occurrence(tmp_path):
+    path = tmp_path / 'tickers.csv'
+    # Written with a BOM, as the project's own CSV files are
+    path.write_text('Ticker\nMSFT\nAAPL\nMSFT\n', encoding='utf-8-sig')
+    assert read_tickers(path) == ['MSFT', 'AAPL']
+
+@pytest.mark.parametrize('value, expected', [
+    ('$1,234.50', 1234.5),
+    ('2.5%', 2.5),
+    (7, 7.0),
+    (None, 0.0),
+    ('n/a', 0.0),
+])
+def test_clean_numeric(value, expected):
+    assert clean_numeric(value) == expected
+
+def test_get_timestamp_filename():
+    name = get_timestamp_filename('results')
+    assert name.startswith('results_') and name.endswith('.csv')
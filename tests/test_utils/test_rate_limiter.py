@@ -0,0 +1,143 @@
+import asyncio
+import threading
+import time
+from src.constants.config import RATE_DECREASE_FACTOR, RATE_INCREASE_STEP
+from src.utils.rate_limiter import RateLimiter, HostLimiter, HostLimits
+
+def test_rate_limiter_spaces_requests():
+    limiter = RateLimiter(rate=20)
+    start = time.monotonic()
+    for _ in range(5):
+        limiter.acquire()
+    # The first request goes at once, the other four one interval apart
+    assert time.monotonic() - start >= 4 * limiter.interval * 0.9
+
+def test_rate_limiter_burst():
+    limiter = RateLimiter(rate=10, burst=3)
+    assert [limiter.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter.acquire() > 0
+
+def test_rate_limiter_without_rate_never_waits():
+    limiter = RateLimiter(rate=0)
+    assert all(limiter.acquire() == 0.0 for _ in range(100))
+
+def test_defer_holds_back_requests():
+    limiter = RateLimiter(rate=1000)
+    limiter.defer(0.2)
+    assert limiter.acquire() >= 0.15
+
+def test_host_limiter_caps_concurrency():
+    limiter = HostLimiter(rate=0, concurrency=2)
+    active, peak = 0, 0
+    lock = threading.Lock()
+
+    def request():
+        nonlocal active, peak
+        with limiter:
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+
+    threads = [threading.Thread(target=request) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert peak == 2
+
+def test_coroutines_and_threads_share_the_concurrency_slots():
+    limiter = HostLimiter(rate=0, concurrency=3)
+    active, peak = 0, 0
+    lock = threading.Lock()
+
+    def enter():
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+
+    def leave():
+        nonlocal active
+        with lock:
+            active -= 1
+
+    def thread_request():
+        with limiter:
+            enter()
+            time.sleep(0.02)
+            leave()
+
+    async def coroutine_request():
+        await limiter.acquire_async()
+        try:
+            enter()
+            await asyncio.sleep(0.02)
+            leave()
+        finally:
+            limiter.release()
+
+    async def main():
+        await asyncio.gather(*(coroutine_request() for _ in range(20)))
+
+    threads = [threading.Thread(target=thread_request) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    asyncio.run(main())
+    for thread in threads:
+        thread.join()
+    assert peak == 3
+    assert limiter._slots._free == 3
+
+def test_cancelled_coroutine_passes_its_slot_on():
+    limiter = HostLimiter(rate=0, concurrency=1)
+
+    async def main():
+        await limiter.acquire_async()
+        waiter = asyncio.ensure_future(limiter.acquire_async())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        limiter.release()
+        await asyncio.wait_for(limiter.acquire_async(), timeout=1)
+        limiter.release()
+
+    asyncio.run(main())
+    assert limiter._slots._free == 1
+
+def test_async_rate_limiter_spaces_requests():
+    limiter = RateLimiter(rate=20)
+
+    async def main():
+        start = time.monotonic()
+        await asyncio.gather(*(limiter.acquire_async() for _ in range(5)))
+        return time.monotonic() - start
+
+    assert asyncio.run(main()) >= 4 * limiter.interval * 0.9
+
+def test_host_limiter_adapts_rate():
+    limiter = HostLimiter(rate=10, adaptive=True)
+    assert limiter.record_failure(throttled=True) is False
+    assert limiter.rate == 10 * RATE_DECREASE_FACTOR
+    limiter.record_success()
+    assert limiter.rate == 10 * RATE_DECREASE_FACTOR + RATE_INCREASE_STEP
+    for _ in range(1000):
+        limiter.record_success()
+    assert limiter.rate == 10
+
+def test_throttling_does_not_open_the_circuit():
+    limiter = HostLimiter(rate=0)
+    for _ in range(limiter.breaker.failure_threshold + 1):
+        assert limiter.record_failure(throttled=True) is False
+    assert limiter.breaker.state == limiter.breaker.CLOSED
+
+def test_host_limits_per_host():
+    limits = HostLimits(limits={'a.example': {'rate': 5, 'concurrency': 3}}, default={'rate': 1})
+    limiter = limits.for_url('https://a.example/x')
+    assert limiter is limits.for_url('https://a.example/y')
+    assert (limiter.max_rate, limiter.concurrency) == (5, 3)
+    assert limits.for_url('https://b.example/').max_rate == 1
+    limits.configure('a.example', rate=2)
+    assert limits.for_host('a.example').max_rate == 2
+    assert limits.for_host('a.example').concurrency == 3
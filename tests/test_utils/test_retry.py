@@ -0,0 +1,104 @@
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+import pytest
+from src.constants.config import RETRY_AFTER_MAX
+from src.utils.retry import RetryPolicy, CircuitBreaker, CircuitOpenError, parse_retry_after
+
+def test_parse_retry_after_seconds():
+    assert parse_retry_after('3') == 3.0
+    assert parse_retry_after(' 1.5 ') == 1.5
+    assert parse_retry_after('-4') == 0.0
+    assert parse_retry_after(str(RETRY_AFTER_MAX * 10)) == RETRY_AFTER_MAX
+
+def test_parse_retry_after_http_date():
+    when = datetime.now(timezone.utc) + timedelta(seconds=30)
+    assert 25 <= parse_retry_after(format_datetime(when, usegmt=True)) <= 30
+
+def test_parse_retry_after_invalid():
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('') is None
+    assert parse_retry_after('soon') is None
+
+def test_retry_policy_statuses():
+    policy = RetryPolicy()
+    assert policy.should_retry(None)
+    assert policy.should_retry(429)
+    assert policy.should_retry(503)
+    assert not policy.should_retry(200)
+    assert not policy.should_retry(404)
+
+def test_retry_policy_backoff_is_capped():
+    policy = RetryPolicy(base=1.0, cap=5.0)
+    for attempt in range(8):
+        assert 0 <= policy.delay(attempt) <= min(5.0, 2 ** attempt)
+
+def test_retry_policy_honours_retry_after():
+    policy = RetryPolicy(base=0.01, cap=0.02)
+    assert policy.delay(0, retry_after=7.0) == 7.0
+
+def test_circuit_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60, wait_timeout=0.05)
+    assert breaker.record_failure() is False
+    breaker.record_success()
+    assert [breaker.record_failure() for _ in range(3)] == [False, False, True]
+    assert breaker.state == breaker.OPEN
+    start = time.monotonic()
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire()
+    assert 0.05 <= time.monotonic() - start < 0.5
+
+def test_circuit_half_open_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05, wait_timeout=0)
+    breaker.record_failure()
+    time.sleep(0.06)
+    # One probe goes through, everyone else is held back until it reports back
+    breaker.acquire()
+    assert breaker.state == breaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire()
+    assert breaker.record_failure() is True
+    assert breaker.state == breaker.OPEN
+    time.sleep(0.06)
+    breaker.acquire()
+    breaker.record_success()
+    assert breaker.state == breaker.CLOSED
+    breaker.acquire()
+    assert breaker.opened_count == 2
+
+def test_waiters_go_through_once_the_probe_succeeds():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.1, wait_timeout=5)
+    breaker.record_failure()
+    start = time.monotonic()
+    # The caller waits out the reset timeout and becomes the probe
+    breaker.acquire()
+    assert 0.09 <= time.monotonic() - start < 1
+    passed = []
+    waiters = [threading.Thread(target=lambda: passed.append(breaker.acquire() or time.monotonic()))
+               for _ in range(3)]
+    for waiter in waiters:
+        waiter.start()
+    time.sleep(0.05)
+    assert passed == []
+    probe_done = time.monotonic()
+    breaker.record_success()
+    for waiter in waiters:
+        waiter.join()
+    assert len(passed) == 3 and all(when - probe_done < 0.05 for when in passed)
+
+def test_async_waiters_go_through_once_the_probe_succeeds():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.1, wait_timeout=5)
+    breaker.record_failure()
+
+    async def main():
+        await breaker.acquire_async()
+        waiters = asyncio.gather(*(breaker.acquire_async() for _ in range(3)))
+        await asyncio.sleep(0.05)
+        assert not waiters.done()
+        breaker.record_success()
+        await asyncio.wait_for(waiters, timeout=1)
+
+    asyncio.run(main())
+    assert breaker.state == breaker.CLOSED
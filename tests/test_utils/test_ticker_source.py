@@ -0,0 +1,40 @@
+from pathlib import Path
+import pytest
+from src.utils.ticker_source import TickerSource
+
+def write_csv(path, tickers):
+    path.write_text('Ticker,Name\n' + ''.join(f'{ticker},x\n' for ticker in tickers), encoding='utf-8-sig')
+    return path
+
+def test_dedupes_within_and_across_files(tmp_path):
+    first = write_csv(tmp_path / 'a.csv', ['AAPL', 'MSFT', 'AAPL'])
+    second = write_csv(tmp_path / 'b.csv', ['MSFT', 'NVDA', 'aapl'])
+    source = TickerSource([first, second])
+    assert list(source) == ['AAPL', 'MSFT', 'NVDA', 'aapl']
+    assert source.count == 4
+    assert source.progress == '4'
+
+def test_progress_while_reading(tmp_path):
+    source = TickerSource([write_csv(tmp_path / 'a.csv', ['AAPL', 'MSFT'])])
+    tickers = iter(source)
+    next(tickers)
+    assert source.progress == '1+'
+    assert list(tickers) == ['MSFT']
+    assert source.progress == '2'
+
+def test_iterating_again_starts_over(tmp_path):
+    source = TickerSource([write_csv(tmp_path / 'a.csv', ['AAPL', 'MSFT'])])
+    assert list(source) == list(source) == ['AAPL', 'MSFT']
+
+def test_glob_inputs_in_sorted_order(tmp_path):
+    write_csv(tmp_path / 'b.csv', ['MSFT'])
+    write_csv(tmp_path / 'a.csv', ['AAPL'])
+    source = TickerSource([str(tmp_path / '*.csv'), str(tmp_path / 'a.csv')])
+    assert [Path(path).name for path in source.paths] == ['a.csv', 'b.csv']
+    assert list(source) == ['AAPL', 'MSFT']
+
+def test_missing_inputs(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        TickerSource([tmp_path / 'missing.csv'])
+    with pytest.raises(FileNotFoundError):
+        TickerSource([str(tmp_path / '*.csv')])